@@ -5,7 +5,6 @@ Enhanced automation bot with inventory management and advanced farming features
 Made by DDS
 """
 
-import pyautogui
 import cv2
 import numpy as np
 import keyboard
@@ -16,32 +15,81 @@ import logging
 import configparser
 import json
 from colorama import init, Fore, Style
-from PIL import Image, ImageGrab, ImageFilter
+from PIL import Image, ImageFilter
 import os
 from datetime import datetime
+from vision import FrameSnapshot, IncrementalGrid
+from frame_sources import create_frame_source
+from crop_classifier import CropClassifier
+from farm_planner import FarmPlanner, build_state_map
+from farm_state import FarmGrid, CooldownTable
+from growth_scheduler import GrowthScheduler
+from pathfinding import GridPathfinder, path_runs
+from motion import MotionModel, WALK_SPEED, measure_shift
+from input_dispatcher import InputDispatcher
+from input_backends import create_input_backend
+from async_runtime import AsyncFarmRuntime
+from settings import BotSettings, ConfigWatcher
+from bot_logging import start_log_writer, stop_log_writer, PassSummary
+from profiling import PhaseProfiler, timed
+from tracing import TraceRecorder
+from session_recorder import open_session_recorder
+from inventory_reader import HotbarReader, PICKUP_SECONDS
 
 # Initialize colorama for colored output
 init()
 
 class AdvancedMinecraftFarmBot:
-    def __init__(self):
+    def __init__(self, record=True):
         self.running = False
         self.paused = False
         self.current_task = None
         self.config = self.load_config()
         self.setup_logging()
         
+        # Typed snapshot of the settings read while farming, swapped for a
+        # new one by the config watcher when config.ini changes
+        self.settings = BotSettings.from_config(self.config)
+        self.applied_settings = None
+        self.config_watcher = ConfigWatcher('config.ini', self.reload_config,
+                                            self.settings.config_reload_interval)
+        
         # Bot settings
-        self.farm_radius = self.config.getint('Settings', 'farm_radius', fallback=5)
-        self.plant_delay = self.config.getfloat('Settings', 'plant_delay', fallback=0.5)
-        self.harvest_delay = self.config.getfloat('Settings', 'harvest_delay', fallback=0.3)
-        self.water_delay = self.config.getfloat('Settings', 'water_delay', fallback=1.0)
+        self.farm_radius = self.settings.farm_radius
         
         # Advanced settings
         self.inventory_slots = 36  # Standard inventory size
-        self.seed_threshold = self.config.getint('Advanced', 'seed_threshold', fallback=10)
-        self.auto_restock = self.config.getboolean('Advanced', 'auto_restock', fallback=True)
-        self.smart_pathfinding = self.config.getboolean('Advanced', 'smart_pathfinding', fallback=True)
+        self.runtime = self.config.get('Advanced', 'runtime', fallback='threaded')
+        self.chest_positions = self.parse_block_list(self.config.get('Advanced', 'chest_positions', fallback=''))
+        
+        # Key hold durations come from a calibrated model of walking speed
+        self.motion = MotionModel(self.config.getfloat('Advanced', 'walk_speed', fallback=WALK_SPEED),
+                                  self.config.getfloat('Advanced', 'key_latency', fallback=0.05))
+        self.motion_calibration = self.config.getboolean('Advanced', 'calibrate_motion', fallback=False)
+        
+        # Clock of the farm model, cooldowns and growth predictions, the
+        # farm simulator swaps in its simulated time
+        self.clock = time.time
+        
+        # Latency histograms of every phase of the farming loop (F4), and if
+        # tracing is on a ring buffer of every span for chrome://tracing (F5)
+        self.tracer = None
+        if self.config.getboolean('Tracing', 'enabled', fallback=False):
+            self.tracer = TraceRecorder(self.config.getint('Tracing', 'buffer_size', fallback=100000))
+        self.profiler = PhaseProfiler(self.tracer)
+        
+        # Clicks and key holds are sent from a background thread at their deadlines,
+        # to the backend selected in [Input]
+        self.inputs = InputDispatcher(create_input_backend(self.config), self.settings.input_backlog)
+        self.inputs.profiler = self.profiler
+        
+        # Screen capture settings
+        self.snapshot_mode = self.config.get('Advanced', 'snapshot_mode', fallback='pass')
+        self.snapshot = None
+        self.scan_radius = self.config.getint('Advanced', 'scan_radius', fallback=100)
+        self.scan_pitch = self.config.getint('Advanced', 'scan_pitch', fallback=20)
+        self.cell_size = self.config.getint('Advanced', 'cell_size', fallback=10)
+        self.cell_samples = self.config.getint('Advanced', 'cell_samples', fallback=1)
         
         # Key bindings
         self.forward_key = self.config.get('Controls', 'forward', fallback='w')
@@ -102,25 +150,62 @@ class AdvancedMinecraftFarmBot:
             }
         }
         
+        # Compile the crop palette into a color lookup table
+        self.color_threshold = self.settings.color_threshold
+        self.classifier = CropClassifier(self.crop_types, self.color_threshold)
+        
+        # Cached classification of the scan grid between passes
+        self.incremental_scan = self.config.getboolean('Advanced', 'incremental_scan', fallback=True)
+        tolerance = self.config.getint('Advanced', 'change_tolerance', fallback=12)
+        self.scan_cache = IncrementalGrid(self.classifier, tolerance)
+        
+        # Where screen pixels come from (live capture or offline replay)
+        self.frame_source = create_frame_source(self.config, self.crop_types)
+        
+        # Record grabbed frames and sent inputs to a session file for replay,
+        # see [Recording]. Benchmarks turn this off with record=False
+        self.session = open_session_recorder(self.config) if record else None
+        if self.session is not None:
+            self.frame_source = self.session.wrap_frames(self.frame_source)
+            self.inputs.backend = self.session.wrap_inputs(self.inputs.backend)
+        
+        # Plans harvest, replant and watering of a whole scan in one pass
+        self.planner = FarmPlanner(self.crop_types)
+        
         # Inventory tracking
         self.inventory = {
             'seeds': {'wheat_seeds': 0, 'carrot': 0, 'potato': 0, 'beetroot_seeds': 0},
             'crops': {'wheat': 0, 'carrot': 0, 'potato': 0, 'beetroot': 0},
             'tools': {'hoe': False, 'water_bucket': False, 'shovel': False}
         }
+        if self.session is not None:
+            # Replays start every loop from the inventory it had
+            self.session.inventory = self.inventory
+        
+        # Seed counts and tools are read from the hotbar, see [Inventory]
+        self.hotbar = None
+        if self.config.getboolean('Inventory', 'hotbar_reader', fallback=False):
+            self.hotbar = HotbarReader(gui_scale=self.config.getint('Inventory', 'gui_scale', fallback=0),
+                                       icon_dir=self.config.get('Inventory', 'icon_dir', fallback=''),
+                                       match_threshold=self.config.getfloat('Inventory', 'match_threshold',
+                                                                            fallback=20.0))
         
         # Statistics tracking
         self.stats = {
             'crops_harvested': 0,
             'crops_planted': 0,
             'waterings': 0,
+            'movement_key_presses': 0,
+            'suppressed_duplicates': 0,
             'start_time': None,
             'session_duration': 0
         }
         
-        # Pathfinding grid
+        # Pathfinding grid and per-block farm state
         self.farm_grid = None
         self.player_position = [0, 0]
+        self.apply_settings(self.settings)
+        self.initialize_farm_grid()
         
         print(f"{Fore.GREEN}Advanced Minecraft Farm Bot initialized!{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Press 'F1' to start/stop the bot{Style.RESET_ALL}")
@@ -128,6 +213,63 @@ class AdvancedMinecraftFarmBot:
         print(f"{Fore.YELLOW}Press 'F3' to exit{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Press 'F4' to show statistics{Style.RESET_ALL}")
     
+    def reload_config(self):
+        """Swap in a new settings snapshot after config.ini changed on disk"""
+        config = configparser.ConfigParser()
+        try:
+            config.read('config.ini')
+            settings = BotSettings.from_config(config)
+        except (configparser.Error, ValueError) as e:
+            self.logger.error(f"Keeping the current settings, config.ini is invalid: {e}")
+            return
+        
+        # The farming loop applies the new snapshot before its next pass
+        self.config = config
+        self.settings = settings
+        self.logger.info("Reloaded config.ini")
+    
+    def current_settings(self):
+        """Latest settings snapshot, applied first if config.ini changed since the last pass"""
+        settings = self.settings
+        if settings is not self.applied_settings:
+            self.apply_settings(settings)
+        return settings
+    
+    def apply_settings(self, settings):
+        """Take over the values of a settings snapshot"""
+        self.plant_delay = settings.plant_delay
+        self.harvest_delay = settings.harvest_delay
+        self.water_delay = settings.water_delay
+        self.seed_threshold = settings.seed_threshold
+        self.auto_restock = settings.auto_restock
+        self.smart_pathfinding = settings.smart_pathfinding
+        self.fused_scan = settings.fused_scan
+        self.growth_scheduling = settings.growth_scheduling
+        self.max_schedule_sleep = settings.max_schedule_sleep
+        self.optimize_tour = settings.optimize_tour
+        
+        self.planner.auto_harvest = settings.auto_harvest
+        self.planner.auto_plant = settings.auto_plant
+        self.planner.auto_water = settings.auto_water
+        self.inputs.max_backlog = settings.input_backlog
+        
+        # Seconds before the same action may be taken on a block again
+        self.cooldown_windows = {
+            'harvest': settings.harvest_cooldown,
+            'plant': settings.plant_cooldown,
+            'water': settings.water_cooldown
+        }
+        if self.farm_grid is not None:
+            self.cooldowns.set_windows(self.cooldown_windows)
+        
+        if settings.color_threshold != self.color_threshold:
+            # The color lookup table is compiled for a single threshold
+            self.color_threshold = settings.color_threshold
+            # The scan cache takes it over before its next classification
+            self.classifier = CropClassifier(self.crop_types, self.color_threshold)
+        
+        self.applied_settings = settings
+    
     def load_config(self):
         """Load configuration from config.ini file"""
         config = configparser.ConfigParser()
@@ -146,7 +288,7 @@ class AdvancedMinecraftFarmBot:
             'plant_delay': '0.5',
             'harvest_delay': '0.3',
             'water_delay': '1.0',
-            'farm_pattern': 'grid',
+            'farm_pattern': 'off',
             'auto_water': 'true',
             'auto_plant': 'true',
             'auto_harvest': 'true'
@@ -156,10 +298,30 @@ class AdvancedMinecraftFarmBot:
             'seed_threshold': '10',
             'auto_restock': 'true',
             'smart_pathfinding': 'true',
+            'fused_scan': 'true',
+            'growth_scheduling': 'false',
+            'max_schedule_sleep': '30',
+            'optimize_tour': 'true',
+            'runtime': 'threaded',
             'color_threshold': '50',
             'scan_interval': '0.5',
-            'movement_speed': '0.1',
-            'enable_statistics': 'true'
+            'chest_positions': '',
+            'harvest_cooldown': '2.0',
+            'plant_cooldown': '2.0',
+            'water_cooldown': '10.0',
+            'walk_speed': '4.317',
+            'key_latency': '0.05',
+            'calibrate_motion': 'false',
+            'input_backlog': '2.0',
+            'config_reload_interval': '1.0',
+            'enable_statistics': 'true',
+            'snapshot_mode': 'pass',
+            'incremental_scan': 'true',
+            'change_tolerance': '12',
+            'scan_radius': '100',
+            'scan_pitch': '20',
+            'cell_size': '10',
+            'cell_samples': '1'
         }
         
         config['Controls'] = {
@@ -174,11 +336,49 @@ class AdvancedMinecraftFarmBot:
             'inventory': 'e'
         }
         
+        config['Capture'] = {
+            'frame_source': 'live',
+            'display': '',
+            'frame_path': '',
+            'frame_size': '1920x1080',
+            'synthetic_seed': '0'
+        }
+        
+        config['Input'] = {
+            'backend': 'pyautogui',
+            'record_path': ''
+        }
+        
+        config['Logging'] = {
+            'level': 'INFO',
+            'max_bytes': '5242880',
+            'backup_count': '5'
+        }
+        
+        config['Inventory'] = {
+            'hotbar_reader': 'false',
+            'gui_scale': '0',
+            'icon_dir': '',
+            'match_threshold': '20'
+        }
+        
+        config['Recording'] = {
+            'session_path': '',
+            'keyframe_interval': '100',
+            'max_pending': '64'
+        }
+        
+        config['Tracing'] = {
+            'enabled': 'false',
+            'buffer_size': '100000'
+        }
+        
         config['Hotkeys'] = {
             'start_stop': 'F1',
             'pause_resume': 'F2',
             'exit': 'F3',
-            'show_stats': 'F4'
+            'show_stats': 'F4',
+            'dump_trace': 'F5'
         }
         
         with open('config.ini', 'w') as configfile:
@@ -186,18 +386,14 @@ class AdvancedMinecraftFarmBot:
     
     def setup_logging(self):
         """Setup enhanced logging configuration"""
-        log_filename = f"minecraft_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_filename),
-                logging.StreamHandler()
-            ]
-        )
+        # One size-rotated log instead of a new file per session. Disk and
+        # console output happen on a background writer thread, per-cell
+        # events are counted and logged once per pass
+        start_log_writer('advanced_farm_bot.log', self.config)
         self.logger = logging.getLogger(__name__)
+        self.pass_log = PassSummary(self.logger)
     
-    def start(self):
+    def start(self, hotkeys=True):
         """Start the advanced farm bot"""
         self.running = True
         self.stats['start_time'] = datetime.now()
@@ -206,23 +402,55 @@ class AdvancedMinecraftFarmBot:
         
         # Initialize farm grid
         self.initialize_farm_grid()
+        self.inputs.start()
+        self.config_watcher.start()
         
-        # Start the main farming loop in a separate thread
-        self.farming_thread = threading.Thread(target=self.advanced_farming_loop)
-        self.farming_thread.daemon = True
-        self.farming_thread.start()
+        if self.motion_calibration:
+            self.calibrate_motion()
         
-        # Start inventory monitoring thread
-        self.inventory_thread = threading.Thread(target=self.monitor_inventory)
-        self.inventory_thread.daemon = True
-        self.inventory_thread.start()
+        if self.runtime == 'asyncio':
+            # Capture, planning, actuation and inventory checks share one event loop
+            self.farming_thread = threading.Thread(target=AsyncFarmRuntime(self).run)
+            self.farming_thread.daemon = True
+            self.farming_thread.start()
+        else:
+            # Start the main farming loop in a separate thread
+            self.farming_thread = threading.Thread(target=self.advanced_farming_loop)
+            self.farming_thread.daemon = True
+            self.farming_thread.start()
+            
+            # Start inventory monitoring thread
+            self.inventory_thread = threading.Thread(target=self.monitor_inventory)
+            self.inventory_thread.daemon = True
+            self.inventory_thread.start()
         
         # Start the hotkey listener
-        self.setup_hotkeys()
+        if hotkeys:
+            self.setup_hotkeys()
+    
+    def profile(self, duration):
+        """Farm for duration seconds without hotkeys, then print and save the phase timings"""
+        self.start(hotkeys=False)
+        try:
+            time.sleep(duration)
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+        self.farming_thread.join(timeout=5.0)
+        self.show_statistics()
+        self.save_statistics()
+        if self.tracer is not None:
+            self.dump_trace()
+        if self.session is not None:
+            self.session.close()
     
     def stop(self):
         """Stop the farm bot"""
         self.running = False
+        self.config_watcher.stop()
+        self.inputs.stop()
+        self.inputs.backend.close()
+        self.pass_log.flush()
         self.update_session_duration()
         self.logger.info("Advanced farm bot stopped")
         print(f"{Fore.RED}Advanced farm bot stopped!{Style.RESET_ALL}")
@@ -230,6 +458,9 @@ class AdvancedMinecraftFarmBot:
     def pause(self):
         """Pause/resume the farm bot"""
         self.paused = not self.paused
+        if self.paused:
+            # Drop queued inputs so the player stops right away
+            self.inputs.clear()
         status = "paused" if self.paused else "resumed"
         self.logger.info(f"Advanced farm bot {status}")
         print(f"{Fore.YELLOW}Advanced farm bot {status}!{Style.RESET_ALL}")
@@ -240,6 +471,7 @@ class AdvancedMinecraftFarmBot:
         keyboard.add_hotkey('F2', self.pause)
         keyboard.add_hotkey('F3', self.exit_bot)
         keyboard.add_hotkey('F4', self.show_statistics)
+        keyboard.add_hotkey('F5', self.dump_trace)
         keyboard.wait()
     
     def toggle_bot(self):
@@ -253,7 +485,13 @@ class AdvancedMinecraftFarmBot:
         """Exit the bot"""
         self.stop()
         self.save_statistics()
+        if self.tracer is not None:
+            self.dump_trace()
+        if self.session is not None:
+            self.session.close()
         print(f"{Fore.RED}Exiting Advanced Minecraft Farm Bot...{Style.RESET_ALL}")
+        # os._exit skips atexit, write out the queued log records first
+        stop_log_writer()
         os._exit(0)
     
     def show_statistics(self):
@@ -264,7 +502,21 @@ class AdvancedMinecraftFarmBot:
         print(f"{Fore.GREEN}Crops Harvested: {self.stats['crops_harvested']}{Style.RESET_ALL}")
         print(f"{Fore.BLUE}Crops Planted: {self.stats['crops_planted']}{Style.RESET_ALL}")
         print(f"{Fore.MAGENTA}Waterings: {self.stats['waterings']}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}Inventory Status:{Style.RESET_ALL}")
+        presses_per_harvest = self.stats['movement_key_presses'] / max(self.stats['crops_harvested'], 1)
+        print(f"{Fore.CYAN}Movement Key Presses per Harvest: {presses_per_harvest:.2f}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}Input Actions: {self.inputs.sent} sent at {self.inputs.actions_per_second():.1f}/s, "
+              f"{self.inputs.coalesced} coalesced{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}Suppressed Duplicate Actions: {self.stats['suppressed_duplicates']}{Style.RESET_ALL}")
+        if self.farm_grid is not None:
+            counts = self.farm_grid.counts()
+            print(f"{Fore.WHITE}Farm Blocks: {counts['mature']} mature, {counts['growing']} growing, "
+                  f"{counts['empty']} empty, {counts['non_farmland']} not farmland{Style.RESET_ALL}")
+            print(f"{Fore.WHITE}Seconds per Growth Stage: {self.scheduler.growth_rates()}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Phase Timings:{Style.RESET_ALL}")
+        for line in self.profiler.report():
+            print(f"  {line}")
+        hotbar_reads = f" ({self.hotbar.reads} hotbar reads)" if self.hotbar is not None else ""
+        print(f"{Fore.WHITE}Inventory Status{hotbar_reads}:{Style.RESET_ALL}")
         for seed_type, count in self.inventory['seeds'].items():
             print(f"  {seed_type}: {count}")
     
@@ -278,13 +530,31 @@ class AdvancedMinecraftFarmBot:
         self.update_session_duration()
         stats_file = f"bot_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(stats_file, 'w') as f:
-            json.dump(self.stats, f, indent=2, default=str)
+            json.dump(dict(self.stats, timings=self.profiler.summary()), f, indent=2, default=str)
         self.logger.info(f"Statistics saved to {stats_file}")
     
+    def dump_trace(self):
+        """Save the traced spans as Chrome trace-event JSON"""
+        if self.tracer is None:
+            print(f"{Fore.YELLOW}Tracing is off, set enabled = true in [Tracing]{Style.RESET_ALL}")
+            return None
+        trace_file = f"farm_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.tracer.dump(trace_file)
+        self.logger.info(f"Trace saved to {trace_file}")
+        print(f"{Fore.CYAN}Trace saved to {trace_file}, open it in chrome://tracing{Style.RESET_ALL}")
+        return trace_file
+    
     def initialize_farm_grid(self):
         """Initialize the farm grid for pathfinding"""
         grid_size = self.farm_radius * 2 + 1
-        self.farm_grid = np.zeros((grid_size, grid_size), dtype=int)
+        self.farm_grid = FarmGrid(self.farm_radius, self.crop_types)
+        self.cooldowns = CooldownTable(self.farm_radius, self.cooldown_windows)
+        stage_counts = [len(crop_data['growth_stages']) for crop_data in self.crop_types.values()]
+        self.scheduler = GrowthScheduler(self.crop_types, stage_counts)
+        
+        # Trips to the farm center and chests are precomputed distance fields
+        anchors = [self.farm_grid.index(0, 0)] + [self.farm_grid.index(bx, by) for bx, by in self.chest_positions]
+        self.pathfinder = GridPathfinder(self.farm_grid.non_farmland, anchors)
         self.player_position = [self.farm_radius, self.farm_radius]
         self.logger.info(f"Initialized farm grid: {grid_size}x{grid_size}")
     
@@ -296,34 +566,75 @@ class AdvancedMinecraftFarmBot:
                 continue
             
             try:
+                cycle_start = time.perf_counter()
+                
+                # Step replay sources forward and grab the scan area once
+                # for the whole loop if configured
+                self.frame_source.next_frame()
+                self.refresh_snapshot('loop')
+                
                 # Check inventory levels
                 self.check_inventory_levels()
                 
-                # Smart farming based on inventory and crop maturity
-                if self.config.getboolean('Settings', 'auto_harvest', fallback=True):
-                    self.smart_harvest_crops()
+                # Smart farming based on inventory and crop maturity,
+                # with any settings changed in config.ini since the last pass
+                settings = self.current_settings()
                 
-                if self.config.getboolean('Settings', 'auto_plant', fallback=True):
-                    self.smart_plant_crops()
+                if self.fused_scan:
+                    # One scan and one visit per cell for every task
+                    self.fused_farming_pass()
+                else:
+                    if settings.auto_harvest:
+                        self.smart_harvest_crops()
+                    
+                    if settings.auto_plant:
+                        self.smart_plant_crops()
+                    
+                    if settings.auto_water:
+                        self.smart_water_crops()
+                    
+                    # Update farm grid
+                    self.update_farm_grid()
                 
-                if self.config.getboolean('Settings', 'auto_water', fallback=True):
-                    self.smart_water_crops()
+                self.pass_log.flush()
                 
-                # Update farm grid
-                self.update_farm_grid()
+                if self.fused_scan and self.growth_scheduling:
+                    self.wait_for_growth(settings.scan_interval)
+                else:
+                    with self.profiler.phase('sleep'):
+                        time.sleep(settings.scan_interval)
                 
-                time.sleep(self.config.getfloat('Advanced', 'scan_interval', fallback=0.5))
+                if self.tracer is not None:
+                    self.tracer.span('cycle', cycle_start, time.perf_counter(), 'cycle',
+                                     {'pass': self.pass_log.passes})
                 
             except Exception as e:
                 self.logger.error(f"Error in advanced farming loop: {e}")
                 time.sleep(1)
     
+    def next_pass_delay(self, scan_interval):
+        """Seconds until the next predicted growth event, between scan_interval and max_schedule_sleep"""
+        if not self.growth_scheduling:
+            return scan_interval
+        next_due = self.scheduler.next_due()
+        if next_due is None:
+            return self.max_schedule_sleep
+        return min(max(next_due - self.clock(), scan_interval), self.max_schedule_sleep)
+    
+    @timed('sleep')
+    def wait_for_growth(self, scan_interval):
+        """Sleep until the next predicted growth event, between scan_interval and max_schedule_sleep"""
+        delay = self.next_pass_delay(scan_interval)
+        deadline = time.time() + delay
+        while self.running and not self.paused and time.time() < deadline:
+            time.sleep(min(0.1, max(deadline - time.time(), 0)))
+    
     def monitor_inventory(self):
         """Monitor inventory levels in background"""
         while self.running:
             try:
-                # Simulate inventory checking (in real implementation, you'd use OCR)
-                # For now, we'll use a simple simulation
+                # The thread that grabs frames reads the hotbar, frame
+                # sources are not shared between threads
                 time.sleep(5)  # Check every 5 seconds
                 
                 if self.auto_restock and self.needs_restock():
@@ -335,10 +646,26 @@ class AdvancedMinecraftFarmBot:
                 time.sleep(1)
     
     def check_inventory_levels(self):
-        """Check current inventory levels"""
-        # This is a simplified inventory check
-        # In a real implementation, you'd use OCR to read inventory
-        pass
+        """Read seed counts and tools from the hotbar once a click that changed them has been sent"""
+        self.apply_hotbar(self.read_hotbar())
+    
+    def read_hotbar(self):
+        """Grab and match the hotbar if it may have changed, on the thread that grabs frames"""
+        if self.hotbar is None or not self.hotbar.needs_read(self.inputs.now()):
+            # Planting keeps counting seeds down until then
+            return None
+        with self.profiler.phase('inventory'):
+            return self.hotbar.read(self.get_screen_region, self.frame_source.size())
+    
+    def apply_hotbar(self, slots):
+        """Take seed counts and tools over from a hotbar read"""
+        if slots is None:
+            return
+        totals = self.hotbar.totals(slots)
+        for seed_type in self.inventory['seeds']:
+            self.inventory['seeds'][seed_type] = totals[seed_type]
+        for tool in self.inventory['tools']:
+            self.inventory['tools'][tool] = totals[tool] > 0
     
     def needs_restock(self):
         """Check if inventory needs restocking"""
@@ -347,22 +674,142 @@ class AdvancedMinecraftFarmBot:
                 return True
         return False
     
+    def fused_farming_pass(self):
+        """Scan once, then harvest, replant and water every cell in a single visit"""
+        self.logger.debug("Scanning farm...")
+        
+        self.refresh_snapshot('pass')
+        xs, ys = self.get_scan_positions()
+        entries, matches = self.classify_scan_grid(xs, ys)
+        
+        visits = self.plan_farming_pass(xs, ys, entries, matches)
+        for index, visit in enumerate(visits):
+            if not self.running or self.paused:
+                self.requeue_visits(visits[index:])
+                return
+            self.visit_cell(visit)
+    
+    def requeue_visits(self, visits):
+        """Make the blocks of visits that were planned but not run due again"""
+        for visit in visits:
+            self.scheduler.requeue(visit.block, self.clock())
+    
+    @timed('plan')
+    def plan_farming_pass(self, xs, ys, entries, matches):
+        """Update the farm model from a classified scan and plan the visits of one pass"""
+        needs_water = None
+        if self.planner.auto_water:
+            if self.inventory['tools']['water_bucket']:
+                needs_water = np.array([[self.needs_watering(x, y) for y in ys] for x in xs])
+            else:
+                self.logger.warning("No water bucket available for watering")
+        
+        states = build_state_map(self.classifier, entries, matches, needs_water)
+        self.update_farm_grid(entries, states)
+        
+        # Blocks known not to be farmland are never visited again
+        states[~self.farm_grid.scan_mask(len(xs), len(ys))] = 0
+        
+        if self.growth_scheduling:
+            # Only blocks whose predicted event is due get planned
+            due = self.scheduler.pop_due(self.clock())
+            due_mask = np.zeros(states.shape, dtype=bool)
+            for bx, by in due:
+                i, j = bx + len(xs) // 2, by + len(ys) // 2
+                if 0 <= i < len(xs) and 0 <= j < len(ys):
+                    due_mask[i, j] = True
+            states[~due_mask] = 0
+        
+        # Cells clicked moments ago may still look unchanged, skip repeats
+        suppressed = self.planner.suppressed
+        seen = self.snapshot.captured if self.snapshot is not None else time.perf_counter()
+        visits = self.planner.plan(xs, ys, states, entries, self.classifier, self.cooldowns, self.clock(), seen)
+        self.stats['suppressed_duplicates'] += self.planner.suppressed - suppressed
+        if self.optimize_tour:
+            # Walk the targets in a short tour instead of scan order
+            start = self.farm_grid.block(*self.player_position)
+            visits = self.planner.order_visits(visits, start)
+        
+        if self.growth_scheduling:
+            # Due blocks that need nothing yet go back into the queue
+            for block in due - {visit.block for visit in visits}:
+                self.scheduler.defer(block, self.clock())
+        return visits
+    
+    def visit_cell(self, visit):
+        """Move to a cell once and run every planned action there"""
+        x, y = visit.x, visit.y
+        actions = []
+        for action in visit.actions:
+            if action.kind == 'plant':
+                # Replant with the harvested crop if we still have its seeds
+                seed = action.item
+                if not seed or self.inventory['seeds'].get(seed, 0) <= 0:
+                    seed = self.select_best_seed()
+                if not seed:
+                    continue
+                action = action._replace(item=seed)
+            actions.append(action)
+        
+        if not actions:
+            # Nothing to plant with, look at the block again later
+            self.scheduler.defer(visit.block, self.clock())
+            return
+        
+        if self.smart_pathfinding:
+            self.smart_move_to_position(x, y)
+        else:
+            self.move_to_position(x, y)
+        self.player_position = list(self.farm_grid.index(*visit.block))
+        
+        self.scheduler.action_taken(visit.block, self.clock())
+        for action in actions:
+            self.farm_grid.record_action(*visit.block, action.kind, self.clock())
+            if action.kind == 'harvest':
+                self.logger.debug("Harvesting mature %s at (%d, %d)", action.item, x, y)
+                self.pass_log.add('harvested', action.item)
+                due = self.harvest_crop(x, y, action.item)
+                self.stats['crops_harvested'] += 1
+            elif action.kind == 'plant':
+                self.logger.debug("Planting %s at (%d, %d)", action.item, x, y)
+                self.pass_log.add('planted', action.item)
+                due = self.plant_crop(x, y, action.item)
+                self.stats['crops_planted'] += 1
+            elif action.kind == 'water':
+                self.logger.debug("Watering crop at (%d, %d)", x, y)
+                self.pass_log.add('watered')
+                due = self.water_crop(x, y)
+                self.stats['waterings'] += 1
+            if self.tracer is not None and visit.seen is not None:
+                # From the grab that showed the block to its click being sent
+                self.tracer.async_span(f"{action.kind} {visit.block}", visit.seen, due, 'target',
+                                       {'item': action.item})
+            # The click lands once the inputs booked ahead of it are sent
+            self.cooldowns.record(visit.block, action.kind, self.clock() + self.inputs.backlog())
+    
     def smart_harvest_crops(self):
         """Smart harvesting with crop type detection"""
-        self.logger.info("Smart harvesting crops...")
+        self.logger.debug("Smart harvesting crops...")
         
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
+        self.refresh_snapshot('pass')
+        xs, ys = self.get_scan_positions()
+        entries, _ = self.classify_scan_grid(xs, ys)
         
-        for x in range(center_x - 100, center_x + 100, 20):
-            for y in range(center_y - 100, center_y + 100, 20):
+        for i, x in enumerate(xs):
+            for j, y in enumerate(ys):
                 if not self.running or self.paused:
                     return
                 
                 # Detect crop type and maturity
-                crop_info = self.detect_crop_type_and_maturity(x, y)
+                crop_info = self.classifier.describe(entries[i, j])
+                block = (i - len(xs) // 2, j - len(ys) // 2)
                 if crop_info and crop_info['mature']:
-                    self.logger.info(f"Harvesting mature {crop_info['type']} at ({x}, {y})")
+                    if not self.cooldowns.allow(block, 'harvest', self.clock()):
+                        self.stats['suppressed_duplicates'] += 1
+                        continue
+                    
+                    self.logger.debug("Harvesting mature %s at (%d, %d)", crop_info['type'], x, y)
+                    self.pass_log.add('harvested', crop_info['type'])
                     
                     # Use smart pathfinding to move to crop
                     if self.smart_pathfinding:
@@ -373,24 +820,33 @@ class AdvancedMinecraftFarmBot:
                     # Harvest with appropriate tool
                     self.harvest_crop(x, y, crop_info['type'])
                     self.stats['crops_harvested'] += 1
+                    self.cooldowns.record(block, 'harvest', self.clock() + self.inputs.backlog())
     
     def smart_plant_crops(self):
         """Smart planting with seed selection"""
-        self.logger.info("Smart planting crops...")
+        self.logger.debug("Smart planting crops...")
         
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
+        self.refresh_snapshot('pass')
+        xs, ys = self.get_scan_positions()
+        _, matches = self.classify_scan_grid(xs, ys)
+        empty = self.classifier.empty_mask(matches)
         
-        for x in range(center_x - 100, center_x + 100, 20):
-            for y in range(center_y - 100, center_y + 100, 20):
+        for i, x in enumerate(xs):
+            for j, y in enumerate(ys):
                 if not self.running or self.paused:
                     return
                 
-                if self.is_plot_empty(x, y):
+                block = (i - len(xs) // 2, j - len(ys) // 2)
+                if empty[i, j]:
+                    if not self.cooldowns.allow(block, 'plant', self.clock()):
+                        self.stats['suppressed_duplicates'] += 1
+                        continue
+                    
                     # Select best seed based on inventory
                     best_seed = self.select_best_seed()
                     if best_seed:
-                        self.logger.info(f"Planting {best_seed} at ({x}, {y})")
+                        self.logger.debug("Planting %s at (%d, %d)", best_seed, x, y)
+                        self.pass_log.add('planted', best_seed)
                         
                         if self.smart_pathfinding:
                             self.smart_move_to_position(x, y)
@@ -399,26 +855,27 @@ class AdvancedMinecraftFarmBot:
                         
                         self.plant_crop(x, y, best_seed)
                         self.stats['crops_planted'] += 1
+                        self.cooldowns.record(block, 'plant', self.clock() + self.inputs.backlog())
     
     def smart_water_crops(self):
         """Smart watering based on soil moisture detection"""
-        self.logger.info("Smart watering crops...")
+        self.logger.debug("Smart watering crops...")
         
         # Check if we have water bucket
         if not self.inventory['tools']['water_bucket']:
             self.logger.warning("No water bucket available for watering")
             return
         
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
+        xs, ys = self.get_scan_positions()
         
-        for x in range(center_x - 100, center_x + 100, 20):
-            for y in range(center_y - 100, center_y + 100, 20):
+        for x in xs:
+            for y in ys:
                 if not self.running or self.paused:
                     return
                 
                 if self.needs_watering(x, y):
-                    self.logger.info(f"Watering crop at ({x}, {y})")
+                    self.logger.debug("Watering crop at (%d, %d)", x, y)
+                    self.pass_log.add('watered')
                     
                     if self.smart_pathfinding:
                         self.smart_move_to_position(x, y)
@@ -434,17 +891,42 @@ class AdvancedMinecraftFarmBot:
         if color is None:
             return None
         
-        for crop_type, crop_data in self.crop_types.items():
-            for stage, stage_color in enumerate(crop_data['growth_stages']):
-                distance = np.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(color, stage_color)))
-                if distance < self.config.getint('Advanced', 'color_threshold', fallback=50):
-                    return {
-                        'type': crop_type,
-                        'stage': stage,
-                        'mature': stage == len(crop_data['growth_stages']) - 1
-                    }
+        return self.classifier.classify_color(color)
+    
+    @timed('classify')
+    def classify_scan_grid(self, xs, ys, snapshot=None):
+        """Classify every scan cell with one lookup table call"""
+        size, samples = self.cell_size, self.cell_samples
+        classifier = self.classifier
+        if snapshot is None:
+            snapshot = self.snapshot
+        colors = None
+        if snapshot is not None:
+            if self.incremental_scan:
+                if self.scan_cache.classifier is not classifier:
+                    # color_threshold changed, cached classifications are stale
+                    self.scan_cache.classifier = classifier
+                    self.scan_cache.reset()
+                # Only cells whose pixels changed since the last pass are reclassified
+                result = self.scan_cache.classify(snapshot, xs, ys, size, size, samples)
+                if result is not None:
+                    return result
+            colors = snapshot.grid_colors(xs, ys, size, size, samples)
         
-        return None
+        if colors is None:
+            # No snapshot covers the grid, fall back to per-cell captures of
+            # the blocks that can still hold crops
+            scan_mask = self.farm_grid.scan_mask(len(xs), len(ys))
+            colors = np.array([[(scan_mask[i, j] and self.detect_crop_color(x, y, size, size)) or (-1, -1, -1)
+                                for j, y in enumerate(ys)] for i, x in enumerate(xs)])
+        
+        entries, matches = classifier.classify(colors)
+        
+        # Cells whose capture failed match nothing
+        failed = colors[..., 0] < 0
+        entries[failed] = -1
+        matches[failed] = 0
+        return entries, matches
     
     def select_best_seed(self):
         """Select the best seed based on inventory and preferences"""
@@ -462,50 +944,169 @@ class AdvancedMinecraftFarmBot:
     
     def smart_move_to_position(self, target_x, target_y):
         """Smart pathfinding to target position"""
-        # Simplified A* pathfinding
-        # In a real implementation, you'd implement proper pathfinding
-        self.move_to_position(target_x, target_y)
+        goal = self.screen_to_grid(target_x, target_y)
+        path = None
+        if goal is not None:
+            with self.profiler.phase('pathfind'):
+                path = self.pathfinder.find_path(self.player_position, goal)
+        
+        if path is None:
+            # Target is off the farm grid or unreachable
+            self.move_to_position(target_x, target_y)
+            return
+        
+        # Hold each key for a whole straight run instead of tapping per block
+        for (di, dj), steps in path_runs(path):
+            self.hold_movement(di * steps, dj * steps)
+        self.player_position = list(goal)
+    
+    def screen_to_grid(self, x, y):
+        """Farm grid index of a scanned screen position, or None if off the grid"""
+        xs, ys = self.get_scan_positions()
+        bx = (x - xs.start) // xs.step - len(xs) // 2
+        by = (y - ys.start) // ys.step - len(ys) // 2
+        i, j = self.farm_grid.index(bx, by)
+        if 0 <= i < self.farm_grid.size and 0 <= j < self.farm_grid.size:
+            return i, j
+        return None
     
-    def update_farm_grid(self):
+    def parse_block_list(self, text):
+        """Parse 'bx,by; bx,by' block offsets from the config"""
+        blocks = []
+        for item in text.split(';'):
+            if item.strip():
+                bx, by = item.split(',')
+                blocks.append((int(bx), int(by)))
+        return blocks
+    
+    @timed('move')
+    def hold_movement(self, dx, dy):
+        """Walk dx, dy blocks in one timed action, holding two keys for diagonals"""
+        x_time, y_time = self.motion.axis_holds(dx, dy)
+        holds = {}
+        if x_time:
+            holds[self.right_key if dx > 0 else self.left_key] = x_time
+        if y_time:
+            holds[self.backward_key if dy > 0 else self.forward_key] = y_time
+        
+        self.inputs.hold(holds)
+        self.stats['movement_key_presses'] += len(holds)
+    
+    def calibrate_motion(self):
+        """Fit the motion model from how far the view shifts per key hold"""
+        self.logger.info("Calibrating movement...")
+        xs, ys = self.get_scan_positions()
+        width = xs[-1] - xs[0] + self.cell_size
+        height = ys[-1] - ys[0] + self.cell_size
+        
+        for hold in (0.2, 0.4, 0.8):
+            # Walk forward and back again so the player ends where it started
+            for key in (self.forward_key, self.backward_key):
+                before = self.get_screen_region(xs.start, ys.start, width, height)
+                if before is not None:
+                    # xshm grabs of the same size share one buffer
+                    before = before.copy()
+                self.inputs.hold({key: hold})
+                self.inputs.wait_idle()
+                time.sleep(0.5)  # Let the player come to a stop
+                after = self.get_screen_region(xs.start, ys.start, width, height)
+                if before is None or after is None:
+                    continue
+                
+                _, shift_y = measure_shift(before, after)
+                self.motion.add_sample(hold, abs(shift_y) / self.scan_pitch)
+        
+        if self.motion.fit():
+            self.logger.info(f"Walking speed: {self.motion.speed:.2f} blocks/s "
+                             f"after {self.motion.latency:.3f}s")
+        else:
+            self.logger.warning("Movement calibration failed, keeping the configured walk_speed")
+    
+    def update_farm_grid(self, entries=None, states=None):
         """Update the farm grid with current state"""
-        # Update grid based on current farming state
-        pass
+        if entries is None:
+            xs, ys = self.get_scan_positions()
+            entries, matches = self.classify_scan_grid(xs, ys)
+            states = build_state_map(self.classifier, entries, matches)
+        
+        now = self.clock()
+        changed = self.farm_grid.observe(entries, states, self.classifier, now)
+        self.scheduler.observe(self.farm_grid, changed, now)
+        
+        # Blocks that are not farmland (water, fences) are obstacles
+        self.pathfinder.set_blocked(self.farm_grid.non_farmland)
     
     def harvest_crop(self, x, y, crop_type):
-        """Harvest a specific crop type"""
-        pyautogui.click(x, y, button=self.attack_key)
-        time.sleep(self.harvest_delay)
+        """Harvest a specific crop type, returning when the click is due"""
+        # Timed from queueing until the click is sent, per crop type
+        due = self.inputs.click(x, y, self.attack_key, self.harvest_delay, phase=('harvest', crop_type))
+        if self.hotbar is not None:
+            self.hotbar.invalidate(due + PICKUP_SECONDS)
         
         # Update inventory
         if crop_type in self.inventory['crops']:
             self.inventory['crops'][crop_type] += self.crop_types[crop_type]['harvest_yield']
+        return due
     
     def plant_crop(self, x, y, seed_type):
-        """Plant a specific seed type"""
-        pyautogui.click(x, y, button=self.use_key)
-        time.sleep(self.plant_delay)
+        """Plant a specific seed type, returning when the click is due"""
+        due = self.inputs.click(x, y, self.use_key, self.plant_delay, phase=('plant', seed_type))
+        if self.hotbar is not None:
+            self.hotbar.invalidate(due)
         
         # Update inventory
         if seed_type in self.inventory['seeds']:
             self.inventory['seeds'][seed_type] -= 1
+        return due
     
     def water_crop(self, x, y):
-        """Water a crop"""
-        pyautogui.click(x, y, button=self.use_key)
-        time.sleep(self.water_delay)
+        """Water a crop, returning when the click is due"""
+        due = self.inputs.click(x, y, self.use_key, self.water_delay, phase=('water', None))
+        if self.hotbar is not None:
+            self.hotbar.invalidate(due)
+        return due
     
     # Inherit other methods from the basic bot
     def get_screen_region(self, x, y, width, height):
         """Capture a specific region of the screen"""
         try:
-            screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
-            return np.array(screenshot)
+            return self.frame_source.grab(x, y, width, height)
         except Exception as e:
             self.logger.error(f"Error capturing screen region: {e}")
             return None
     
+    def get_scan_positions(self):
+        """Get the screen positions scanned for crops around the screen center"""
+        screen_width, screen_height = self.frame_source.size()
+        center_x, center_y = screen_width // 2, screen_height // 2
+        return (range(center_x - self.scan_radius, center_x + self.scan_radius, self.scan_pitch),
+                range(center_y - self.scan_radius, center_y + self.scan_radius, self.scan_pitch))
+    
+    @timed('capture')
+    def capture_scan_snapshot(self):
+        """Capture the whole scan area in a single grab"""
+        xs, ys = self.get_scan_positions()
+        width = max(len(xs) * xs.step, xs[-1] - xs[0] + self.cell_size)
+        height = max(len(ys) * ys.step, ys[-1] - ys[0] + self.cell_size)
+        captured = time.perf_counter()
+        region = self.get_screen_region(xs.start, ys.start, width, height)
+        if region is None:
+            return None
+        
+        snapshot = FrameSnapshot(region, xs.start, ys.start, captured)
+        snapshot.set_grid(xs, ys, self.cell_size, self.cell_size, self.cell_samples)
+        return snapshot
+    
+    def refresh_snapshot(self, scope):
+        """Re-grab the scan area if the snapshot mode refreshes at this scope"""
+        if self.snapshot_mode == scope:
+            self.snapshot = self.capture_scan_snapshot()
+    
     def detect_crop_color(self, x, y, width=10, height=10):
         """Detect the color of crops at a specific screen position"""
+        if self.snapshot is not None and self.snapshot.covers(x, y, width, height):
+            return self.snapshot.mean_color(x, y, width, height)
+        
         region = self.get_screen_region(x, y, width, height)
         if region is None:
             return None
@@ -522,43 +1123,22 @@ class AdvancedMinecraftFarmBot:
             return False
         
         # Check if the color is close to dirt/brown (empty plot)
-        dirt_colors = [(139, 69, 19), (160, 82, 45), (205, 133, 63)]
-        for dirt_color in dirt_colors:
-            distance = np.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(color, dirt_color)))
-            if distance < 30:
-                return True
-        return False
+        return self.classifier.is_empty(color)
     
     def move_to_position(self, target_x, target_y):
         """Move the player to a specific position"""
-        current_x, current_y = pyautogui.position()
-        
-        # Calculate direction
-        dx = target_x - current_x
-        dy = target_y - current_y
-        
-        # Move towards target
-        if abs(dx) > 5:
-            if dx > 0:
-                pyautogui.keyDown(self.right_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.right_key)
-            else:
-                pyautogui.keyDown(self.left_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.left_key)
+        goal = self.screen_to_grid(target_x, target_y)
+        if goal is None:
+            self.logger.warning(f"Position ({target_x}, {target_y}) is off the farm grid")
+            return
         
-        if abs(dy) > 5:
-            if dy > 0:
-                pyautogui.keyDown(self.backward_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.backward_key)
-            else:
-                pyautogui.keyDown(self.forward_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.forward_key)
+        # Dead reckoning: the player is where the last move should have taken it
+        dx = goal[0] - self.player_position[0]
+        dy = goal[1] - self.player_position[1]
+        self.hold_movement(dx, dy)
+        self.player_position = list(goal)
 
-def main():
+def main(runtime=None, profile=None):
     """Main function to run the Advanced Minecraft Farm Bot"""
     print(f"{Fore.CYAN}=== Advanced Minecraft Farm Bot ==={Style.RESET_ALL}")
     print(f"{Fore.GREEN}Made by DDS{Style.RESET_ALL}")
@@ -570,7 +1150,13 @@ def main():
     input()
     
     bot = AdvancedMinecraftFarmBot()
-    bot.start()
+    if runtime:
+        bot.runtime = runtime
+    if profile:
+        # Timed run that prints and saves where the time went
+        bot.profile(profile)
+    else:
+        bot.start()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Asyncio Runtime for the Advanced Minecraft Farm Bot
+Runs capture, classification, planning, actuation and inventory checks as tasks
+Made by DDS
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncFarmRuntime:
+    """Pipelined farming loop on a single event loop
+
+    Capture, classification, planning, actuation and inventory checks are
+    tasks connected by bounded queues. Screen grabs and classification run
+    in an executor, so the next frame is grabbed and classified while the
+    visits of the previous pass are still being acted on. Every change to
+    the bot's inventory, statistics and farm model happens on the event
+    loop and the executor only hands over fresh arrays, so nothing needs
+    a lock.
+    """
+
+    def __init__(self, bot, visit_queue_size=8):
+        self.bot = bot
+        self.frames = asyncio.Queue(maxsize=1)
+        self.scans = asyncio.Queue(maxsize=1)
+        self.visits = asyncio.Queue(maxsize=visit_queue_size)
+        self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='farm-io')
+        self.loop = None
+
+        self.frames_captured = 0
+        self.passes_planned = 0
+
+    def run(self):
+        """Run the farming tasks until the bot stops"""
+        try:
+            asyncio.run(self.main())
+        finally:
+            self.executor.shutdown(wait=False)
+
+    async def main(self):
+        """Start every task and cancel them once the bot stops"""
+        self.loop = asyncio.get_running_loop()
+        tasks = [
+            asyncio.create_task(self.guard(self.capture_task, "capture")),
+            asyncio.create_task(self.guard(self.classify_task, "classification")),
+            asyncio.create_task(self.guard(self.plan_task, "planning")),
+            asyncio.create_task(self.guard(self.actuation_task, "actuation")),
+            asyncio.create_task(self.guard(self.inventory_task, "inventory monitoring")),
+        ]
+        while self.bot.running:
+            await asyncio.sleep(0.1)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def guard(self, step, name):
+        """Run one step of a task forever, logging errors like the threaded loop"""
+        while self.bot.running:
+            if self.bot.paused:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                await step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.bot.logger.error(f"Error in {name} task: {e}")
+                await asyncio.sleep(1)
+
+    def offload(self, func, *args):
+        """Run a blocking call in the executor"""
+        return self.loop.run_in_executor(self.executor, func, *args)
+
+    def capture(self):
+        """Step the frame source, grab the scan area and read the hotbar of the same frame"""
+        self.bot.frame_source.next_frame()
+        return self.bot.capture_scan_snapshot(), self.bot.read_hotbar()
+
+    async def capture_task(self):
+        """Grab the next frame while earlier frames are classified and acted on"""
+        frame = await self.offload(self.capture)
+        self.frames_captured += 1
+        await self.frames.put(frame)
+
+    async def classify_task(self):
+        """Classify the scan grid of the latest frame"""
+        snapshot, hotbar = await self.frames.get()
+        xs, ys = self.bot.get_scan_positions()
+        entries, matches = await self.offload(self.bot.classify_scan_grid, xs, ys, snapshot)
+        await self.scans.put((snapshot, hotbar, xs, ys, entries, matches))
+
+    async def plan_task(self):
+        """Update the farm model and queue the visits of one pass"""
+        snapshot, hotbar, xs, ys, entries, matches = await self.scans.get()
+        bot = self.bot
+        bot.snapshot = snapshot
+        bot.apply_hotbar(hotbar)
+
+        # Take over settings changed in config.ini since the last pass
+        settings = bot.current_settings()
+
+        # Summarize the visits acted on since the previous pass was planned
+        bot.pass_log.flush()
+        bot.logger.debug("Scanning farm...")
+        for visit in bot.plan_farming_pass(xs, ys, entries, matches):
+            await self.visits.put(visit)
+        self.passes_planned += 1
+
+        await self.wait_for_growth(settings.scan_interval)
+
+    async def wait_for_growth(self, scan_interval):
+        """Async version of the threaded loop's sleep between passes"""
+        bot = self.bot
+        delay = bot.next_pass_delay(scan_interval)
+
+        start = time.perf_counter()
+        deadline = time.time() + delay
+        while bot.running and not bot.paused and time.time() < deadline:
+            await asyncio.sleep(min(0.1, max(deadline - time.time(), 0)))
+        bot.profiler.span('sleep', start, time.perf_counter())
+
+    async def actuation_task(self):
+        """Act on planned visits one at a time"""
+        visit = await self.visits.get()
+        # Key holds and clicks go to the input dispatcher, only wait for it
+        # in the executor when its backlog is full
+        inputs = self.bot.inputs
+        if inputs.backlog() > inputs.max_backlog:
+            await self.offload(inputs.wait_for_room)
+        if self.bot.running and not self.bot.paused:
+            self.bot.visit_cell(visit)
+        else:
+            self.bot.requeue_visits([visit])
+
+    async def inventory_task(self):
+        """Monitor inventory levels in the background"""
+        await asyncio.sleep(5)  # Check every 5 seconds
+        if self.bot.auto_restock and self.bot.needs_restock():
+            self.bot.logger.info("Inventory restock needed")
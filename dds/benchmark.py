@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Minecraft Farm Bot Benchmarks
+Measure the speed of the bot's building blocks without playing Minecraft
+Made by DDS
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import threading
+import time
+import tracemalloc
+from dataclasses import fields, replace
+from datetime import datetime
+from colorama import init, Fore, Style
+
+# Initialize colorama for colored output
+init()
+
+# Crop colors of the basic bot, used to paint synthetic farms
+BENCHMARK_CROPS = {
+    'wheat': {'seeds': 'wheat_seeds', 'mature_color': (139, 69, 19)},
+    'carrots': {'seeds': 'carrot', 'mature_color': (255, 165, 0)},
+    'potatoes': {'seeds': 'potato', 'mature_color': (139, 69, 19)},
+    'beetroot': {'seeds': 'beetroot_seeds', 'mature_color': (139, 0, 0)}
+}
+
+
+def measure_rate(func, duration):
+    """Call func repeatedly for about duration seconds and return calls per second"""
+    func()  # Warm up caches and lazily created buffers
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def benchmark_capture(args):
+    """Compare frames per second of the ImageGrab and XShm capture paths"""
+    from frame_sources import LiveCaptureSource, XShmCaptureSource
+
+    print(f"{Fore.CYAN}=== Capture Benchmark ==={Style.RESET_ALL}")
+    xshm = XShmCaptureSource(args.display)
+    live = LiveCaptureSource()
+    screen_width, screen_height = xshm.size()
+
+    regions = [
+        ('scan area', screen_width // 2 - 100, screen_height // 2 - 100, 200, 200),
+        ('full screen', 0, 0, screen_width, screen_height),
+    ]
+
+    try:
+        for name, x, y, width, height in regions:
+            print(f"{Fore.YELLOW}{name} ({width}x{height}){Style.RESET_ALL}")
+            results = {}
+            for label, source in (('ImageGrab', live), ('XShm', xshm)):
+                results[label] = measure_rate(lambda: source.grab(x, y, width, height), args.duration)
+                print(f"  {label:<10} {results[label]:9.1f} fps")
+            speedup = results['XShm'] / results['ImageGrab']
+            print(f"{Fore.GREEN}  XShm speedup: {speedup:.1f}x{Style.RESET_ALL}")
+    finally:
+        xshm.close()
+
+
+def benchmark_tour(args):
+    """Compare blocks walked in scan order with the optimized tour"""
+    import numpy as np
+    from tour_optimizer import TourOptimizer, tour_length
+
+    print(f"{Fore.CYAN}=== Tour Benchmark ==={Style.RESET_ALL}")
+    print(f"{'radius':>6} {'targets':>8} {'scan order':>11} {'nearest':>9} {'tour':>9} {'saved':>7} {'time':>9}")
+    rng = np.random.default_rng(args.seed)
+    optimizer = TourOptimizer()
+    for radius in args.radii:
+        # Scan order is x-major, like the planner's walk over the scan grid
+        size = radius * 2 + 1
+        wanted = rng.random((size, size)) < args.density
+        points = [(int(i) - radius, int(j) - radius) for i, j in np.argwhere(wanted)]
+        start = (0, 0)
+
+        scan_order = tour_length(points, range(len(points)), start)
+        begin = time.perf_counter()
+        order = optimizer.order(points, start)
+        elapsed = time.perf_counter() - begin
+        nearest = optimizer.nearest_neighbor(points, start) if points else []
+        nearest_length = tour_length(points, nearest, start)
+        tour = tour_length(points, order, start)
+
+        saved = 1.0 - tour / scan_order if scan_order else 0.0
+        print(f"{radius:>6} {len(points):>8} {scan_order:>11} {nearest_length:>9} {tour:>9} "
+              f"{saved:>6.0%} {elapsed * 1000:>7.1f}ms")
+
+
+def benchmark_patterns(args):
+    """Measure cells processed per second by every traversal pattern"""
+    import numpy as np
+    from crop_classifier import CropClassifier
+    from frame_sources import SyntheticFarmSource
+    from traversal import PATTERNS
+    from vision import FrameSnapshot
+
+    print(f"{Fore.CYAN}=== Traversal Pattern Benchmark ==={Style.RESET_ALL}")
+    classifier = CropClassifier(BENCHMARK_CROPS, color_threshold=50)
+    pitch, size = 20, 10
+
+    for radius in args.radii:
+        side = radius * 2 + 1
+        source = SyntheticFarmSource(BENCHMARK_CROPS, grid_size=side, cell_size=pitch, seed=args.seed)
+        width, height = source.size()
+        snapshot = FrameSnapshot(source.grab(0, 0, width, height), 0, 0)
+        # Block centers, matching the bot's stops around the screen center
+        center_x = source.left + side // 2 * pitch + pitch // 2
+        center_y = source.top + side // 2 * pitch + pitch // 2
+        print(f"{Fore.YELLOW}farm_radius {radius} ({side * side} cells){Style.RESET_ALL}")
+
+        def local_work(cells):
+            for col, row in cells:
+                x = center_x + col * pitch - size // 2
+                y = center_y + row * pitch - size // 2
+                color = snapshot.mean_color(x, y, size, size)
+                if not classifier.is_mature(color, 'wheat'):
+                    classifier.is_empty(color)
+
+        for name, pattern in PATTERNS.items():
+            rate = measure_rate(lambda: local_work(pattern(radius)), args.duration) * side * side
+            print(f"  {name:<12} {rate:12.0f} cells/s")
+
+        # The old grid pattern classified the whole scan grid at every stop
+        xs = range(center_x - radius * pitch - size // 2, center_x + (radius + 1) * pitch - size // 2, pitch)
+        ys = range(center_y - radius * pitch - size // 2, center_y + (radius + 1) * pitch - size // 2, pitch)
+
+        def full_scan():
+            colors = np.array([[snapshot.mean_color(x, y, size, size) for y in ys] for x in xs])
+            classifier.classify(colors)
+
+        rate = measure_rate(full_scan, args.duration)
+        print(f"  {'full scan':<12} {rate:12.0f} cells/s (one scan per stop)")
+
+
+def create_headless_bot(seed, action_delay):
+    """Advanced bot on a synthetic farm that records its inputs instead of sending them"""
+    from advanced_farm_bot import AdvancedMinecraftFarmBot
+    from frame_sources import SyntheticFarmSource
+    from input_backends import RecordingInputBackend
+    from input_dispatcher import InputDispatcher
+    from motion import MotionModel
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = AdvancedMinecraftFarmBot(record=False)
+
+    class CountingFarmSource(SyntheticFarmSource):
+        frames = 0
+
+        def next_frame(self):
+            CountingFarmSource.frames += 1
+            super().next_frame()
+
+    bot.frame_source = CountingFarmSource(bot.crop_types, seed=seed)
+    bot.inputs = InputDispatcher(RecordingInputBackend())
+    bot.inputs.profiler = bot.profiler
+    bot.motion = MotionModel(speed=1e6, latency=0.0)
+    bot.settings = replace(bot.settings, plant_delay=action_delay, harvest_delay=action_delay,
+                           water_delay=action_delay, growth_scheduling=False, scan_interval=0.0)
+    bot.current_settings()
+    bot.inventory['seeds'] = {seed_type: 10 ** 9 for seed_type in bot.inventory['seeds']}
+    bot.inventory['tools']['water_bucket'] = True
+    return bot
+
+
+def benchmark_runtime(args):
+    """Compare the threaded farming loop with the asyncio runtime"""
+    from async_runtime import AsyncFarmRuntime
+
+    print(f"{Fore.CYAN}=== Runtime Benchmark ==={Style.RESET_ALL}")
+    logging.disable(logging.WARNING)
+    for name in ('threaded', 'asyncio'):
+        bot = create_headless_bot(args.seed, args.action_delay)
+        bot.running = True
+        bot.inputs.start()
+        target = bot.advanced_farming_loop if name == 'threaded' else AsyncFarmRuntime(bot).run
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+
+        start = time.perf_counter()
+        thread.start()
+        time.sleep(args.duration)
+        bot.running = False
+        elapsed = time.perf_counter() - start
+        thread.join(timeout=5.0)
+        bot.inputs.stop()
+
+        frames = bot.frame_source.frames
+        visits = bot.stats['crops_harvested'] + bot.stats['crops_planted'] + bot.stats['waterings']
+        # Clicks must never come closer together than the game's action delay
+        gaps = bot.inputs.backend.intervals('click')
+        min_gap = min(gaps) * 1000 if gaps else 0.0
+        print(f"  {name:<10} {frames / elapsed:8.1f} frames/s {visits / elapsed:10.1f} actions/s "
+              f"{bot.inputs.sent / elapsed:10.1f} inputs/s {min_gap:8.1f} ms min click gap")
+    logging.disable(logging.NOTSET)
+
+
+def suite_geometry(grid):
+    """Scan pitch and sampled cell size that fit a grid x grid farm on a 1920x1080 screen"""
+    pitch = max(min(20, 1000 // grid), 2)
+    return pitch, max(pitch // 2, 1)
+
+
+def fit_scan_grid(bot, grid):
+    """Point a bot's scan grid at a grid x grid farm, one scan cell per block"""
+    # 10x10 keeps the default pitch of 20 pixels
+    pitch, cell_size = suite_geometry(grid)
+    bot.scan_pitch = pitch
+    bot.cell_size = cell_size
+    bot.scan_radius = grid * pitch // 2
+    bot.farm_radius = grid // 2
+    return pitch
+
+
+def create_suite_bot(kind, grid, seed):
+    """Basic or advanced bot on a synthetic grid x grid farm that records its inputs"""
+    from frame_sources import SyntheticFarmSource
+    from input_backends import RecordingInputBackend
+    from motion import MotionModel
+
+    if kind == 'advanced':
+        bot = create_headless_bot(seed, 0.0)
+    else:
+        from minecraft_farm_bot import MinecraftFarmBot
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot = MinecraftFarmBot(record=False)
+        bot.input_backend = RecordingInputBackend()
+        bot.motion = MotionModel(speed=1e6, latency=0.0)
+        bot.settings = replace(bot.settings, plant_delay=0.0, harvest_delay=0.0, water_delay=0.0)
+        bot.current_settings()
+
+    pitch = fit_scan_grid(bot, grid)
+    bot.frame_source = SyntheticFarmSource(bot.crop_types, grid_size=grid, cell_size=pitch, seed=seed)
+    if kind == 'advanced':
+        bot.initialize_farm_grid()
+    bot.running = True
+    return bot
+
+
+def suite_scan_pass(bot, kind):
+    """Grab and classify the farm once, planning the pass for the advanced bot
+
+    Returns the seconds spent classifying.
+    """
+    xs, ys = bot.get_scan_positions()
+    bot.snapshot = bot.capture_scan_snapshot()
+    start = time.perf_counter()
+    entries, matches = bot.classify_scan_grid(xs, ys)
+    elapsed = time.perf_counter() - start
+    if kind == 'advanced':
+        bot.plan_farming_pass(xs, ys, entries, matches)
+    return elapsed
+
+
+def suite_action_pass(bot, kind):
+    """Run the bot's own farming pass on the current frame"""
+    if kind == 'advanced':
+        bot.fused_farming_pass()
+    else:
+        bot.harvest_mature_crops()
+        bot.plant_crops()
+    bot.pass_log.flush()
+
+
+def suite_inputs(bot, kind):
+    """Inputs the bot has handed to its recording backend"""
+    backend = bot.inputs.backend if kind == 'advanced' else bot.input_backend
+    return len(backend.actions)
+
+
+def run_suite_case(kind, grid, args):
+    """Measure one bot on one farm size"""
+    from profiling import LatencyHistogram
+
+    # Scan passes: capture and classify (and plan) back to back
+    bot = create_suite_bot(kind, grid, args.seed)
+    latency = LatencyHistogram()
+    classify_time = 0.0
+    xs, ys = bot.get_scan_positions()
+    suite_scan_pass(bot, kind)  # Warm up caches and lazily created buffers
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.duration:
+        bot.frame_source.next_frame()
+        began = time.perf_counter()
+        classify_time += suite_scan_pass(bot, kind)
+        latency.record((time.perf_counter() - began) * 1e6)
+    cells = len(xs) * len(ys)
+
+    # Action passes: the bot's farming pass with every input recorded.
+    # Only whole passes count, at least one even if planning one takes
+    # longer than the duration
+    if kind == 'advanced':
+        bot.inputs.start()
+    passes = 0
+    start = time.perf_counter()
+    while passes == 0 or time.perf_counter() - start < args.duration:
+        bot.frame_source.next_frame()
+        suite_action_pass(bot, kind)
+        passes += 1
+    if kind == 'advanced':
+        bot.inputs.wait_idle(timeout=5.0)
+        bot.inputs.stop()
+    elapsed = time.perf_counter() - start
+    actions = suite_inputs(bot, kind)
+
+    # Memory high-water mark of building the bot and running a pass,
+    # measured apart because tracemalloc slows every allocation down. The
+    # passes above already loaded every module, so imports don't count
+    tracemalloc.start()
+    bot = create_suite_bot(kind, grid, args.seed)
+    suite_scan_pass(bot, kind)
+    suite_action_pass(bot, kind)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if kind == 'advanced':
+        bot.inputs.stop()
+
+    return {
+        'bot': kind,
+        'grid': f"{grid}x{grid}",
+        'cells': cells,
+        'scan_passes': latency.count,
+        'cells_per_second': cells * latency.count / classify_time if classify_time else 0.0,
+        'scan_pass_ms': latency.summary(),
+        'action_passes': passes,
+        'actions_per_second': actions / elapsed,
+        'peak_memory_mb': peak / 2 ** 20,
+    }
+
+
+def print_suite_result(result, baseline=None):
+    """Print one suite case, with the change from a baseline case if given"""
+    line = (f"  {result['bot']:<9} {result['grid']:>9} {result['cells_per_second']:>12.0f} "
+            f"{result['scan_pass_ms']['p50_ms']:>9.2f} {result['scan_pass_ms']['p95_ms']:>9.2f} "
+            f"{result['actions_per_second']:>10.1f} {result['peak_memory_mb']:>9.1f}")
+    print(line)
+    if baseline is None:
+        return
+
+    changes = []
+    for name, new, old in (
+        ('cells/s', result['cells_per_second'], baseline['cells_per_second']),
+        ('p95', result['scan_pass_ms']['p95_ms'], baseline['scan_pass_ms']['p95_ms']),
+        ('actions/s', result['actions_per_second'], baseline['actions_per_second']),
+        ('memory', result['peak_memory_mb'], baseline['peak_memory_mb']),
+    ):
+        if old:
+            changes.append(f"{name} {(new - old) / old:+.0%}")
+    print(f"{Fore.YELLOW}  {'':<9} {'vs baseline':>9}  {', '.join(changes)}{Style.RESET_ALL}")
+
+
+def benchmark_suite(args):
+    """Measure both bots on synthetic farms of every size and save the results as JSON"""
+    import numpy as np
+
+    print(f"{Fore.CYAN}=== Benchmark Suite ==={Style.RESET_ALL}")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(result['bot'], result['grid']): result for result in json.load(f)['results']}
+
+    print(f"  {'bot':<9} {'grid':>9} {'cells/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'actions/s':>10} {'peak MB':>9}")
+    logging.disable(logging.WARNING)
+    results = []
+    try:
+        for kind in args.bots:
+            for grid in args.grids:
+                result = run_suite_case(kind, grid, args)
+                results.append(result)
+                print_suite_result(result, baseline.get((kind, result['grid'])))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'duration': args.duration,
+        'seed': args.seed,
+        'results': results,
+    }
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"{Fore.GREEN}Results saved to {output}{Style.RESET_ALL}")
+
+
+def parse_setting_overrides(items):
+    """Turn name=value strings into typed BotSettings values"""
+    from settings import BotSettings
+
+    types = {item.name: item.type for item in fields(BotSettings)}
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition('=')
+        if name not in types:
+            raise ValueError(f"Unknown setting: {name}")
+        if types[name] is bool:
+            overrides[name] = value.strip().lower() in ('1', 'true', 'yes', 'on')
+        else:
+            overrides[name] = types[name](value)
+    return overrides
+
+
+def run_farming_pass(bot):
+    """One pass of the threaded farming loop without its sleep, returning the settings it used"""
+    settings = bot.current_settings()
+    bot.refresh_snapshot('loop')
+    if bot.fused_scan:
+        bot.fused_farming_pass()
+    else:
+        if settings.auto_harvest:
+            bot.smart_harvest_crops()
+        if settings.auto_plant:
+            bot.smart_plant_crops()
+        if settings.auto_water:
+            bot.smart_water_crops()
+        bot.update_farm_grid()
+    bot.pass_log.flush()
+    return settings
+
+
+def create_simulated_bot(args):
+    """Advanced bot playing a simulated farm in simulated time"""
+    from advanced_farm_bot import AdvancedMinecraftFarmBot
+    from farm_simulator import SimulatedFarm, SimulatedInputs
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = AdvancedMinecraftFarmBot(record=False)
+    if args.grid:
+        fit_scan_grid(bot, args.grid)
+    controls = {
+        'forward': bot.forward_key,
+        'backward': bot.backward_key,
+        'left': bot.left_key,
+        'right': bot.right_key,
+        'attack': bot.attack_key,
+        'use': bot.use_key,
+    }
+    farm = SimulatedFarm(bot.crop_types, grid_size=2 * bot.scan_radius // bot.scan_pitch,
+                         cell_size=bot.scan_pitch, seed=args.seed, stage_seconds=args.stage_seconds,
+                         controls=controls)
+
+    bot.frame_source = farm
+    bot.inputs = SimulatedInputs(farm)
+    bot.clock = farm.time
+    bot.settings = replace(bot.settings, **parse_setting_overrides(args.set))
+    bot.current_settings()
+    bot.initialize_farm_grid()
+    bot.inventory['seeds'] = {seed_type: 10 ** 9 for seed_type in bot.inventory['seeds']}
+    bot.inventory['tools']['water_bucket'] = True
+    bot.running = True
+    bot.inputs.start()
+    return bot, farm
+
+
+def benchmark_simulate(args):
+    """Play a simulated farm for some simulated hours and report the yield"""
+    import numpy as np
+
+    print(f"{Fore.CYAN}=== Farm Simulation ==={Style.RESET_ALL}")
+    # The bot's watering check draws from numpy's global generator
+    np.random.seed(args.seed)
+    logging.disable(logging.WARNING)
+    try:
+        bot, farm = create_simulated_bot(args)
+        end = args.hours * 3600
+        passes = 0
+        start = time.perf_counter()
+        while farm.time() < end:
+            began = time.perf_counter()
+            settings = run_farming_pass(bot)
+            passes += 1
+            if args.compute_time:
+                # The bot's own scanning and planning time passes in the game too
+                farm.advance(time.perf_counter() - began)
+            delay = bot.next_pass_delay(settings.scan_interval) if bot.fused_scan else settings.scan_interval
+            # Never less than a game tick, so a pass with nothing to do still moves time on
+            farm.advance(max(delay, 0.05))
+        elapsed = time.perf_counter() - start
+    finally:
+        logging.disable(logging.NOTSET)
+
+    report = farm.report()
+    report.update({
+        'passes': passes,
+        'inputs': bot.inputs.sent,
+        'wall_seconds': elapsed,
+        'speedup': farm.time() / elapsed if elapsed else 0.0,
+        'seed': args.seed,
+        'settings': args.set,
+    })
+    print(f"  Simulated {report['simulated_hours']:.2f} h in {elapsed:.1f} s ({report['speedup']:.0f}x real time)")
+    print(f"{Fore.GREEN}  Harvested: {report['harvested']} ({report['harvested_per_hour']:.1f}/h) "
+          f"{report['harvested_by_crop']}{Style.RESET_ALL}")
+    print(f"  Planted: {report['planted']}, watered: {report['watered']}, broken unripe: {report['broken']}")
+    print(f"  Wasted clicks: {report['wasted_clicks']}, out of reach: {report['out_of_reach']} "
+          f"of {report['clicks']}")
+    print(f"  Blocks walked: {report['blocks_walked']:.0f}, passes: {passes}, inputs: {bot.inputs.sent}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"{Fore.GREEN}Results saved to {args.output}{Style.RESET_ALL}")
+
+
+def benchmark_replay(args):
+    """Feed a recorded session through detection and planning as fast as possible"""
+    import numpy as np
+    from advanced_farm_bot import AdvancedMinecraftFarmBot
+    from input_backends import RecordingInputBackend
+    from input_dispatcher import ImmediateDispatcher
+    from session_recorder import SessionReplaySource
+
+    print(f"{Fore.CYAN}=== Session Replay ==={Style.RESET_ALL}")
+    # The bot's watering check draws from numpy's global generator
+    np.random.seed(args.seed)
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot = AdvancedMinecraftFarmBot(record=False)
+        source = SessionReplaySource(args.session)
+        recorded_config = source.header.get('config', {})
+        changed = sorted(f"{section}.{key}" for section, values in recorded_config.items()
+                         for key, value in values.items()
+                         if bot.config.get(section, key, fallback=None) != value)
+        if changed:
+            print(f"{Fore.YELLOW}  config.ini differs from the recording: {', '.join(changed)}{Style.RESET_ALL}")
+
+        bot.frame_source = source
+        bot.inputs = ImmediateDispatcher(RecordingInputBackend())
+        bot.inputs.profiler = bot.profiler
+        bot.clock = source.time
+        bot.running = True
+        bot.inputs.start()
+
+        start = time.perf_counter()
+        while True:
+            source.next_frame()
+            if source.finished:
+                break
+            # Plant and water only with what the recorded bot had
+            if source.inventory is not None:
+                for name, items in source.inventory.items():
+                    bot.inventory[name].update(items)
+            run_farming_pass(bot)
+        elapsed = time.perf_counter() - start
+    finally:
+        logging.disable(logging.NOTSET)
+
+    recorded = [[kind, args] for _, kind, args in source.inputs]
+    replayed = [[kind, list(args)] for _, kind, args in bot.inputs.backend.actions]
+    same = 0
+    for old, new in zip(recorded, replayed):
+        if old != new:
+            break
+        same += 1
+
+    print(f"  Replayed {source.loops} loops in {elapsed:.2f} s ({source.loops / elapsed if elapsed else 0:.0f} loops/s)")
+    print(f"  Inputs: {len(recorded)} recorded, {len(replayed)} replayed, first {same} identical")
+    print(f"{Fore.WHITE}  Phase Timings:{Style.RESET_ALL}")
+    for line in bot.profiler.report():
+        print(f"    {line}")
+    if args.output:
+        # Decisions and timings of this code version, to diff against another
+        with open(args.output, 'w') as f:
+            json.dump({'session': args.session, 'loops': source.loops, 'wall_seconds': elapsed,
+                       'identical_inputs': same, 'recorded_inputs': len(recorded),
+                       'timings': bot.profiler.summary(), 'inputs': replayed}, f, indent=2)
+        print(f"{Fore.GREEN}Results saved to {args.output}{Style.RESET_ALL}")
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Minecraft Farm Bot benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    capture = subparsers.add_parser('capture', help="Compare screen capture backends "
+                                    "(run under Xvfb: xvfb-run -s '-screen 0 1920x1080x24')")
+    capture.add_argument('--display', default=None, help="X display, defaults to $DISPLAY")
+    capture.add_argument('--duration', type=float, default=2.0, help="Seconds per measurement")
+    capture.set_defaults(func=benchmark_capture)
+
+    tour = subparsers.add_parser('tour', help="Compare travel in scan order with the optimized tour")
+    tour.add_argument('--radii', type=int, nargs='+', default=[5, 10, 20, 30, 40, 50],
+                      help="farm_radius values to test")
+    tour.add_argument('--density', type=float, default=0.3, help="Fraction of blocks that need work")
+    tour.add_argument('--seed', type=int, default=0, help="Random seed for the targets")
+    tour.set_defaults(func=benchmark_tour)
+
+    patterns = subparsers.add_parser('patterns', help="Measure cells per second of the traversal patterns")
+    patterns.add_argument('--radii', type=int, nargs='+', default=[5, 10, 20],
+                          help="farm_radius values to test")
+    patterns.add_argument('--duration', type=float, default=1.0, help="Seconds per measurement")
+    patterns.add_argument('--seed', type=int, default=0, help="Random seed for the synthetic farm")
+    patterns.set_defaults(func=benchmark_patterns)
+
+    runtime = subparsers.add_parser('runtime', help="Compare the threaded loop with the asyncio runtime "
+                                    "(run from the directory with config.ini)")
+    runtime.add_argument('--duration', type=float, default=5.0, help="Seconds per runtime")
+    runtime.add_argument('--action-delay', type=float, default=0.0,
+                         help="Seconds the game needs after every click")
+    runtime.add_argument('--seed', type=int, default=0, help="Random seed for the synthetic farm")
+    runtime.set_defaults(func=benchmark_runtime)
+
+    suite = subparsers.add_parser('suite', help="Measure both bots on synthetic farms of every size "
+                                  "and save the results as JSON (run from the directory with config.ini)")
+    suite.add_argument('--bots', nargs='+', choices=['basic', 'advanced'], default=['basic', 'advanced'],
+                       help="Bots to measure")
+    suite.add_argument('--grids', type=int, nargs='+', default=[10, 25, 50, 100, 200],
+                       help="Farm sizes in blocks per side")
+    suite.add_argument('--duration', type=float, default=2.0, help="Seconds of scan and action passes per case")
+    suite.add_argument('--seed', type=int, default=0, help="Random seed for the synthetic farm")
+    suite.add_argument('--output', default=None, help="JSON file, defaults to benchmark_<time>.json")
+    suite.add_argument('--baseline', default=None, help="Earlier suite JSON to compare against")
+    suite.set_defaults(func=benchmark_suite)
+
+    simulate = subparsers.add_parser('simulate', help="Play a simulated farm faster than real time "
+                                     "and report crops harvested per hour (run from the directory with config.ini)")
+    simulate.add_argument('--hours', type=float, default=1.0, help="Simulated hours to play")
+    simulate.add_argument('--seed', type=int, default=0, help="Random seed for the farm and the bot")
+    simulate.add_argument('--grid', type=int, default=None,
+                          help="Farm size in blocks per side, defaults to the configured scan grid")
+    simulate.add_argument('--stage-seconds', type=float, default=60.0,
+                          help="Mean simulated seconds per growth stage on watered farmland")
+    simulate.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                          help="Override a setting from config.ini, e.g. --set harvest_delay=0.2")
+    simulate.add_argument('--compute-time', action='store_true',
+                          help="Let the bot's scanning and planning time pass in the simulation too")
+    simulate.add_argument('--output', default=None, help="Also save the results to a JSON file")
+    simulate.set_defaults(func=benchmark_simulate)
+
+    replay = subparsers.add_parser('replay', help="Feed a recorded session through the advanced bot's "
+                                   "detection and planning (run from the directory with config.ini)")
+    replay.add_argument('session', help="Session file recorded with [Recording] session_path")
+    replay.add_argument('--seed', type=int, default=0, help="Random seed for the bot's watering check")
+    replay.add_argument('--output', default=None, help="Save the replayed inputs and timings to a JSON file")
+    replay.set_defaults(func=benchmark_replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
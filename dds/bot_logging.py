@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Logging for the Minecraft Farm Bots
+Background log writer with compressed rotation and per-pass summaries
+Made by DDS
+"""
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+from collections import Counter
+
+
+# Writer of this process, set up once however many bots are created
+listener = None
+queue_handler = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue log records without ever blocking, dropping them when the queue is full
+
+    Records are formatted by the writer thread, not the thread that logs
+    them, so arguments should not be changed after logging them.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated log file whose older files are gzip compressed"""
+
+    def __init__(self, filename, max_bytes, backup_count):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.namer = self.compressed_name
+        self.rotator = self.compress
+
+    @staticmethod
+    def compressed_name(name):
+        """Name of a rotated file"""
+        return name + '.gz'
+
+    @staticmethod
+    def compress(source, dest):
+        """Compress the file being rotated out"""
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+def start_log_writer(filename, config, queue_size=10000):
+    """Route the root logger through a queue to a background writer thread
+
+    Console and file output, including rotation, happen on the writer
+    thread. Returns the listener, which is stopped at exit so every
+    queued record is written.
+    """
+    global listener, queue_handler
+    if listener is not None:
+        return listener
+
+    level = config.get('Logging', 'level', fallback='INFO').upper()
+    max_bytes = config.getint('Logging', 'max_bytes', fallback=5 * 1024 * 1024)
+    backup_count = config.getint('Logging', 'backup_count', fallback=5)
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = CompressingRotatingFileHandler(filename, max_bytes, backup_count)
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    queue_handler = DroppingQueueHandler(log_queue)
+    logging.basicConfig(level=getattr(logging, level, logging.INFO), handlers=[queue_handler])
+    listener.start()
+    atexit.register(stop_log_writer)
+    return listener
+
+
+def stop_log_writer():
+    """Write out every queued record and stop the writer thread"""
+    global listener
+    if listener is not None:
+        if queue_handler.dropped:
+            # Waits for room, the writer is still draining the queue
+            listener.queue.put(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': "%d log records were dropped because the log queue was full",
+                'args': (queue_handler.dropped,)}))
+        listener.stop()
+        listener = None
+
+
+def dropped_records():
+    """Log records dropped so far because the queue was full"""
+    return queue_handler.dropped if queue_handler is not None else 0
+
+
+class PassSummary:
+    """Count the per-cell events of a pass and log them as one record"""
+
+    def __init__(self, logger, level=logging.INFO):
+        self.logger = logger
+        self.level = level
+        self.counts = Counter()  # (event, item) -> cells
+        self.passes = 0
+        self.started = time.perf_counter()
+        self.dropped = dropped_records()
+
+    def add(self, event, item=None):
+        """Count one event, e.g. ('harvested', 'wheat')"""
+        self.counts[event, item] += 1
+
+    def flush(self):
+        """Log the events since the last flush as a single record"""
+        self.passes += 1
+        elapsed = time.perf_counter() - self.started
+        self.started = time.perf_counter()
+        total_dropped = dropped_records()
+        dropped, self.dropped = total_dropped - self.dropped, total_dropped
+        if not (self.counts or dropped) or not self.logger.isEnabledFor(self.level):
+            self.counts.clear()
+            return
+
+        events = {}
+        for (event, item), count in sorted(self.counts.items(), key=lambda entry: (entry[0][0], str(entry[0][1]))):
+            events.setdefault(event, []).append((item, count))
+        parts = []
+        for event, items in events.items():
+            detail = ', '.join(f"{count} {item}" if item else str(count) for item, count in items)
+            if len(items) > 1:
+                detail = f"{sum(count for _, count in items)} ({detail})"
+            parts.append(f"{event} {detail}")
+        if dropped:
+            parts.append(f"{dropped} log records dropped")
+        self.logger.log(self.level, "Pass %d: %s in %.2fs", self.passes, '; '.join(parts), elapsed)
+        self.counts.clear()
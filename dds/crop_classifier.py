@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Crop Classifier for the Minecraft Farm Bot
+Compiles the crop palette into a quantized color lookup table
+Made by DDS
+"""
+
+import numpy as np
+
+# Colors of an empty, tilled farming plot
+DIRT_COLORS = [(139, 69, 19), (160, 82, 45), (205, 133, 63)]
+
+
+class CropClassifier:
+    """Classify whole grids of cell colors with a single table lookup"""
+
+    def __init__(self, crop_types, color_threshold=50, empty_threshold=30, lut_bits=5):
+        self.crop_names = list(crop_types)
+        self.color_threshold = color_threshold
+        self.empty_threshold = empty_threshold
+        self.lut_bits = lut_bits
+
+        # Flatten every crop stage into one palette, keeping the order that
+        # the old crop_types x growth_stages loop checked them in
+        palette, entry_crop, entry_stage, entry_mature = [], [], [], []
+        self.mature_bits = {}
+        for crop_index, (crop_type, crop_data) in enumerate(crop_types.items()):
+            # mature_color is only needed, and may only exist, without growth_stages
+            stages = crop_data['growth_stages'] if 'growth_stages' in crop_data else [crop_data['mature_color']]
+            for stage, stage_color in enumerate(stages):
+                mature = stage == len(stages) - 1
+                if mature:
+                    self.mature_bits[crop_type] = 1 << len(palette)
+                palette.append(stage_color)
+                entry_crop.append(crop_index)
+                entry_stage.append(stage)
+                entry_mature.append(mature)
+
+        self.crop_entries = len(palette)
+        self.empty_bits = 0
+        for dirt_color in DIRT_COLORS:
+            self.empty_bits |= 1 << len(palette)
+            palette.append(dirt_color)
+
+        if len(palette) > 32:
+            raise ValueError(f"Crop palette has {len(palette)} colors, at most 32 are supported")
+
+        self.palette = np.array(palette, dtype=np.float32)
+        self.thresholds = np.array([color_threshold] * self.crop_entries +
+                                   [empty_threshold] * len(DIRT_COLORS), dtype=np.float32)
+        self.entry_crop = np.array(entry_crop, dtype=np.int16)
+        self.entry_stage = np.array(entry_stage, dtype=np.int16)
+        self.entry_mature = np.array(entry_mature, dtype=bool)
+
+        self.match_lut, self.entry_lut = self.build_lookup_table()
+
+    def match_colors(self, colors):
+        """Bitmask of the palette entries within threshold of each color"""
+        colors = np.asarray(colors, dtype=np.float32)
+        distances = np.linalg.norm(colors[..., None, :] - self.palette, axis=-1)
+        within = distances < self.thresholds
+        weights = (1 << np.arange(len(self.palette), dtype=np.uint32)).astype(np.uint32)
+        return (within * weights).sum(axis=-1, dtype=np.uint32)
+
+    def build_lookup_table(self):
+        """Classify the center of every quantized RGB bin once"""
+        levels = 1 << self.lut_bits
+        shift = 8 - self.lut_bits
+        centers = (np.arange(levels) << shift) + (1 << shift) / 2
+        r, g, b = np.meshgrid(centers, centers, centers, indexing='ij')
+        bin_colors = np.stack([r, g, b], axis=-1).reshape(-1, 3)
+
+        match_lut = self.match_colors(bin_colors)
+
+        # First crop entry that matches, -1 if the color is no known crop
+        crop_matches = match_lut & np.uint32((1 << self.crop_entries) - 1)
+        lowest_bit = crop_matches & (~crop_matches + np.uint32(1))
+        entry_lut = np.where(crop_matches > 0,
+                             np.log2(np.maximum(lowest_bit, 1)).astype(np.int16),
+                             np.int16(-1)).astype(np.int16)
+        return match_lut, entry_lut
+
+    def lookup_keys(self, colors):
+        """Quantize colors into lookup table indices"""
+        colors = np.clip(np.asarray(colors), 0, 255).astype(np.uint32)
+        shift = 8 - self.lut_bits
+        q = colors >> shift
+        return (q[..., 0] << (2 * self.lut_bits)) | (q[..., 1] << self.lut_bits) | q[..., 2]
+
+    def classify(self, colors):
+        """Classify an array of colors, returning (entries, match bits)"""
+        keys = self.lookup_keys(colors)
+        return self.entry_lut[keys], self.match_lut[keys]
+
+    def describe(self, entry):
+        """Turn a palette entry into the crop info dict used by the bots"""
+        if entry < 0:
+            return None
+        return {
+            'type': self.crop_names[self.entry_crop[entry]],
+            'stage': int(self.entry_stage[entry]),
+            'mature': bool(self.entry_mature[entry])
+        }
+
+    def classify_color(self, color):
+        """Classify a single color into crop info"""
+        entry, _ = self.classify(color)
+        return self.describe(int(entry))
+
+    def is_mature(self, color, crop_type):
+        """Check if a color matches the mature stage of a crop"""
+        _, matches = self.classify(color)
+        return bool(matches & self.mature_bits[crop_type])
+
+    def is_empty(self, color):
+        """Check if a color matches an empty dirt plot"""
+        _, matches = self.classify(color)
+        return bool(matches & self.empty_bits)
+
+    def mature_mask(self, matches, crop_type):
+        """Boolean mask of the cells holding a mature crop of one type"""
+        return (matches & self.mature_bits[crop_type]) != 0
+
+    def empty_mask(self, matches):
+        """Boolean mask of the cells holding an empty plot"""
+        return (matches & self.empty_bits) != 0
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Farm Planner for the Minecraft Farm Bot
+Turns one scan of the farm into a single ordered list of cell visits
+Made by DDS
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from tour_optimizer import TourOptimizer
+
+# Cell state flags, a cell can carry several at once (dirt and mature
+# wheat share a color, so a cell may be both MATURE and EMPTY)
+MATURE = 1
+GROWING = 2
+EMPTY = 4
+NEEDS_WATER = 8
+
+# One planned stop: the screen position, the block offset from the farm
+# center, the actions to run there and when the scan it was planned from
+# was grabbed. The action item is the crop to harvest or the seed to
+# replant with, if any
+FarmAction = namedtuple('FarmAction', ['kind', 'item'])
+CellVisit = namedtuple('CellVisit', ['x', 'y', 'block', 'actions', 'seen'], defaults=[None])
+
+
+def build_state_map(classifier, entries, matches, needs_water=None):
+    """Combine a classified scan grid into per-cell state flags"""
+    known = entries >= 0
+    mature = known & classifier.entry_mature[np.maximum(entries, 0)]
+
+    states = np.zeros(entries.shape, dtype=np.uint8)
+    states[mature] |= MATURE
+    states[known & ~mature] |= GROWING
+    states[classifier.empty_mask(matches)] |= EMPTY
+    if needs_water is not None:
+        states[needs_water] |= NEEDS_WATER
+    return states
+
+
+class FarmPlanner:
+    """Plan every action of a pass so each cell is visited at most once"""
+
+    def __init__(self, crop_types, auto_harvest=True, auto_plant=True, auto_water=True):
+        self.crop_names = list(crop_types)
+        self.seeds = {crop_type: data['seeds'] for crop_type, data in crop_types.items()}
+        self.auto_harvest = auto_harvest
+        self.auto_plant = auto_plant
+        self.auto_water = auto_water
+        self.tour = TourOptimizer()
+        self.suppressed = 0  # Actions left out because they were still cooling down
+
+    def plan(self, xs, ys, states, entries, classifier, cooldowns=None, now=None, seen=None):
+        """Return the cell visits of one pass in scan order
+
+        Actions still inside their cooldown window are left out.
+        """
+        wanted = 0
+        if self.auto_harvest:
+            wanted |= MATURE
+        if self.auto_plant:
+            wanted |= EMPTY
+        if self.auto_water:
+            wanted |= NEEDS_WATER
+
+        center_i, center_j = len(xs) // 2, len(ys) // 2
+        visits = []
+        for i, j in np.argwhere(states & wanted):
+            state = states[i, j]
+            block = (int(i) - center_i, int(j) - center_j)
+            actions = []
+            replant = None
+
+            def allowed(kind):
+                if cooldowns is None or cooldowns.allow(block, kind, now):
+                    return True
+                self.suppressed += 1
+                return False
+
+            if self.auto_harvest and state & MATURE and allowed('harvest'):
+                crop_type = self.crop_names[classifier.entry_crop[entries[i, j]]]
+                actions.append(FarmAction('harvest', crop_type))
+                replant = self.seeds[crop_type]
+
+            # Harvested cells are replanted right away with the same crop
+            if self.auto_plant and (state & EMPTY or replant) and allowed('plant'):
+                actions.append(FarmAction('plant', replant))
+
+            if self.auto_water and state & NEEDS_WATER and allowed('water'):
+                actions.append(FarmAction('water', None))
+
+            if actions:
+                visits.append(CellVisit(xs[i], ys[j], block, actions, seen))
+        return visits
+
+    def order_visits(self, visits, start):
+        """Reorder visits into a short walk starting from the player's block"""
+        order = self.tour.order([visit.block for visit in visits], start)
+        return [visits[index] for index in order]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Farm Simulator for the Minecraft Farm Bot
+Deterministic stand-in for Minecraft that grows crops, walks the player
+and applies the bot's inputs in simulated time
+Made by DDS
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+
+from frame_sources import SyntheticFarmSource
+from input_backends import InputBackend
+from input_dispatcher import ImmediateDispatcher
+from motion import WALK_SPEED
+
+# Farthest distance in blocks between the player and a block it can click
+REACH = 4.5
+
+
+class SimulatedFarm(SyntheticFarmSource, InputBackend):
+    """Grid of farmland that grows, is harvested and is walked over in simulated time
+
+    The farm is both the bots' frame source and their input backend. Every
+    block gets a random tick per simulated second, on which a crop grows a
+    stage with chance 1/stage_seconds, dry_factor times less on farmland
+    that was not watered in the last hydration_seconds. Attacking a mature
+    crop harvests it, attacking an unripe one breaks it. Using an empty
+    block plants the crop that grew there last, using a planted block
+    waters it. Clicks more than REACH blocks from the player do nothing.
+    Movement keys walk the player at walk_speed after key_latency.
+
+    The screen is a fixed top-down view of the farm centered on the screen,
+    one cell_size square per block, like the synthetic source.
+    """
+
+    def __init__(self, crop_types, grid_size=10, cell_size=20, seed=0, stage_seconds=60.0,
+                 dry_factor=3.0, hydration_seconds=600.0, walk_speed=WALK_SPEED, key_latency=0.05,
+                 controls=None):
+        super().__init__(crop_types, grid_size=grid_size, cell_size=cell_size, seed=seed)
+        self.crop_names = list(crop_types)
+        self.mature_stage = np.array([len(colors) - 1 for colors in self.stage_colors])
+        self.stage_seconds = stage_seconds
+        self.dry_factor = dry_factor
+        self.hydration_seconds = hydration_seconds
+        self.walk_speed = walk_speed
+        self.key_latency = key_latency
+
+        controls = controls or {}
+        self.moves = {
+            controls.get('forward', 'w'): (0, -1),
+            controls.get('backward', 's'): (0, 1),
+            controls.get('left', 'a'): (-1, 0),
+            controls.get('right', 'd'): (1, 0),
+        }
+        self.attack_key = controls.get('attack', 'left')
+        self.use_key = controls.get('use', 'right')
+
+        self.now = 0.0
+        self.ticked = 0.0
+        self.wet_until = self.rng.uniform(0, hydration_seconds, self.stages.shape)
+        self.player = [0.0, 0.0]  # Blocks from the farm center
+        self.held = {}  # Movement key -> time it was pressed
+        self.dirty = False
+
+        self.events = Counter()  # clicks, harvested, planted, watered, broken, wasted, ...
+        self.harvested = Counter()  # Crop name -> crops harvested
+        self.walked = 0.0
+
+    def time(self):
+        """Simulated seconds since the farm was created"""
+        return self.now
+
+    def advance(self, seconds):
+        """Let simulated time pass, running a random tick per whole second"""
+        self.now += max(seconds, 0.0)
+        while self.ticked + 1.0 <= self.now:
+            self.ticked += 1.0
+            self.random_tick()
+
+    def random_tick(self):
+        """Grow every planted crop by a stage with its growth chance"""
+        roll = self.rng.random(self.stages.shape)
+        wet = self.wet_until > self.ticked
+        chance = np.where(wet, 1.0 / self.stage_seconds, 1.0 / (self.stage_seconds * self.dry_factor))
+        growing = (self.stages >= 0) & (self.stages < self.mature_stage[self.crops]) & (roll < chance)
+        if growing.any():
+            self.stages[growing] += 1
+            self.dirty = True
+
+    def next_frame(self):
+        # The farm changes with simulated time, not with frames
+        pass
+
+    def grab(self, x, y, width, height):
+        if self.dirty:
+            self.render()
+            self.dirty = False
+        return super().grab(x, y, width, height)
+
+    def block_at(self, x, y):
+        """Grid index of the block under a screen position, or None off the farm"""
+        i = (x - self.left) // self.cell_size
+        j = (y - self.top) // self.cell_size
+        if 0 <= i < self.grid_size and 0 <= j < self.grid_size:
+            return i, j
+        return None
+
+    def click(self, x, y, button):
+        self.events['clicks'] += 1
+        cell = self.block_at(x, y)
+        if cell is None:
+            self.events['off_farm'] += 1
+            return
+        i, j = cell
+        center = self.grid_size // 2
+        if math.hypot(i - center - self.player[0], j - center - self.player[1]) > REACH:
+            self.events['out_of_reach'] += 1
+            return
+
+        stage = self.stages[i, j]
+        crop = self.crops[i, j]
+        if button == self.attack_key:
+            if stage < 0:
+                self.events['wasted'] += 1
+                return
+            if stage == self.mature_stage[crop]:
+                self.events['harvested'] += 1
+                self.harvested[self.crop_names[crop]] += 1
+            else:
+                self.events['broken'] += 1
+            self.stages[i, j] = -1
+        elif button == self.use_key:
+            if stage < 0:
+                self.events['planted'] += 1
+                self.stages[i, j] = 0
+            else:
+                self.events['watered'] += 1
+                self.wet_until[i, j] = self.now + self.hydration_seconds
+                return
+        else:
+            self.events['wasted'] += 1
+            return
+        self.dirty = True
+
+    def key_down(self, key):
+        if key in self.moves and key not in self.held:
+            self.held[key] = self.now
+
+    def key_up(self, key):
+        pressed = self.held.pop(key, None)
+        if pressed is None:
+            return
+        blocks = max(self.now - pressed - self.key_latency, 0.0) * self.walk_speed
+        dx, dy = self.moves[key]
+        self.player[0] += dx * blocks
+        self.player[1] += dy * blocks
+        self.walked += blocks
+
+    def report(self):
+        """Yield and input totals of the simulation so far"""
+        hours = self.now / 3600
+        return {
+            'simulated_hours': hours,
+            'harvested': self.events['harvested'],
+            'harvested_per_hour': self.events['harvested'] / hours if hours else 0.0,
+            'harvested_by_crop': dict(self.harvested),
+            'planted': self.events['planted'],
+            'watered': self.events['watered'],
+            'broken': self.events['broken'],
+            'wasted_clicks': self.events['wasted'],
+            'out_of_reach': self.events['out_of_reach'],
+            'clicks': self.events['clicks'],
+            'blocks_walked': self.walked,
+        }
+
+
+class SimulatedInputs(ImmediateDispatcher):
+    """Input timeline that hands every input to a simulated farm right away
+
+    Where the dispatcher waits for an input's deadline, this advances the
+    farm's clock by the time the input books on the timeline instead, so
+    a pass that takes minutes in the game runs in milliseconds.
+    """
+
+    def __init__(self, farm):
+        super().__init__(farm)
+        self.farm = farm
+
+    def now(self):
+        return self.farm.time()
+
+    def elapse(self, seconds):
+        self.farm.advance(seconds)
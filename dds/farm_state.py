@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Farm State for the Minecraft Farm Bot
+Typed per-block model of the farm with indexes for fast planning queries
+Made by DDS
+"""
+
+import numpy as np
+
+from farm_planner import MATURE, GROWING, EMPTY
+
+# Actions remembered per block, stored as their index
+ACTIONS = ['none', 'harvest', 'plant', 'water']
+
+CELL_DTYPE = np.dtype([
+    ('crop', np.int8),          # Index into the crop names, -1 if unknown
+    ('stage', np.int8),         # Growth stage, -1 if no crop
+    ('state', np.uint8),        # MATURE / GROWING / EMPTY flags of the last scan
+    ('observed', np.float64),   # Time of the last scan that saw the block
+    ('action', np.int8),        # Index into ACTIONS of the last action
+    ('action_time', np.float64),
+    ('hydration', np.float32),  # 1.0 right after watering, decays to 0.0
+    ('misses', np.uint8),       # Scans of the farm in a row that saw no farmland here
+])
+
+
+class FarmGrid:
+    """State of every block within farm_radius of the farm center
+
+    Blocks are keyed by (bx, by) offsets from the center, both in
+    [-radius, radius]. Blocks that read as neither crop nor farmland in
+    non_farmland_scans scans of the farm in a row are masked out until
+    they read as farmland again.
+    """
+
+    def __init__(self, radius, crop_names, hydration_time=300.0, non_farmland_scans=5):
+        self.radius = radius
+        self.size = radius * 2 + 1
+        self.crop_names = list(crop_names)
+        self.hydration_time = hydration_time
+        self.non_farmland_scans = non_farmland_scans
+
+        self.cells = np.zeros((self.size, self.size), dtype=CELL_DTYPE)
+        self.cells['crop'] = -1
+        self.cells['stage'] = -1
+        self.non_farmland = np.zeros((self.size, self.size), dtype=bool)
+
+    def index(self, bx, by):
+        """Array index of a block"""
+        return bx + self.radius, by + self.radius
+
+    def block(self, i, j):
+        """Block coordinates of an array index"""
+        return int(i) - self.radius, int(j) - self.radius
+
+    def scan_slices(self, nx, ny):
+        """Slices of the grid and of an nx x ny scan grid centered on the farm center"""
+        grid_x, scan_x = self._overlap(nx)
+        grid_y, scan_y = self._overlap(ny)
+        return (grid_x, grid_y), (scan_x, scan_y)
+
+    def _overlap(self, n):
+        """Overlap of a scan axis of length n with the grid axis"""
+        offset = self.radius - n // 2
+        start, stop = max(offset, 0), min(offset + n, self.size)
+        return slice(start, stop), slice(start - offset, stop - offset)
+
+    def scan_mask(self, nx, ny):
+        """Boolean mask of the scan cells that are still worth scanning"""
+        mask = np.zeros((nx, ny), dtype=bool)
+        grid, scan = self.scan_slices(nx, ny)
+        mask[scan] = ~self.non_farmland[grid]
+        return mask
+
+    def observe(self, entries, states, classifier, now):
+        """Merge a classified scan grid into the model, returning the blocks that changed"""
+        grid, scan = self.scan_slices(*entries.shape)
+        cells = self.cells[grid]
+        entries = entries[scan]
+        states = states[scan]
+        known = entries >= 0
+        safe = np.maximum(entries, 0)
+
+        old_state = cells['state'].copy()
+        old_crop = cells['crop'].copy()
+        old_stage = cells['stage'].copy()
+        cells['crop'] = np.where(known, classifier.entry_crop[safe], -1)
+        cells['stage'] = np.where(known, classifier.entry_stage[safe], -1)
+        cells['state'] = states & (MATURE | GROWING | EMPTY)
+        cells['observed'] = now
+
+        # A scan without any farmland is a failed grab or a menu over the
+        # game, not evidence about single blocks
+        farmland = (states & (MATURE | GROWING | EMPTY)) != 0
+        if farmland.any():
+            cells['misses'] = np.where(farmland, 0, np.minimum(cells['misses'], 254) + 1)
+            self.non_farmland[grid] = cells['misses'] >= self.non_farmland_scans
+
+        # Hydration decays linearly after the last watering
+        watered = cells['action'] == ACTIONS.index('water')
+        age = now - cells['action_time']
+        decayed = np.clip(1.0 - age / self.hydration_time, 0.0, 1.0)
+        cells['hydration'] = np.where(watered, decayed, np.minimum(cells['hydration'], decayed))
+
+        changed = ((old_state != cells['state']) | (old_crop != cells['crop']) |
+                   (old_stage != cells['stage']))
+        return [self.block(i + grid[0].start, j + grid[1].start) for i, j in np.argwhere(changed)]
+
+    def record_action(self, bx, by, action, now):
+        """Remember the last action taken on a block"""
+        i, j = self.index(bx, by)
+        if not (0 <= i < self.size and 0 <= j < self.size):
+            return
+        self.cells['action'][i, j] = ACTIONS.index(action)
+        self.cells['action_time'][i, j] = now
+
+        # Assume the action worked until the next scan says otherwise
+        if action == 'water':
+            self.cells['hydration'][i, j] = 1.0
+        elif action == 'harvest':
+            self.cells['state'][i, j] = (self.cells['state'][i, j] & (0xFF ^ MATURE)) | EMPTY
+        elif action == 'plant':
+            self.cells['state'][i, j] = (self.cells['state'][i, j] & (0xFF ^ EMPTY)) | GROWING
+
+    def counts(self):
+        """Number of known mature, growing, empty and masked blocks"""
+        state = np.where(self.non_farmland, 0, self.cells['state'])
+        return {
+            'mature': int(np.count_nonzero(state & MATURE)),
+            'growing': int(np.count_nonzero(state & GROWING)),
+            'empty': int(np.count_nonzero(state & EMPTY)),
+            'non_farmland': int(np.count_nonzero(self.non_farmland)),
+        }
+
+
+class CooldownTable:
+    """Time each action was last taken on every block within farm_radius
+
+    A scan right after a click can still show the old block, the game
+    needs a moment to break, drop and render. An action is not repeated
+    on a block until its window has passed since it was last taken there.
+    Blocks outside the farm radius never cool down.
+    """
+
+    def __init__(self, radius, windows):
+        self.radius = radius
+        self.size = radius * 2 + 1
+        self.times = np.full((self.size, self.size, len(ACTIONS)), -np.inf, dtype=np.float64)
+        self.set_windows(windows)
+
+    def set_windows(self, windows):
+        """Set the cooldown of every action from {action: seconds}"""
+        self.windows = np.array([windows.get(action, 0.0) for action in ACTIONS], dtype=np.float64)
+
+    def _index(self, bx, by):
+        """Array index of a block, None outside the table"""
+        i, j = bx + self.radius, by + self.radius
+        if 0 <= i < self.size and 0 <= j < self.size:
+            return i, j
+        return None
+
+    def record(self, block, action, when):
+        """Remember when an action was taken on a block"""
+        index = self._index(*block)
+        if index is not None:
+            self.times[index][ACTIONS.index(action)] = when
+
+    def allow(self, block, action, now):
+        """Whether an action on a block is out of its cooldown window"""
+        index = self._index(*block)
+        if index is None:
+            return True
+        kind = ACTIONS.index(action)
+        return now - self.times[index][kind] >= self.windows[kind]
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Frame Sources for the Minecraft Farm Bot
+Live screen capture plus offline replay backends for headless testing
+Made by DDS
+"""
+
+import os
+import glob
+import ctypes
+import ctypes.util
+import cv2
+import numpy as np
+from PIL import ImageGrab
+
+
+try:
+    import pyautogui
+except Exception:
+    # pyautogui needs a display at import time, offline sources run without one
+    pyautogui = None
+
+# Color of the grass around a synthetic farm
+GRASS_COLOR = (95, 159, 53)
+DIRT_COLOR = (139, 69, 19)
+
+
+class FrameSource:
+    """Base class for everything the bots can read screen pixels from
+
+    Frames are uint8 arrays in OpenCV BGR channel order.
+    """
+
+    def size(self):
+        """Return the (width, height) of the screen"""
+        raise NotImplementedError
+
+    def grab(self, x, y, width, height):
+        """Return the pixels of a screen rectangle"""
+        raise NotImplementedError
+
+    def next_frame(self):
+        """Advance to the next frame, called once per farming loop"""
+        pass
+
+    def close(self):
+        """Release any resources held by the source"""
+        pass
+
+
+class LiveCaptureSource(FrameSource):
+    """Capture the real screen with PIL ImageGrab"""
+
+    def size(self):
+        return tuple(pyautogui.size())
+
+    def grab(self, x, y, width, height):
+        screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
+        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+
+
+class XImage(ctypes.Structure):
+    """Leading fields of Xlib's XImage, the rest is never touched"""
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int),
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int),
+    ]
+
+
+class XShmCaptureSource(FrameSource):
+    """Capture an X11 screen through the MIT-SHM extension
+
+    The X server copies pixels straight into a shared memory segment that is
+    reused for every grab of the same size, so a grab returns a NumPy view
+    instead of allocating a new image. The view is overwritten by the next
+    grab of the same size, copy it if it has to outlive that.
+    """
+
+    ZPIXMAP = 2
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+
+    def __init__(self, display=None):
+        self.xlib = self.load_library('X11')
+        self.xext = self.load_library('Xext')
+        self.libc = self.load_library('c')
+        self.declare_functions()
+
+        name = display.encode() if display else None
+        self.display = self.xlib.XOpenDisplay(name)
+        if not self.display:
+            raise RuntimeError(f"Cannot open X display {display or os.environ.get('DISPLAY')}")
+        if not self.xext.XShmQueryExtension(self.display):
+            self.xlib.XCloseDisplay(self.display)
+            raise RuntimeError("X server does not support the MIT-SHM extension")
+
+        screen = self.xlib.XDefaultScreen(self.display)
+        self.root = self.xlib.XDefaultRootWindow(self.display)
+        self.visual = self.xlib.XDefaultVisual(self.display, screen)
+        self.depth = self.xlib.XDefaultDepth(self.display, screen)
+        self.screen_size = (self.xlib.XDisplayWidth(self.display, screen),
+                            self.xlib.XDisplayHeight(self.display, screen))
+        self.buffers = {}
+
+    @staticmethod
+    def load_library(name):
+        """Load a shared library by its short name"""
+        path = ctypes.util.find_library(name)
+        if path is None:
+            raise RuntimeError(f"Shared library {name} not found, XShm capture needs libX11 and libXext")
+        return ctypes.CDLL(path, use_errno=True)
+
+    def declare_functions(self):
+        """Give ctypes the signatures of the Xlib, XShm and SysV calls used"""
+        xlib, xext, libc = self.xlib, self.xext, self.libc
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultVisual.restype = ctypes.c_void_p
+        xlib.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XFree.argtypes = [ctypes.c_void_p]
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(XImage)
+        xext.XShmCreateImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint,
+                                         ctypes.c_int, ctypes.c_void_p,
+                                         ctypes.POINTER(XShmSegmentInfo),
+                                         ctypes.c_uint, ctypes.c_uint]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XImage),
+                                      ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def buffer(self, width, height):
+        """Shared image and NumPy view for one grab size, created on first use"""
+        if (width, height) in self.buffers:
+            return self.buffers[(width, height)]
+
+        info = XShmSegmentInfo()
+        image = self.xext.XShmCreateImage(self.display, self.visual, self.depth, self.ZPIXMAP,
+                                          None, ctypes.byref(info), width, height)
+        if not image:
+            raise RuntimeError("XShmCreateImage failed")
+
+        size = image.contents.bytes_per_line * height
+        info.shmid = self.libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if info.shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        info.shmaddr = self.libc.shmat(info.shmid, None, 0)
+        if info.shmaddr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        image.contents.data = info.shmaddr
+        info.readOnly = 0
+
+        self.xext.XShmAttach(self.display, ctypes.byref(info))
+        self.xlib.XSync(self.display, 0)
+        # The segment is freed once both sides have detached
+        self.libc.shmctl(info.shmid, self.IPC_RMID, None)
+
+        if image.contents.bits_per_pixel != 32:
+            raise RuntimeError(f"Unsupported X visual with {image.contents.bits_per_pixel} bits per pixel")
+
+        raw = (ctypes.c_uint8 * size).from_address(info.shmaddr)
+        pixels = np.frombuffer(raw, dtype=np.uint8).reshape(height, image.contents.bytes_per_line)
+        # 32-bit ZPixmap pixels are BGRX in memory, drop the padding byte
+        view = pixels[:, :width * 4].reshape(height, width, 4)[..., :3]
+
+        self.buffers[(width, height)] = (image, info, view)
+        return self.buffers[(width, height)]
+
+    def size(self):
+        return self.screen_size
+
+    def grab(self, x, y, width, height):
+        image, _, view = self.buffer(width, height)
+        if not self.xext.XShmGetImage(self.display, self.root, image, x, y, ctypes.c_ulong(-1).value):
+            raise RuntimeError(f"XShmGetImage failed for ({x}, {y}, {width}, {height})")
+        return view
+
+    def close(self):
+        for image, info, _ in self.buffers.values():
+            self.xext.XShmDetach(self.display, ctypes.byref(info))
+            self.libc.shmdt(info.shmaddr)
+            # The pixels live in shared memory, so only free the XImage struct
+            image.contents.data = None
+            self.xlib.XFree(image)
+        self.buffers = {}
+        if self.display:
+            self.xlib.XCloseDisplay(self.display)
+            self.display = None
+
+
+class ReplaySource(FrameSource):
+    """Base class for sources that step through a fixed list of frames"""
+
+    def __init__(self, frame_count, loop=True):
+        self.frame_count = frame_count
+        self.loop = loop
+        self.index = 0
+        self.frame = None
+        if frame_count == 0:
+            raise ValueError("Replay source has no frames")
+        self.frame = self.load_frame(0)
+
+    def load_frame(self, index):
+        """Load a single frame by index"""
+        raise NotImplementedError
+
+    def size(self):
+        height, width = self.frame.shape[:2]
+        return width, height
+
+    def grab(self, x, y, width, height):
+        return self.frame[y:y + height, x:x + width]
+
+    def next_frame(self):
+        if self.index + 1 >= self.frame_count:
+            if not self.loop:
+                return
+            self.index = 0
+        else:
+            self.index += 1
+        self.frame = self.load_frame(self.index)
+
+
+class DirectoryFrameSource(ReplaySource):
+    """Replay a directory of PNG or NPY frames in file name order"""
+
+    def __init__(self, path, loop=True):
+        self.paths = sorted(glob.glob(os.path.join(path, '*.png')) +
+                            glob.glob(os.path.join(path, '*.npy')))
+        super().__init__(len(self.paths), loop)
+
+    def load_frame(self, index):
+        path = self.paths[index]
+        if path.endswith('.npy'):
+            return np.load(path, mmap_mode='r')
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+        if frame is None:
+            raise IOError(f"Could not read frame {path}")
+        return frame
+
+
+class RawFrameSource(ReplaySource):
+    """Replay a raw file of back-to-back BGR frames through a memory map"""
+
+    def __init__(self, path, width, height, loop=True):
+        frame_bytes = width * height * 3
+        frame_count = os.path.getsize(path) // frame_bytes
+        self.frames = np.memmap(path, dtype=np.uint8, mode='r',
+                                shape=(frame_count, height, width, 3))
+        super().__init__(frame_count, loop)
+
+    def load_frame(self, index):
+        return self.frames[index]
+
+
+class SyntheticFarmSource(FrameSource):
+    """Procedurally generated farm that grows a little every frame"""
+
+    def __init__(self, crop_types, width=1920, height=1080, grid_size=10, cell_size=20,
+                 growth_chance=0.05, seed=0):
+        self.width = width
+        self.height = height
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        self.growth_chance = growth_chance
+        self.rng = np.random.default_rng(seed)
+
+        # Stage colors of every crop, converted to BGR
+        self.stage_colors = [
+            [color[::-1] for color in (crop_data['growth_stages'] if 'growth_stages' in crop_data
+                                       else [crop_data['mature_color']])]
+            for crop_data in crop_types.values()
+        ]
+
+        # Farm is centered on the screen, one scan cell per block
+        self.left = width // 2 - grid_size * cell_size // 2
+        self.top = height // 2 - grid_size * cell_size // 2
+
+        shape = (grid_size, grid_size)
+        self.crops = self.rng.integers(0, len(self.stage_colors), shape)
+        self.stages = self.rng.integers(-1, 2, shape)  # -1 marks an empty plot
+
+        self.frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.frame[:] = GRASS_COLOR[::-1]
+        self.render()
+
+    def size(self):
+        return self.width, self.height
+
+    def grab(self, x, y, width, height):
+        return self.frame[y:y + height, x:x + width]
+
+    def next_frame(self):
+        # Random ticks grow crops, mature crops get harvested and empty
+        # plots replanted so the farm never settles into one state
+        roll = self.rng.random(self.stages.shape)
+        last_stage = np.array([len(colors) - 1 for colors in self.stage_colors])[self.crops]
+        mature = self.stages == last_stage
+        growing = (roll < self.growth_chance) & ~mature
+        self.stages[growing] += 1
+        self.stages[mature & (roll < self.growth_chance)] = -1
+        self.render()
+
+    def render(self):
+        """Paint every farm block into the frame"""
+        cells = np.empty(self.stages.shape + (3,), dtype=np.uint8)
+        cells[:] = DIRT_COLOR[::-1]
+        for crop, colors in enumerate(self.stage_colors):
+            for stage, color in enumerate(colors):
+                cells[(self.crops == crop) & (self.stages == stage)] = color
+
+        # cells are indexed [x, y], the frame is [row, column]
+        blocks = np.repeat(np.repeat(cells.transpose(1, 0, 2), self.cell_size, axis=0),
+                           self.cell_size, axis=1)
+        size = self.grid_size * self.cell_size
+        self.frame[self.top:self.top + size, self.left:self.left + size] = blocks
+
+
+def parse_frame_size(text):
+    """Parse a WIDTHxHEIGHT string"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def create_frame_source(config, crop_types):
+    """Build the frame source selected in the [Capture] config section"""
+    kind = config.get('Capture', 'frame_source', fallback='live')
+    path = config.get('Capture', 'frame_path', fallback='')
+    width, height = parse_frame_size(config.get('Capture', 'frame_size', fallback='1920x1080'))
+
+    if kind == 'live':
+        return LiveCaptureSource()
+    if kind == 'xshm':
+        return XShmCaptureSource(config.get('Capture', 'display', fallback='') or None)
+    if kind == 'directory':
+        return DirectoryFrameSource(path)
+    if kind == 'raw':
+        return RawFrameSource(path, width, height)
+    if kind == 'synthetic':
+        seed = config.getint('Capture', 'synthetic_seed', fallback=0)
+        return SyntheticFarmSource(crop_types, width, height, seed=seed)
+    raise ValueError(f"Unknown frame source: {kind}")
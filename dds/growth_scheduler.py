@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Growth Scheduler for the Minecraft Farm Bot
+Predicts when crops mature so the bot only looks at blocks that are due
+Made by DDS
+"""
+
+import heapq
+
+from farm_planner import MATURE, EMPTY
+
+
+class RunningMean:
+    """Online mean that starts from a prior guess"""
+
+    def __init__(self, prior):
+        self.mean = prior
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+
+
+class GrowthScheduler:
+    """Priority queue of predicted maturity times per farm block
+
+    Every time a block is seen in a new growth stage, the time since its
+    previous stage feeds an online mean of seconds per stage for that crop.
+    The block is then scheduled for when the remaining stages should be done.
+    Mature and empty blocks are due right away.
+    """
+
+    def __init__(self, crop_names, stage_counts, default_stage_time=60.0, recheck_delay=5.0):
+        self.crop_names = list(crop_names)
+        self.stage_counts = list(stage_counts)
+        self.recheck_delay = recheck_delay
+        self.stage_time = [RunningMean(default_stage_time) for _ in self.crop_names]
+
+        self.last_stage = {}  # block -> (crop, stage, time first seen in that stage)
+        self.heap = []
+        self.due_at = {}  # block -> due time of its live heap entry
+
+    def schedule(self, block, due):
+        """Queue a block, replacing any earlier entry for it"""
+        self.due_at[block] = due
+        heapq.heappush(self.heap, (due, block))
+
+    def predict(self, crop, stage, since):
+        """Predicted time a crop in a given stage reaches maturity"""
+        remaining = self.stage_counts[crop] - 1 - stage
+        return since + max(remaining, 0) * self.stage_time[crop].mean
+
+    def observe(self, farm_grid, changed, now):
+        """Learn from the blocks whose state changed in the last scan"""
+        for bx, by in changed:
+            i, j = farm_grid.index(bx, by)
+            cell = farm_grid.cells[i, j]
+            crop, stage, state = int(cell['crop']), int(cell['stage']), int(cell['state'])
+            block = (bx, by)
+
+            previous = self.last_stage.get(block)
+            if crop >= 0 and stage >= 0:
+                if previous and previous[0] == crop and 0 <= previous[1] < stage:
+                    self.stage_time[crop].add((now - previous[2]) / (stage - previous[1]))
+                if not previous or previous[:2] != (crop, stage):
+                    self.last_stage[block] = (crop, stage, now)
+            else:
+                self.last_stage.pop(block, None)
+
+            if state & (MATURE | EMPTY):
+                self.schedule(block, now)
+            elif crop >= 0 and stage >= 0:
+                self.schedule(block, self.predict(crop, stage, self.last_stage[block][2]))
+            else:
+                self.due_at.pop(block, None)
+
+    def action_taken(self, block, now):
+        """Look at a block again shortly after acting on it"""
+        self.schedule(block, now + self.recheck_delay)
+
+    def defer(self, block, now):
+        """Reschedule a due block that turned out not to need anything yet"""
+        previous = self.last_stage.get(block)
+        if previous is None:
+            # Empty blocks have no stage to predict from
+            self.schedule(block, now + self.recheck_delay)
+            return
+        crop, stage, since = previous
+        self.schedule(block, max(self.predict(crop, stage, since), now + self.recheck_delay))
+
+    def requeue(self, block, now):
+        """Put back a due block that was popped but never visited"""
+        self.schedule(block, now)
+
+    def pop_due(self, now):
+        """Remove and return every block due by now"""
+        due = set()
+        while self.heap and self.heap[0][0] <= now:
+            when, block = heapq.heappop(self.heap)
+            # Skip entries that were replaced by a later schedule call
+            if self.due_at.get(block) == when:
+                del self.due_at[block]
+                due.add(block)
+        return due
+
+    def next_due(self):
+        """Time of the next scheduled block, or None if nothing is queued"""
+        while self.heap and self.due_at.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def growth_rates(self):
+        """Mean seconds per growth stage learned for every crop"""
+        return {name: round(mean.mean, 1) for name, mean in zip(self.crop_names, self.stage_time)}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Input Backends for the Minecraft Farm Bot
+Where the bots' clicks and key presses go: the desktop, nowhere, or a log
+Made by DDS
+"""
+
+import json
+import time
+
+try:
+    import pyautogui
+except Exception:
+    # pyautogui needs a display at import time, offline backends run without one
+    pyautogui = None
+
+
+class InputBackend:
+    """Base class for everything the bots can send mouse and key input to"""
+
+    def click(self, x, y, button):
+        """Click a mouse button at a screen position"""
+        raise NotImplementedError
+
+    def key_down(self, key):
+        """Press and hold a key"""
+        raise NotImplementedError
+
+    def key_up(self, key):
+        """Release a held key"""
+        raise NotImplementedError
+
+    def set_pause(self, seconds):
+        """Set the delay the backend adds after every input"""
+        pass
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+
+class PyAutoGuiBackend(InputBackend):
+    """Send input through pyautogui, including its PAUSE and failsafe checks"""
+
+    def click(self, x, y, button):
+        pyautogui.click(x, y, button=button)
+
+    def key_down(self, key):
+        pyautogui.keyDown(key)
+
+    def key_up(self, key):
+        pyautogui.keyUp(key)
+
+    def set_pause(self, seconds):
+        pyautogui.PAUSE = seconds
+
+
+class DirectInputBackend(InputBackend):
+    """Call pyautogui's platform layer directly
+
+    Skips the PAUSE sleep and the failsafe corner check pyautogui runs
+    around every call. The F2/F3 hotkeys are the only way to stop the bot.
+    """
+
+    def __init__(self):
+        self.platform = pyautogui.platformModule
+
+    def click(self, x, y, button):
+        # On Windows _click sends the button at the current cursor position,
+        # so move first like pyautogui.click does
+        self.platform._moveTo(x, y)
+        self.platform._click(x, y, button)
+
+    def key_down(self, key):
+        self.platform._keyDown(key)
+
+    def key_up(self, key):
+        self.platform._keyUp(key)
+
+
+class NullInputBackend(InputBackend):
+    """Drop every input, for measuring the bot without a desktop"""
+
+    def click(self, x, y, button):
+        pass
+
+    def key_down(self, key):
+        pass
+
+    def key_up(self, key):
+        pass
+
+
+class RecordingInputBackend(InputBackend):
+    """Log every input with a monotonic timestamp, optionally passing it on
+
+    The log is written to path as JSON lines when the backend is closed.
+    """
+
+    def __init__(self, inner=None, path=None):
+        self.inner = inner
+        self.path = path
+        self.actions = []  # (time, kind, args)
+
+    def record(self, kind, *args):
+        self.actions.append((time.monotonic(), kind, args))
+
+    def click(self, x, y, button):
+        self.record('click', x, y, button)
+        if self.inner is not None:
+            self.inner.click(x, y, button)
+
+    def key_down(self, key):
+        self.record('key_down', key)
+        if self.inner is not None:
+            self.inner.key_down(key)
+
+    def key_up(self, key):
+        self.record('key_up', key)
+        if self.inner is not None:
+            self.inner.key_up(key)
+
+    def set_pause(self, seconds):
+        if self.inner is not None:
+            self.inner.set_pause(seconds)
+
+    def intervals(self, kind=None):
+        """Seconds between consecutive recorded inputs, optionally of one kind"""
+        times = [when for when, action, _ in self.actions if kind is None or action == kind]
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+    def rate(self):
+        """Recorded inputs per second"""
+        if len(self.actions) < 2:
+            return 0.0
+        span = self.actions[-1][0] - self.actions[0][0]
+        return (len(self.actions) - 1) / span if span > 0 else 0.0
+
+    def close(self):
+        if self.path:
+            with open(self.path, 'w') as f:
+                for when, kind, args in self.actions:
+                    f.write(json.dumps({'time': when, 'action': kind, 'args': list(args)}) + '\n')
+        if self.inner is not None:
+            self.inner.close()
+
+
+def create_input_backend(config):
+    """Build the input backend selected in the [Input] config section"""
+    kind = config.get('Input', 'backend', fallback='pyautogui')
+    record_path = config.get('Input', 'record_path', fallback='')
+
+    if kind == 'pyautogui':
+        backend = PyAutoGuiBackend()
+    elif kind == 'direct':
+        backend = DirectInputBackend()
+    elif kind == 'null':
+        backend = NullInputBackend()
+    elif kind == 'recording':
+        # Record without sending anything, or record_path alone to record real play
+        return RecordingInputBackend(path=record_path or 'inputs.jsonl')
+    else:
+        raise ValueError(f"Unknown input backend: {kind}")
+
+    if record_path:
+        return RecordingInputBackend(backend, record_path)
+    return backend
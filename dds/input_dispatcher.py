@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Input Dispatcher for the Minecraft Farm Bot
+Sends mouse and key inputs from a background thread at scheduled deadlines
+Made by DDS
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class InputAction:
+    """One queued input, cancelled actions are dropped when they come due"""
+
+    __slots__ = ('deadline', 'kind', 'args', 'spacing', 'cancelled', 'queued', 'phase')
+
+    def __init__(self, deadline, kind, args, spacing=0.0, phase=None):
+        self.deadline = deadline
+        self.kind = kind
+        self.args = args
+        self.spacing = spacing    # Seconds the next click has to wait after this one
+        self.cancelled = False
+        self.queued = time.perf_counter()
+        self.phase = phase        # (phase, key) timed from queueing until sent, if set
+
+
+class InputDispatcher:
+    """Deadline queue of inputs drained by its own thread
+
+    Producers book time on a single input timeline and return right away:
+    a click books the delay the game needs after it, a key hold books its
+    duration. The next action's deadline is pushed back instead of the
+    producer sleeping, so scanning and planning go on while inputs drain.
+    Producers only block once more than max_backlog seconds are booked.
+
+    A key released and pressed again at the same moment is never sent,
+    the key just stays down. Click spacing is also kept from the time a
+    click was actually sent, so one late click never lets the next one
+    through too early.
+    """
+
+    def __init__(self, backend, max_backlog=2.0, coalesce_window=0.01):
+        self.backend = backend
+        self.max_backlog = max_backlog
+        self.coalesce_window = coalesce_window
+
+        self.condition = threading.Condition()
+        # Held while calling the backend, which is never called from two threads at once
+        self.send_lock = threading.Lock()
+        self.generation = 0      # Bumped by clear(), actions popped before it are not sent
+        self.queue = []
+        self.order = itertools.count()
+        self.cursor = 0.0        # Time the input timeline is free again
+        self.pending_up = {}     # key -> queued release of that key
+        self.held = set()        # Keys currently down
+        self.in_flight = False   # An action is being handed to the backend
+        self.click_ready = 0.0   # Earliest time the next click may be sent
+        self.running = False
+        self.thread = None
+        self.profiler = None     # Times backend calls and send lag if set
+
+        self.sent = 0
+        self.coalesced = 0
+        self.recent = deque(maxlen=256)  # Send times of the latest actions
+
+    def start(self):
+        """Start the dispatcher thread"""
+        if self.running:
+            return
+        # Spacing is booked explicitly, pyautogui's hidden pause would only add to it
+        self.backend.set_pause(0)
+        self.running = True
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Drop pending inputs, release held keys and stop the thread"""
+        self.clear()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def clear(self):
+        """Drop every pending input and release the keys that are down"""
+        with self.send_lock:
+            # Waits for an input the dispatcher thread is sending
+            with self.condition:
+                self.queue.clear()
+                self.pending_up.clear()
+                self.cursor = time.perf_counter()
+                self.generation += 1
+                held, self.held = self.held, set()
+                self.condition.notify_all()
+            for key in held:
+                self.backend.key_up(key)
+
+    def now(self):
+        """Current time on the input timeline, click() returns due times on it"""
+        return time.perf_counter()
+
+    def backlog(self):
+        """Seconds of inputs booked ahead of now"""
+        with self.condition:
+            return max(self.cursor - time.perf_counter(), 0.0)
+
+    def wait_for_room(self):
+        """Block while more than max_backlog seconds of inputs are booked"""
+        with self.condition:
+            while self.running and self.cursor - time.perf_counter() > self.max_backlog:
+                self.condition.wait(max(self.cursor - time.perf_counter() - self.max_backlog, 0.001))
+
+    def reserve(self, duration):
+        """Book duration seconds of the timeline and return when they start"""
+        with self.condition:
+            self.wait_for_room()
+            start = max(self.cursor, time.perf_counter())
+            self.cursor = start + duration
+            return start
+
+    def push(self, deadline, kind, *args, spacing=0.0, phase=None):
+        """Queue an action at a deadline, the caller holds the lock"""
+        action = InputAction(deadline, kind, args, spacing, phase)
+        heapq.heappush(self.queue, (deadline, next(self.order), action))
+        self.condition.notify_all()
+        return action
+
+    def click(self, x, y, button, spacing=0.0, phase=None):
+        """Click at a screen position, leaving spacing seconds before the next input
+
+        With a (phase, key) set, the time from this call until the click has
+        been sent is recorded into that phase of the profiler. Returns the
+        perf_counter time the click is due to be sent.
+        """
+        queued = time.perf_counter()
+        start = self.reserve(spacing)
+        with self.condition:
+            action = self.push(start, 'click', x, y, button, spacing=spacing, phase=phase)
+            # Waiting for room in the backlog counts too
+            action.queued = queued
+        return start
+
+    def hold(self, durations):
+        """Press every key of {key: seconds} together, releasing each after its time"""
+        if not durations:
+            return
+        start = self.reserve(max(durations.values()))
+        with self.condition:
+            for key, duration in durations.items():
+                release = self.pending_up.get(key)
+                if release is not None and release.deadline >= start - self.coalesce_window:
+                    # Still held from the previous move, keep it down
+                    release.cancelled = True
+                    self.coalesced += 2
+                else:
+                    self.push(start, 'keyDown', key)
+                self.pending_up[key] = self.push(start + duration, 'keyUp', key)
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued input has been sent"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self.condition:
+            while self.running and (self.queue or self.in_flight):
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def run(self):
+        """Send actions as they come due"""
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                if not self.queue:
+                    self.condition.wait()
+                    continue
+                deadline, _, action = self.queue[0]
+                now = time.perf_counter()
+                delay = deadline - now
+                if action.kind == 'click':
+                    delay = max(delay, self.click_ready - now)
+                if not action.cancelled and delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                heapq.heappop(self.queue)
+                if action.cancelled:
+                    self.condition.notify_all()
+                    continue
+                if action.kind == 'keyUp':
+                    # The key counts as held until it is released, so a
+                    # clear() meanwhile still releases it
+                    if self.pending_up.get(action.args[0]) is action:
+                        del self.pending_up[action.args[0]]
+                elif action.kind == 'keyDown':
+                    self.held.add(action.args[0])
+                self.in_flight = True
+                if action.kind == 'click':
+                    self.click_ready = time.perf_counter() + action.spacing
+                generation = self.generation
+
+            with self.send_lock:
+                # clear() may have run since the action was popped, it
+                # already released the keys and dropped the clicks
+                sent = generation == self.generation
+                if sent and self.profiler is None:
+                    self.send(action)
+                elif sent:
+                    # How late the action is, and how long the backend takes to send it
+                    start = time.perf_counter()
+                    self.profiler.record('input lag', max(start - action.deadline, 0.0))
+                    self.send(action)
+                    end = time.perf_counter()
+                    self.profiler.span('input', start, end, action.kind)
+                    if action.phase is not None:
+                        self.profiler.span(action.phase[0], action.queued, end, action.phase[1])
+            with self.condition:
+                self.in_flight = False
+                if sent:
+                    if action.kind == 'keyUp':
+                        self.held.discard(action.args[0])
+                    self.sent += 1
+                    self.recent.append(time.perf_counter())
+                self.condition.notify_all()
+
+    def send(self, action):
+        """Hand an action to the input backend"""
+        if action.kind == 'click':
+            self.backend.click(*action.args)
+        elif action.kind == 'keyDown':
+            self.backend.key_down(action.args[0])
+        elif action.kind == 'keyUp':
+            self.backend.key_up(action.args[0])
+
+    def actions_per_second(self):
+        """Rate of the most recently sent actions"""
+        with self.condition:
+            if len(self.recent) < 2:
+                return 0.0
+            span = self.recent[-1] - self.recent[0]
+            return (len(self.recent) - 1) / span if span > 0 else 0.0
+
+
+class ImmediateDispatcher(InputDispatcher):
+    """Input timeline that hands every input to the backend right away, for offline runs
+
+    Nothing is waited for: inputs are sent from the caller's thread as soon
+    as they are booked and the backlog is always empty. Subclasses can let
+    the time an input books pass on a clock of their own in elapse().
+    """
+
+    def __init__(self, backend):
+        super().__init__(backend, max_backlog=0.0)
+
+    def elapse(self, seconds):
+        """Let the time an input books pass, nothing waits for it here"""
+        pass
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def clear(self):
+        # Keys are always released before hold returns
+        pass
+
+    def backlog(self):
+        return 0.0
+
+    def wait_for_room(self):
+        pass
+
+    def wait_idle(self, timeout=None):
+        return True
+
+    def click(self, x, y, button, spacing=0.0, phase=None):
+        due = self.now()
+        start = time.perf_counter()
+        self.backend.click(x, y, button)
+        if phase is not None and self.profiler is not None:
+            self.profiler.span(phase[0], start, time.perf_counter(), phase[1])
+        self.sent += 1
+        self.elapse(spacing)
+        return due
+
+    def hold(self, durations):
+        if not durations:
+            return
+        for key in durations:
+            self.backend.key_down(key)
+        elapsed = 0.0
+        for key, duration in sorted(durations.items(), key=lambda item: item[1]):
+            self.elapse(duration - elapsed)
+            elapsed = duration
+            self.backend.key_up(key)
+        self.sent += 2 * len(durations)
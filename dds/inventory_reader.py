@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Hotbar Reader for the Minecraft Farm Bot
+Reads the item and stack count of every hotbar slot from one small screen grab
+Made by DDS
+"""
+
+import os
+from collections import Counter
+
+import cv2
+import numpy as np
+
+# Hotbar size in GUI pixels, it is drawn GUI scale screen pixels per GUI pixel
+HOTBAR_WIDTH = 182
+HOTBAR_HEIGHT = 22
+HOTBAR_SLOTS = 9
+SLOT_PITCH = 20
+ICON_SIZE = 16
+
+# Stack counts are right-aligned at the bottom right of the icon in white
+# with a dark shadow one pixel down and to the right. Two digits start at
+# these icon columns, a single digit is in the second place
+LABEL_TOP = 9
+DIGIT_COLUMNS = (5, 11)
+TEXT_LEVEL = 220
+HOTBAR_COLOR = (60, 60, 60)
+SHADOW_COLOR = (63, 63, 63)
+
+# Seconds between harvesting a crop and its drops being picked up
+PICKUP_SECONDS = 0.5
+
+# Digits of the Minecraft font, 5x7 GUI pixels
+DIGIT_GLYPHS = [
+    ['.###.', '#...#', '#..##', '#.#.#', '##..#', '#...#', '.###.'],
+    ['..#..', '.##..', '..#..', '..#..', '..#..', '..#..', '#####'],
+    ['.###.', '#...#', '....#', '..##.', '.#...', '#...#', '#####'],
+    ['.###.', '#...#', '....#', '..##.', '....#', '#...#', '.###.'],
+    ['...##', '..#.#', '.#..#', '#...#', '#####', '....#', '....#'],
+    ['#####', '#....', '####.', '....#', '....#', '#...#', '.###.'],
+    ['..##.', '.#...', '#....', '####.', '#...#', '#...#', '.###.'],
+    ['#####', '#...#', '....#', '...#.', '..#..', '..#..', '..#..'],
+    ['.###.', '#...#', '#...#', '.###.', '#...#', '#...#', '.###.'],
+    ['.###.', '#...#', '#...#', '.####', '....#', '...#.', '.##..'],
+]
+
+# Colors of the plain icons used for items without a captured icon. They
+# only match test frames, real hotbars need captures in icon_dir
+ITEM_COLORS = {
+    'wheat_seeds': (60, 140, 40),
+    'carrot': (255, 140, 0),
+    'potato': (200, 160, 80),
+    'beetroot_seeds': (150, 100, 80),
+    'wheat': (220, 190, 80),
+    'beetroot': (160, 30, 40),
+    'water_bucket': (60, 90, 220),
+    'hoe': (140, 110, 70),
+    'shovel': (170, 170, 170),
+}
+
+
+def auto_gui_scale(width, height):
+    """GUI scale that Minecraft's Auto setting picks for a screen size"""
+    scale = 1
+    while width // (scale + 1) >= 320 and height // (scale + 1) >= 240:
+        scale += 1
+    return scale
+
+
+def hotbar_rect(width, height, scale):
+    """Screen rectangle (x, y, width, height) of the hotbar"""
+    left = (width // scale // 2 - HOTBAR_WIDTH // 2) * scale
+    top = (height // scale - HOTBAR_HEIGHT) * scale
+    return left, top, HOTBAR_WIDTH * scale, HOTBAR_HEIGHT * scale
+
+
+def plain_icon(color):
+    """16x16 disk icon in an RGB color, with the mask of its pixels"""
+    yy, xx = np.mgrid[:ICON_SIZE, :ICON_SIZE]
+    mask = (xx - 7.5) ** 2 + (yy - 7.5) ** 2 <= 6.5 ** 2
+    icon = np.zeros((ICON_SIZE, ICON_SIZE, 3), dtype=np.uint8)
+    icon[mask] = color[::-1]
+    return icon, mask
+
+
+def load_icon(path):
+    """Icon capture scaled to 16x16, with the mask of its opaque pixels"""
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"Cannot read item icon {path}")
+    image = cv2.resize(image, (ICON_SIZE, ICON_SIZE), interpolation=cv2.INTER_NEAREST)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        return image[..., :3].copy(), image[..., 3] > 127
+    return image, np.ones((ICON_SIZE, ICON_SIZE), dtype=bool)
+
+
+def digit_masks():
+    """Glyph of every digit plus a blank one as a (11, 7, 5) bool array"""
+    glyphs = np.array([[[c == '#' for c in row] for row in glyph] for glyph in DIGIT_GLYPHS])
+    return np.concatenate([glyphs, np.zeros((1,) + glyphs.shape[1:], dtype=bool)])
+
+
+class HotbarReader:
+    """Match hotbar slots against item icons and stack-count digits
+
+    The icon and digit templates are built once. A read grabs only the
+    hotbar, samples one screen pixel per GUI pixel and compares all nine
+    slots with every template in a few array operations. The result is
+    kept until invalidate() reports an input that can change it and that
+    input has been sent, so the inventory screen never has to be opened.
+
+    Only the hotbar is visible, items in the rest of the inventory are not
+    counted.
+    """
+
+    def __init__(self, items=None, gui_scale=0, icon_dir='', match_threshold=20.0):
+        self.gui_scale = gui_scale
+        self.match_threshold = match_threshold
+
+        # Captured icons replace the plain ones, named like wheat_seeds.png
+        icons = {name: plain_icon(color) for name, color in (items or ITEM_COLORS).items()}
+        if icon_dir:
+            for filename in sorted(os.listdir(icon_dir)):
+                name, extension = os.path.splitext(filename)
+                if extension.lower() in ('.png', '.bmp', '.jpg'):
+                    icons[name] = load_icon(os.path.join(icon_dir, filename))
+
+        self.names = list(icons)
+        self.icons = np.array([icon for icon, _ in icons.values()], dtype=np.int16)
+        # The count label is drawn over the icon, only compare above and left of it
+        outside_label = np.ones((ICON_SIZE, ICON_SIZE), dtype=bool)
+        outside_label[LABEL_TOP:, DIGIT_COLUMNS[0]:] = False
+        masks = np.array([mask for _, mask in icons.values()]) & outside_label
+        self.weights = masks / np.maximum(masks.sum(axis=(1, 2), keepdims=True) * 3, 1)
+        self.digits = digit_masks()
+
+        self.slots = None        # (item, count) of every slot at the last read
+        self.stale = True
+        self.settle_time = 0.0   # Input clock time the last invalidating input is sent by
+        self.invalidations = 0
+        self.reads = 0
+
+    def invalidate(self, due):
+        """Read again once the input due at this input clock time has been sent"""
+        self.stale = True
+        self.settle_time = max(self.settle_time, due)
+        self.invalidations += 1
+
+    def needs_read(self, now):
+        """True when the cached slots may be out of date and no change is still pending"""
+        return self.slots is None or (self.stale and now >= self.settle_time)
+
+    def scale_for(self, width, height):
+        """Configured GUI scale, or the one Auto picks for the screen"""
+        return self.gui_scale or auto_gui_scale(width, height)
+
+    def read(self, grab, screen_size):
+        """Grab the hotbar and return the (item, count) of every slot, None if the grab failed"""
+        scale = self.scale_for(*screen_size)
+        invalidations = self.invalidations
+        image = grab(*hotbar_rect(screen_size[0], screen_size[1], scale))
+        if image is None:
+            return None
+        self.slots = self.parse(image, scale)
+        # An input reported during the grab may not show in it yet
+        self.stale = self.invalidations != invalidations
+        self.reads += 1
+        return self.slots
+
+    def parse(self, image, scale):
+        """Items and stack counts of the nine slots in a hotbar image"""
+        # Center pixel of every GUI pixel
+        gui = image[scale // 2::scale, scale // 2::scale][:HOTBAR_HEIGHT, :HOTBAR_WIDTH].astype(np.int16)
+
+        # Slot i's icon starts at GUI column 3 + 20 i and row 3
+        slots = gui[3:3 + ICON_SIZE, 1:1 + HOTBAR_SLOTS * SLOT_PITCH].reshape(
+            ICON_SIZE, HOTBAR_SLOTS, SLOT_PITCH, 3)[:, :, 2:2 + ICON_SIZE].transpose(1, 0, 2, 3)
+
+        # Mean channel difference of every slot to every icon, (slots, icons)
+        differences = np.abs(slots[:, None] - self.icons[None]).sum(axis=-1)
+        scores = (differences * self.weights[None]).sum(axis=(2, 3))
+        best = scores.argmin(axis=1)
+        found = scores[np.arange(HOTBAR_SLOTS), best] < self.match_threshold
+
+        # Hamming distance of both label places to every digit and blank, (slots, 2, 11)
+        text = slots.min(axis=-1) >= TEXT_LEVEL
+        places = np.stack([text[:, LABEL_TOP:LABEL_TOP + 7, column:column + 5]
+                           for column in DIGIT_COLUMNS], axis=1)
+        distances = (places[:, :, None] != self.digits[None, None]).sum(axis=(3, 4))
+        digits = distances.argmin(axis=2)
+
+        result = []
+        for index in range(HOTBAR_SLOTS):
+            if not found[index]:
+                result.append((None, 0))
+                continue
+            tens, ones = digits[index]
+            # Single items have no label
+            count = 1 if ones == 10 else ones + (tens * 10 if tens < 10 else 0)
+            result.append((self.names[best[index]], int(count)))
+        return result
+
+    def totals(self, slots=None):
+        """Items summed over slots, those of the last read by default"""
+        totals = Counter()
+        for item, count in (self.slots if slots is None else slots) or []:
+            if item is not None:
+                totals[item] += count
+        return totals
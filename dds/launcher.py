@@ -5,6 +5,7 @@ Choose between basic and advanced versions of the farm bot
 Made by DDS
 """
 
+import argparse
 import os
 import sys
 from colorama import init, Fore, Style
@@ -65,12 +66,12 @@ def run_basic_bot():
         print(f"{Fore.RED}Error: Could not import basic farm bot{Style.RESET_ALL}")
         print("Make sure 'minecraft_farm_bot.py' exists in the current directory.")
 
-def run_advanced_bot():
+def run_advanced_bot(runtime=None, profile=None):
     """Run the advanced farm bot"""
     print(f"{Fore.BLUE}Starting Advanced Farm Bot...{Style.RESET_ALL}")
     try:
         import advanced_farm_bot
-        advanced_farm_bot.main()
+        advanced_farm_bot.main(runtime, profile)
     except ImportError:
         print(f"{Fore.RED}Error: Could not import advanced farm bot{Style.RESET_ALL}")
         print("Make sure 'advanced_farm_bot.py' exists in the current directory.")
@@ -101,6 +102,13 @@ def show_version_info():
 
 def main():
     """Main launcher function"""
+    parser = argparse.ArgumentParser(description="Minecraft Farm Bot launcher")
+    parser.add_argument('--runtime', choices=['threaded', 'asyncio'], default=None,
+                        help="Advanced bot runtime, overrides the runtime setting in config.ini")
+    parser.add_argument('--profile', type=float, metavar='SECONDS', default=None,
+                        help="Run the advanced bot for SECONDS, then print and save its phase timings")
+    args = parser.parse_args()
+    
     print_banner()
     
     # Check dependencies
@@ -117,7 +125,7 @@ def main():
             run_basic_bot()
             break
         elif choice == '2':
-            run_advanced_bot()
+            run_advanced_bot(args.runtime, args.profile)
             break
         elif choice == '3':
             print(f"{Fore.RED}Exiting...{Style.RESET_ALL}")
@@ -5,7 +5,6 @@ A comprehensive automation bot for farming tasks in Minecraft
 Made by DDS
 """
 
-import pyautogui
 import cv2
 import numpy as np
 import keyboard
@@ -15,25 +14,57 @@ import threading
 import logging
 import configparser
 from colorama import init, Fore, Style
-from PIL import Image, ImageGrab
+from PIL import Image
 import os
+from vision import FrameSnapshot, IncrementalGrid
+from frame_sources import create_frame_source
+from crop_classifier import CropClassifier
+from traversal import PATTERNS
+from motion import MotionModel, WALK_SPEED, measure_shift
+from input_backends import create_input_backend
+from session_recorder import open_session_recorder
+from settings import BotSettings, ConfigWatcher
+from bot_logging import start_log_writer, stop_log_writer, PassSummary
 
 # Initialize colorama for colored output
 init()
 
 class MinecraftFarmBot:
-    def __init__(self):
+    def __init__(self, record=True):
         self.running = False
         self.paused = False
         self.current_task = None
         self.config = self.load_config()
         self.setup_logging()
         
+        # Typed snapshot of the settings read while farming, swapped for a
+        # new one by the config watcher when config.ini changes
+        self.settings = BotSettings.from_config(self.config)
+        self.applied_settings = None
+        self.config_watcher = ConfigWatcher('config.ini', self.reload_config,
+                                            self.settings.config_reload_interval)
+        
         # Bot settings
-        self.farm_radius = self.config.getint('Settings', 'farm_radius', fallback=5)
-        self.plant_delay = self.config.getfloat('Settings', 'plant_delay', fallback=0.5)
-        self.harvest_delay = self.config.getfloat('Settings', 'harvest_delay', fallback=0.3)
-        self.water_delay = self.config.getfloat('Settings', 'water_delay', fallback=1.0)
+        self.farm_radius = self.settings.farm_radius
+        self.apply_settings(self.settings)
+        
+        # Screen capture settings
+        self.snapshot_mode = self.config.get('Advanced', 'snapshot_mode', fallback='pass')
+        self.snapshot = None
+        self.scan_radius = self.config.getint('Advanced', 'scan_radius', fallback=100)
+        self.scan_pitch = self.config.getint('Advanced', 'scan_pitch', fallback=20)
+        self.cell_size = self.config.getint('Advanced', 'cell_size', fallback=10)
+        self.cell_samples = self.config.getint('Advanced', 'cell_samples', fallback=1)
+        
+        # Key hold durations come from a calibrated model of walking speed,
+        # the player position is tracked in blocks from the screen center
+        self.motion = MotionModel(self.config.getfloat('Advanced', 'walk_speed', fallback=WALK_SPEED),
+                                  self.config.getfloat('Advanced', 'key_latency', fallback=0.05))
+        self.motion_calibration = self.config.getboolean('Advanced', 'calibrate_motion', fallback=False)
+        self.player_position = [0, 0]
+        
+        # Where clicks and key presses go, see [Input] in config.ini
+        self.input_backend = create_input_backend(self.config)
         
         # Key bindings
         self.forward_key = self.config.get('Controls', 'forward', fallback='w')
@@ -53,11 +84,58 @@ class MinecraftFarmBot:
             'beetroot': {'seeds': 'beetroot_seeds', 'mature_color': (139, 0, 0)}
         }
         
+        # Compile the crop colors into a color lookup table
+        self.classifier = CropClassifier(self.crop_types, color_threshold=50)
+        
+        # Cached classification of the scan grid between passes
+        self.incremental_scan = self.config.getboolean('Advanced', 'incremental_scan', fallback=True)
+        tolerance = self.config.getint('Advanced', 'change_tolerance', fallback=12)
+        self.scan_cache = IncrementalGrid(self.classifier, tolerance)
+        
+        # Where screen pixels come from (live capture or offline replay)
+        self.frame_source = create_frame_source(self.config, self.crop_types)
+        
+        # Record grabbed frames and sent inputs to a session file for replay,
+        # see [Recording]. Benchmarks turn this off with record=False
+        self.session = open_session_recorder(self.config) if record else None
+        if self.session is not None:
+            self.frame_source = self.session.wrap_frames(self.frame_source)
+            self.input_backend = self.session.wrap_inputs(self.input_backend)
+        
         print(f"{Fore.GREEN}Minecraft Farm Bot initialized!{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Press 'F1' to start/stop the bot{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Press 'F2' to pause/resume{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Press 'F3' to exit{Style.RESET_ALL}")
     
+    def reload_config(self):
+        """Swap in a new settings snapshot after config.ini changed on disk"""
+        config = configparser.ConfigParser()
+        try:
+            config.read('config.ini')
+            settings = BotSettings.from_config(config)
+        except (configparser.Error, ValueError) as e:
+            self.logger.error(f"Keeping the current settings, config.ini is invalid: {e}")
+            return
+        
+        # The farming loop applies the new snapshot before its next pass
+        self.config = config
+        self.settings = settings
+        self.logger.info("Reloaded config.ini")
+    
+    def current_settings(self):
+        """Latest settings snapshot, applied first if config.ini changed since the last pass"""
+        settings = self.settings
+        if settings is not self.applied_settings:
+            self.apply_settings(settings)
+        return settings
+    
+    def apply_settings(self, settings):
+        """Take over the values of a settings snapshot"""
+        self.plant_delay = settings.plant_delay
+        self.harvest_delay = settings.harvest_delay
+        self.water_delay = settings.water_delay
+        self.applied_settings = settings
+    
     def load_config(self):
         """Load configuration from config.ini file"""
         config = configparser.ConfigParser()
@@ -92,26 +170,61 @@ class MinecraftFarmBot:
             'attack': 'left'
         }
         
+        config['Capture'] = {
+            'frame_source': 'live',
+            'display': '',
+            'frame_path': '',
+            'frame_size': '1920x1080',
+            'synthetic_seed': '0'
+        }
+        
+        config['Input'] = {
+            'backend': 'pyautogui',
+            'record_path': ''
+        }
+        
+        config['Logging'] = {
+            'level': 'INFO',
+            'max_bytes': '5242880',
+            'backup_count': '5'
+        }
+        
+        config['Recording'] = {
+            'session_path': '',
+            'keyframe_interval': '100',
+            'max_pending': '64'
+        }
+        
         config['Hotkeys'] = {
             'start_stop': 'F1',
             'pause_resume': 'F2',
             'exit': 'F3'
         }
         
+        config['Advanced'] = {
+            'snapshot_mode': 'pass',
+            'incremental_scan': 'true',
+            'change_tolerance': '12',
+            'scan_radius': '100',
+            'scan_pitch': '20',
+            'cell_size': '10',
+            'cell_samples': '1',
+            'walk_speed': '4.317',
+            'key_latency': '0.05',
+            'calibrate_motion': 'false',
+            'config_reload_interval': '1.0'
+        }
+        
         with open('config.ini', 'w') as configfile:
             config.write(configfile)
     
     def setup_logging(self):
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('minecraft_bot.log'),
-                logging.StreamHandler()
-            ]
-        )
+        # Disk and console output happen on a background writer thread,
+        # per-cell events are counted and logged once per pass
+        start_log_writer('minecraft_bot.log', self.config)
         self.logger = logging.getLogger(__name__)
+        self.pass_log = PassSummary(self.logger)
     
     def start(self):
         """Start the farm bot"""
@@ -119,6 +232,11 @@ class MinecraftFarmBot:
         self.logger.info("Farm bot started")
         print(f"{Fore.GREEN}Farm bot started!{Style.RESET_ALL}")
         
+        if self.motion_calibration:
+            self.calibrate_motion()
+        
+        self.config_watcher.start()
+        
         # Start the main farming loop in a separate thread
         self.farming_thread = threading.Thread(target=self.farming_loop)
         self.farming_thread.daemon = True
@@ -130,6 +248,9 @@ class MinecraftFarmBot:
     def stop(self):
         """Stop the farm bot"""
         self.running = False
+        self.config_watcher.stop()
+        self.input_backend.close()
+        self.pass_log.flush()
         self.logger.info("Farm bot stopped")
         print(f"{Fore.RED}Farm bot stopped!{Style.RESET_ALL}")
     
@@ -157,7 +278,11 @@ class MinecraftFarmBot:
     def exit_bot(self):
         """Exit the bot"""
         self.stop()
+        if self.session is not None:
+            self.session.close()
         print(f"{Fore.RED}Exiting Minecraft Farm Bot...{Style.RESET_ALL}")
+        # os._exit skips atexit, write out the queued log records first
+        stop_log_writer()
         os._exit(0)
     
     def farming_loop(self):
@@ -168,18 +293,34 @@ class MinecraftFarmBot:
                 continue
             
             try:
-                # Check for mature crops to harvest
-                if self.config.getboolean('Settings', 'auto_harvest', fallback=True):
-                    self.harvest_mature_crops()
+                # Step replay sources forward and grab the scan area once
+                # for the whole loop if configured
+                self.frame_source.next_frame()
+                self.refresh_snapshot('loop')
                 
-                # Check for empty plots to plant
-                if self.config.getboolean('Settings', 'auto_plant', fallback=True):
-                    self.plant_crops()
+                # Settings changed in config.ini take effect from this loop on
+                settings = self.current_settings()
+                
+                if settings.farm_pattern != 'off':
+                    # Walk the configured pattern, harvesting and replanting
+                    # the block under every stop
+                    if settings.auto_harvest or settings.auto_plant:
+                        self.auto_farm_pattern()
+                else:
+                    # Check for mature crops to harvest
+                    if settings.auto_harvest:
+                        self.harvest_mature_crops()
+                    
+                    # Check for empty plots to plant
+                    if settings.auto_plant:
+                        self.plant_crops()
                 
                 # Water crops if needed
-                if self.config.getboolean('Settings', 'auto_water', fallback=True):
+                if settings.auto_water:
                     self.water_crops()
                 
+                self.pass_log.flush()
+                
                 time.sleep(0.5)  # Small delay to prevent excessive CPU usage
                 
             except Exception as e:
@@ -189,14 +330,41 @@ class MinecraftFarmBot:
     def get_screen_region(self, x, y, width, height):
         """Capture a specific region of the screen"""
         try:
-            screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
-            return np.array(screenshot)
+            return self.frame_source.grab(x, y, width, height)
         except Exception as e:
             self.logger.error(f"Error capturing screen region: {e}")
             return None
     
+    def get_scan_positions(self):
+        """Get the screen positions scanned for crops around the screen center"""
+        screen_width, screen_height = self.frame_source.size()
+        center_x, center_y = screen_width // 2, screen_height // 2
+        return (range(center_x - self.scan_radius, center_x + self.scan_radius, self.scan_pitch),
+                range(center_y - self.scan_radius, center_y + self.scan_radius, self.scan_pitch))
+    
+    def capture_scan_snapshot(self):
+        """Capture the whole scan area in a single grab"""
+        xs, ys = self.get_scan_positions()
+        width = max(len(xs) * xs.step, xs[-1] - xs[0] + self.cell_size)
+        height = max(len(ys) * ys.step, ys[-1] - ys[0] + self.cell_size)
+        region = self.get_screen_region(xs.start, ys.start, width, height)
+        if region is None:
+            return None
+        
+        snapshot = FrameSnapshot(region, xs.start, ys.start)
+        snapshot.set_grid(xs, ys, self.cell_size, self.cell_size, self.cell_samples)
+        return snapshot
+    
+    def refresh_snapshot(self, scope):
+        """Re-grab the scan area if the snapshot mode refreshes at this scope"""
+        if self.snapshot_mode == scope:
+            self.snapshot = self.capture_scan_snapshot()
+    
     def detect_crop_color(self, x, y, width=10, height=10):
         """Detect the color of crops at a specific screen position"""
+        if self.snapshot is not None and self.snapshot.covers(x, y, width, height):
+            return self.snapshot.mean_color(x, y, width, height)
+        
         region = self.get_screen_region(x, y, width, height)
         if region is None:
             return None
@@ -206,16 +374,39 @@ class MinecraftFarmBot:
         avg_color = np.mean(region_rgb, axis=(0, 1))
         return tuple(map(int, avg_color))
     
+    def classify_scan_grid(self, xs, ys):
+        """Classify every scan cell with one lookup table call"""
+        size, samples = self.cell_size, self.cell_samples
+        colors = None
+        if self.snapshot is not None:
+            if self.incremental_scan:
+                # Only cells whose pixels changed since the last pass are reclassified
+                result = self.scan_cache.classify(self.snapshot, xs, ys, size, size, samples)
+                if result is not None:
+                    return result
+            colors = self.snapshot.grid_colors(xs, ys, size, size, samples)
+        
+        if colors is None:
+            # No snapshot covers the grid, fall back to per-cell captures
+            colors = np.array([[self.detect_crop_color(x, y, size, size) or (-1, -1, -1)
+                                for y in ys] for x in xs])
+        
+        entries, matches = self.classifier.classify(colors)
+        
+        # Cells whose capture failed match nothing
+        failed = colors[..., 0] < 0
+        entries[failed] = -1
+        matches[failed] = 0
+        return entries, matches
+    
     def is_crop_mature(self, x, y, crop_type='wheat'):
         """Check if a crop is mature based on color detection"""
         color = self.detect_crop_color(x, y)
         if color is None:
             return False
         
-        mature_color = self.crop_types[crop_type]['mature_color']
-        # Simple color distance check
-        distance = np.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(color, mature_color)))
-        return distance < 50  # Threshold for color similarity
+        # Color distance check against the mature color
+        return self.classifier.is_mature(color, crop_type)
     
     def is_plot_empty(self, x, y):
         """Check if a farming plot is empty"""
@@ -224,99 +415,129 @@ class MinecraftFarmBot:
             return False
         
         # Check if the color is close to dirt/brown (empty plot)
-        dirt_colors = [(139, 69, 19), (160, 82, 45), (205, 133, 63)]
-        for dirt_color in dirt_colors:
-            distance = np.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(color, dirt_color)))
-            if distance < 30:
-                return True
-        return False
+        return self.classifier.is_empty(color)
     
     def move_to_position(self, target_x, target_y):
         """Move the player to a specific position"""
-        # This is a simplified movement - in a real implementation,
-        # you'd need more sophisticated pathfinding
-        current_x, current_y = pyautogui.position()
-        
-        # Calculate direction
-        dx = target_x - current_x
-        dy = target_y - current_y
-        
-        # Move towards target
-        if abs(dx) > 5:
-            if dx > 0:
-                pyautogui.keyDown(self.right_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.right_key)
-            else:
-                pyautogui.keyDown(self.left_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.left_key)
+        # Screen positions map to blocks around the screen center
+        screen_width, screen_height = self.frame_source.size()
+        goal = [round((target_x - screen_width // 2) / self.scan_pitch),
+                round((target_y - screen_height // 2) / self.scan_pitch)]
         
-        if abs(dy) > 5:
-            if dy > 0:
-                pyautogui.keyDown(self.backward_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.backward_key)
-            else:
-                pyautogui.keyDown(self.forward_key)
-                time.sleep(0.1)
-                pyautogui.keyUp(self.forward_key)
+        # Dead reckoning: the player is where the last move should have taken it
+        dx = goal[0] - self.player_position[0]
+        dy = goal[1] - self.player_position[1]
+        self.hold_movement(dx, dy)
+        self.player_position = goal
+    
+    def hold_movement(self, dx, dy):
+        """Walk dx, dy blocks in one timed action, holding two keys for diagonals"""
+        x_time, y_time = self.motion.axis_holds(dx, dy)
+        holds = []
+        if x_time:
+            holds.append((self.right_key if dx > 0 else self.left_key, x_time))
+        if y_time:
+            holds.append((self.backward_key if dy > 0 else self.forward_key, y_time))
+        
+        for key, _ in holds:
+            self.input_backend.key_down(key)
+        start = time.perf_counter()
+        for key, release in sorted(holds, key=lambda hold: hold[1]):
+            time.sleep(max(release - (time.perf_counter() - start), 0.0))
+            self.input_backend.key_up(key)
+    
+    def calibrate_motion(self):
+        """Fit the motion model from how far the view shifts per key hold"""
+        self.logger.info("Calibrating movement...")
+        xs, ys = self.get_scan_positions()
+        width = xs[-1] - xs[0] + self.cell_size
+        height = ys[-1] - ys[0] + self.cell_size
+        
+        for hold in (0.2, 0.4, 0.8):
+            # Walk forward and back again so the player ends where it started
+            for key in (self.forward_key, self.backward_key):
+                before = self.get_screen_region(xs.start, ys.start, width, height)
+                if before is not None:
+                    # xshm grabs of the same size share one buffer
+                    before = before.copy()
+                self.input_backend.key_down(key)
+                time.sleep(hold)
+                self.input_backend.key_up(key)
+                time.sleep(0.5)  # Let the player come to a stop
+                after = self.get_screen_region(xs.start, ys.start, width, height)
+                if before is None or after is None:
+                    continue
+                
+                _, shift_y = measure_shift(before, after)
+                self.motion.add_sample(hold, abs(shift_y) / self.scan_pitch)
+        
+        if self.motion.fit():
+            self.logger.info(f"Walking speed: {self.motion.speed:.2f} blocks/s "
+                             f"after {self.motion.latency:.3f}s")
+        else:
+            self.logger.warning("Movement calibration failed, keeping the configured walk_speed")
     
     def harvest_mature_crops(self):
         """Harvest mature crops in the farm area"""
-        self.logger.info("Checking for mature crops to harvest...")
+        self.logger.debug("Checking for mature crops to harvest...")
         
         # Scan the farm area for mature crops
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
+        self.refresh_snapshot('pass')
+        xs, ys = self.get_scan_positions()
+        _, matches = self.classify_scan_grid(xs, ys)
+        mature = self.classifier.mature_mask(matches, 'wheat')
         
-        for x in range(center_x - 100, center_x + 100, 20):
-            for y in range(center_y - 100, center_y + 100, 20):
+        for i, x in enumerate(xs):
+            for j, y in enumerate(ys):
                 if not self.running or self.paused:
                     return
                 
                 # Check if crop is mature
-                if self.is_crop_mature(x, y):
-                    self.logger.info(f"Harvesting mature crop at ({x}, {y})")
+                if mature[i, j]:
+                    self.logger.debug("Harvesting mature crop at (%d, %d)", x, y)
+                    self.pass_log.add('harvested')
                     
                     # Move to crop position
                     self.move_to_position(x, y)
                     
                     # Harvest the crop
-                    pyautogui.click(x, y, button=self.attack_key)
+                    self.input_backend.click(x, y, self.attack_key)
                     time.sleep(self.harvest_delay)
     
     def plant_crops(self):
         """Plant crops in empty plots"""
-        self.logger.info("Checking for empty plots to plant...")
+        self.logger.debug("Checking for empty plots to plant...")
         
         # Scan the farm area for empty plots
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
+        self.refresh_snapshot('pass')
+        xs, ys = self.get_scan_positions()
+        _, matches = self.classify_scan_grid(xs, ys)
+        empty = self.classifier.empty_mask(matches)
         
-        for x in range(center_x - 100, center_x + 100, 20):
-            for y in range(center_y - 100, center_y + 100, 20):
+        for i, x in enumerate(xs):
+            for j, y in enumerate(ys):
                 if not self.running or self.paused:
                     return
                 
                 # Check if plot is empty
-                if self.is_plot_empty(x, y):
-                    self.logger.info(f"Planting crop at ({x}, {y})")
+                if empty[i, j]:
+                    self.logger.debug("Planting crop at (%d, %d)", x, y)
+                    self.pass_log.add('planted')
                     
                     # Move to plot position
                     self.move_to_position(x, y)
                     
                     # Plant the crop
-                    pyautogui.click(x, y, button=self.use_key)
+                    self.input_backend.click(x, y, self.use_key)
                     time.sleep(self.plant_delay)
     
     def water_crops(self):
         """Water crops that need watering"""
-        self.logger.info("Checking for crops that need watering...")
+        self.logger.debug("Checking for crops that need watering...")
         
         # This is a simplified watering system
         # In a real implementation, you'd need to detect dry soil
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self.frame_source.size()
         center_x, center_y = screen_width // 2, screen_height // 2
         
         # Check if player has water bucket
@@ -327,10 +548,11 @@ class MinecraftFarmBot:
             self._water_counter = 0
         
         if self._water_counter > 50:  # Water every 50 cycles
-            self.logger.info("Watering crops...")
-            pyautogui.keyDown(self.use_key)
+            self.logger.debug("Watering crops...")
+            self.pass_log.add('watered')
+            self.input_backend.key_down(self.use_key)
             time.sleep(self.water_delay)
-            pyautogui.keyUp(self.use_key)
+            self.input_backend.key_up(self.use_key)
             self._water_counter = 0
     
     def auto_farm_pattern(self):
@@ -338,47 +560,83 @@ class MinecraftFarmBot:
         patterns = {
             'grid': self.farm_grid_pattern,
             'spiral': self.farm_spiral_pattern,
-            'rows': self.farm_row_pattern
+            'rows': self.farm_row_pattern,
+            'serpentine': self.farm_serpentine_pattern
         }
         
-        pattern = self.config.get('Settings', 'farm_pattern', fallback='grid')
-        if pattern in patterns:
-            patterns[pattern]()
+        pattern = self.current_settings().farm_pattern
+        if pattern == 'off':
+            return 0
+        if pattern not in patterns:
+            self.logger.warning(f"Unknown farm_pattern {pattern}, using grid")
+            pattern = 'grid'
+        return patterns[pattern]()
     
     def farm_grid_pattern(self):
         """Farm in a grid pattern"""
-        self.logger.info("Executing grid farming pattern...")
-        
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
-        
-        for row in range(-self.farm_radius, self.farm_radius + 1):
-            for col in range(-self.farm_radius, self.farm_radius + 1):
-                if not self.running or self.paused:
-                    return
-                
-                target_x = center_x + (col * 20)
-                target_y = center_y + (row * 20)
-                
-                self.move_to_position(target_x, target_y)
-                self.harvest_mature_crops()
-                self.plant_crops()
+        return self.farm_pattern('grid')
     
     def farm_spiral_pattern(self):
         """Farm in a spiral pattern"""
-        self.logger.info("Executing spiral farming pattern...")
-        
-        # Implementation for spiral pattern
-        # This would move in a spiral from center outward
-        pass
+        return self.farm_pattern('spiral')
     
     def farm_row_pattern(self):
         """Farm in rows"""
-        self.logger.info("Executing row farming pattern...")
+        return self.farm_pattern('rows')
+    
+    def farm_serpentine_pattern(self):
+        """Farm rows back and forth without walking back to the row start"""
+        return self.farm_pattern('serpentine')
+    
+    def farm_pattern(self, name):
+        """Walk a traversal pattern doing only local work at each stop"""
+        self.logger.debug(f"Executing {name} farming pattern...")
+        
+        screen_width, screen_height = self.frame_source.size()
+        center_x, center_y = screen_width // 2, screen_height // 2
+        # Blocks keep their screen positions while the player walks, one
+        # fresh grab at the start serves every stop
+        self.snapshot = self.capture_scan_snapshot()
+        
+        processed = 0
+        start = time.perf_counter()
+        for col, row in PATTERNS[name](self.farm_radius):
+            if not self.running or self.paused:
+                break
+            
+            target_x = center_x + (col * self.scan_pitch)
+            target_y = center_y + (row * self.scan_pitch)
+            
+            self.move_to_position(target_x, target_y)
+            self.farm_cell(target_x, target_y)
+            processed += 1
+        
+        elapsed = time.perf_counter() - start
+        if processed:
+            self.logger.debug(f"{name} pattern: {processed} cells in {elapsed:.2f}s "
+                             f"({processed / elapsed:.1f} cells/s)")
+        return processed
+    
+    def farm_cell(self, x, y):
+        """Harvest, replant or plant the single block under a stop"""
+        color = self.detect_crop_color(x, y, self.cell_size, self.cell_size)
+        if color is None:
+            return
+        
+        settings = self.applied_settings
+        mature = self.classifier.is_mature(color, 'wheat')
+        if mature and settings.auto_harvest:
+            self.logger.debug("Harvesting mature crop at (%d, %d)", x, y)
+            self.pass_log.add('harvested')
+            self.input_backend.click(x, y, self.attack_key)
+            time.sleep(self.harvest_delay)
         
-        # Implementation for row pattern
-        # This would farm row by row
-        pass
+        # Harvested blocks are replanted right away
+        if (mature or self.classifier.is_empty(color)) and settings.auto_plant:
+            self.logger.debug("Planting crop at (%d, %d)", x, y)
+            self.pass_log.add('planted')
+            self.input_backend.click(x, y, self.use_key)
+            time.sleep(self.plant_delay)
 
 def main():
     """Main function to run the Minecraft Farm Bot"""
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Motion Model for the Minecraft Farm Bot
+Turns block offsets into timed key holds, calibrated from observed movement
+Made by DDS
+"""
+
+import math
+
+import cv2
+import numpy as np
+
+# Minecraft walking speed in blocks per second
+WALK_SPEED = 4.317
+
+
+class MotionModel:
+    """Blocks walked per second of key hold, fitted from observed moves
+
+    A hold of t seconds walks speed * (t - latency) blocks, the player
+    needs a moment to get going. Holding two keys walks diagonally and
+    Minecraft normalizes the walk direction, so each axis then moves at
+    speed / sqrt(2).
+    """
+
+    def __init__(self, speed=WALK_SPEED, latency=0.05):
+        self.speed = speed
+        self.latency = latency
+        self.samples = []  # (hold seconds, blocks walked)
+
+    def hold_time(self, blocks):
+        """Seconds to hold a key to walk a number of blocks in a straight line"""
+        if not blocks:
+            return 0.0
+        return self.latency + abs(blocks) / self.speed
+
+    def displacement(self, hold):
+        """Blocks walked in a straight line while holding a key"""
+        return max(hold - self.latency, 0.0) * self.speed
+
+    def axis_holds(self, dx, dy):
+        """Release times of the x and y keys of one move, both pressed together
+
+        A zero release time means the key of that axis is not needed.
+        """
+        short, long = sorted((abs(dx), abs(dy)))
+        if short == 0:
+            hold = self.hold_time(long)
+            return (hold if dx else 0.0), (hold if dy else 0.0)
+
+        # Walk diagonally until the short axis is done, then straight on
+        diagonal = self.latency + short * math.sqrt(2) / self.speed
+        straight = diagonal + (long - short) / self.speed
+        if abs(dx) >= abs(dy):
+            return straight, diagonal
+        return diagonal, straight
+
+    def add_sample(self, hold, blocks):
+        """Record an observed move"""
+        self.samples.append((hold, blocks))
+
+    def fit(self):
+        """Least squares fit of blocks = speed * (hold - latency)
+
+        Returns False and keeps the current model if the samples do not
+        look like walking, e.g. when the view did not move at all.
+        """
+        if len(self.samples) < 2:
+            return False
+        holds, blocks = np.array(self.samples, dtype=np.float64).T
+        if np.ptp(holds) == 0:
+            return False
+        slope, intercept = np.polyfit(holds, blocks, 1)
+        if slope < WALK_SPEED / 10:
+            return False
+        self.speed = float(slope)
+        self.latency = max(float(-intercept / slope), 0.0)
+        return True
+
+
+def measure_shift(before, after):
+    """Pixel shift (dx, dy) of the view between two BGR captures"""
+    before = cv2.cvtColor(before, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    after = cv2.cvtColor(after, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    window = cv2.createHanningWindow(before.shape[::-1], cv2.CV_32F)
+    (dx, dy), _ = cv2.phaseCorrelate(before, after, window)
+    return dx, dy
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pathfinding for the Minecraft Farm Bot
+A* over the farm grid with cached paths and distance fields
+Made by DDS
+"""
+
+import heapq
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# Grid steps, (di, dj) where i runs left to right and j top to bottom
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+UNREACHABLE = -1
+
+
+class GridPathfinder:
+    """Shortest 4-connected paths over a grid of blocked and free cells
+
+    Distance fields are kept for anchors such as the farm center and chests,
+    so any trip to an anchor is a walk down its field. Other trips are found
+    with A* and kept in a bounded cache until the obstacles change.
+    """
+
+    def __init__(self, blocked, anchors=(), cache_size=4096):
+        self.blocked = np.array(blocked, dtype=bool)
+        self.anchors = [tuple(anchor) for anchor in anchors]
+        self.cache_size = cache_size
+        self.paths = OrderedDict()
+        self.fields = {}
+        self.rebuild()
+
+    def rebuild(self):
+        """Drop cached paths and recompute the anchor distance fields"""
+        self.paths.clear()
+        self.fields = {anchor: self.distance_field(anchor) for anchor in self.anchors
+                       if self.in_bounds(anchor)}
+
+    def set_blocked(self, blocked):
+        """Update the obstacles, caches are only dropped if something changed"""
+        if not np.array_equal(blocked, self.blocked):
+            self.blocked = np.array(blocked, dtype=bool)
+            self.rebuild()
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.blocked.shape[0] and 0 <= cell[1] < self.blocked.shape[1]
+
+    def passable(self, cell):
+        return self.in_bounds(cell) and not self.blocked[cell]
+
+    def neighbors(self, cell):
+        i, j = cell
+        for di, dj in DIRECTIONS:
+            step = (i + di, j + dj)
+            if self.passable(step):
+                yield step
+
+    def distance_field(self, anchor):
+        """Breadth-first step count from every cell to an anchor"""
+        field = np.full(self.blocked.shape, UNREACHABLE, dtype=np.int32)
+        field[anchor] = 0
+        queue = deque([anchor])
+        while queue:
+            cell = queue.popleft()
+            for step in self.neighbors(cell):
+                if field[step] == UNREACHABLE:
+                    field[step] = field[cell] + 1
+                    queue.append(step)
+        return field
+
+    def walk_field(self, field, start):
+        """Follow a distance field downhill from start to its anchor"""
+        if field[start] == UNREACHABLE:
+            return None
+        path = [start]
+        cell = start
+        while field[cell] > 0:
+            cell = next(step for step in self.neighbors(cell) if field[step] == field[cell] - 1)
+            path.append(cell)
+        return path
+
+    def find_path(self, start, goal):
+        """Shortest path from start to goal as a list of cells, or None"""
+        start, goal = tuple(start), tuple(goal)
+        if not self.passable(goal) or not self.in_bounds(start):
+            return None
+        if start == goal:
+            return [start]
+
+        if goal in self.fields:
+            return self.walk_field(self.fields[goal], start)
+
+        key = (start, goal)
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            return self.paths[key]
+
+        path = self.a_star(start, goal)
+        self.paths[key] = path
+        if len(self.paths) > self.cache_size:
+            self.paths.popitem(last=False)
+        return path
+
+    def a_star(self, start, goal):
+        """A* search with the Manhattan distance heuristic"""
+        def heuristic(cell):
+            return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+        came_from = {start: None}
+        cost = {start: 0}
+        frontier = [(heuristic(start), 0, start)]
+        while frontier:
+            _, steps, cell = heapq.heappop(frontier)
+            if cell == goal:
+                path = []
+                while cell is not None:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return path[::-1]
+            if steps > cost[cell]:
+                continue
+            for step in self.neighbors(cell):
+                if step not in cost or steps + 1 < cost[step]:
+                    cost[step] = steps + 1
+                    came_from[step] = cell
+                    heapq.heappush(frontier, (steps + 1 + heuristic(step), steps + 1, step))
+        return None
+
+    def distance(self, start, goal):
+        """Number of steps between two cells, or None if unreachable"""
+        path = self.find_path(start, goal)
+        return None if path is None else len(path) - 1
+
+
+def path_runs(path):
+    """Compress a path into (direction, steps) runs of straight movement"""
+    runs = []
+    for previous, cell in zip(path, path[1:]):
+        direction = (cell[0] - previous[0], cell[1] - previous[1])
+        if runs and runs[-1][0] == direction:
+            runs[-1][1] += 1
+        else:
+            runs.append([direction, 1])
+    return [tuple(run) for run in runs]
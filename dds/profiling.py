@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Phase Profiler for the Minecraft Farm Bot
+Latency histograms of where each farming loop spends its time
+Made by DDS
+"""
+
+import functools
+import threading
+import time
+
+
+class LatencyHistogram:
+    """HDR-style histogram of durations in microseconds
+
+    Values below 2^sub_bits are counted exactly. Above that every power of
+    two is split into 2^(sub_bits - 1) equal buckets, so any value is
+    off by less than 2^(1 - sub_bits) (under 2% with the default 7 bits).
+    Recording is a few integer operations, memory is fixed.
+    """
+
+    def __init__(self, sub_bits=7, max_exponent=40):
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.half = self.sub_count >> 1
+        self.counts = [0] * (self.sub_count + max_exponent * self.half)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def index(self, value):
+        """Bucket of a value"""
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return self.sub_count + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def value(self, index):
+        """Highest value counted in a bucket"""
+        if index < self.sub_count:
+            return index
+        shift = (index - self.sub_count) // self.half + 1
+        mantissa = (index - self.sub_count) % self.half + self.half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, micros):
+        """Count one duration in microseconds"""
+        micros = int(micros)
+        if micros < self.sub_count:
+            index = micros
+        else:
+            shift = micros.bit_length() - self.sub_bits
+            index = min(self.sub_count + (shift - 1) * self.half + (micros >> shift) - self.half,
+                        len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, percent):
+        """Duration in microseconds below which percent of the values fall"""
+        if not self.count:
+            return 0
+        target = max(self.count * percent / 100.0, 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.value(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean, percentiles and maximum in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count / 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) / 1000,
+            'p95_ms': self.percentile(95) / 1000,
+            'p99_ms': self.percentile(99) / 1000,
+            'max_ms': self.max / 1000,
+            'total_s': self.total / 1e6,
+        }
+
+
+class PhaseSpan:
+    """Times a with block into one phase of a profiler"""
+
+    __slots__ = ('profiler', 'phase', 'key', 'start')
+
+    def __init__(self, profiler, phase, key):
+        self.profiler = profiler
+        self.phase = phase
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.span(self.phase, self.start, time.perf_counter(), self.key)
+        return False
+
+
+class PhaseProfiler:
+    """Latency histograms per phase of the farming loop and per crop type
+
+    Phases are e.g. capture, classify, plan, move, input and sleep. A key
+    splits a phase further, e.g. harvest by crop type. Safe to record from
+    the farming, input and executor threads at once.
+
+    With a tracer set every span is also recorded with its begin and end
+    times, without one that costs a single attribute check.
+    """
+
+    def __init__(self, tracer=None):
+        self.histograms = {}  # (phase, key) -> LatencyHistogram
+        self.lock = threading.Lock()
+        self.tracer = tracer
+
+    def phase(self, phase, key=None):
+        """Context manager timing its block into a phase"""
+        return PhaseSpan(self, phase, key)
+
+    def record(self, phase, seconds, key=None):
+        """Count one duration in seconds"""
+        with self.lock:
+            histogram = self.histograms.get((phase, key))
+            if histogram is None:
+                histogram = self.histograms[phase, key] = LatencyHistogram()
+            histogram.record(seconds * 1e6)
+
+    def span(self, phase, start, end, key=None):
+        """Count one duration given by its perf_counter begin and end, tracing it if enabled"""
+        self.record(phase, end - start, key)
+        if self.tracer is not None:
+            self.tracer.span(phase if key is None else f"{phase}/{key}", start, end)
+
+    def summary(self):
+        """Summary of every phase, keyed by phase or phase/key"""
+        with self.lock:
+            items = list(self.histograms.items())
+        summary = {}
+        for (phase, key), histogram in sorted(items, key=lambda item: (item[0][0], str(item[0][1]))):
+            summary[phase if key is None else f"{phase}/{key}"] = histogram.summary()
+        return summary
+
+    def report(self):
+        """Lines of a table of every phase for the console"""
+        lines = [f"{'phase':<22}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'total s':>10}"]
+        for name, data in self.summary().items():
+            lines.append(f"{name:<22}{data['count']:>8}{data['p50_ms']:>10.2f}{data['p95_ms']:>10.2f}"
+                         f"{data['p99_ms']:>10.2f}{data['max_ms']:>10.2f}{data['total_s']:>10.2f}")
+        return lines
+
+
+def timed(phase):
+    """Decorate a method to time every call into a phase of self.profiler"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.profiler.span(phase, start, time.perf_counter())
+        return wrapper
+    return decorator
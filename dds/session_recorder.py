@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Session Recorder for the Minecraft Farm Bots
+Record captured frames and sent inputs to a session file and replay them
+Made by DDS
+"""
+
+import atexit
+import json
+import queue
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from frame_sources import FrameSource
+from input_backends import InputBackend
+
+SESSION_VERSION = 1
+
+# Every record is two little-endian sizes, a JSON header and a payload
+RECORD_PREFIX = struct.Struct('<II')
+
+
+class SessionRecorder:
+    """Append frames, loop ticks and inputs to a session file from a writer thread
+
+    The farming and input threads only copy pixels and queue them.
+    Compression and disk writes happen on the writer thread. A grab is
+    stored as the XOR with the previous grab of the same rectangle, which
+    is mostly zeros and compresses well, with a full keyframe every
+    keyframe_interval grabs. When more than max_pending records are waiting
+    to be written, new grabs are dropped instead of blocking. Ticks and
+    inputs are never dropped.
+    """
+
+    def __init__(self, path, config=None, keyframe_interval=100, max_pending=64):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.max_pending = max_pending
+        self.file = open(path, 'wb')
+        self.queue = queue.Queue()
+        self.dropped = 0
+        self.started = time.perf_counter()
+        self.previous = {}  # (x, y, shape) -> (last frame written, grabs since keyframe)
+        self.inventory = None  # The bot's inventory dict, stored with every tick if set
+
+        sections = {}
+        if config is not None:
+            sections = {name: dict(config[name]) for name in config.sections()}
+        self.queue.put(({'type': 'session', 'version': SESSION_VERSION,
+                         'started': datetime.now().isoformat(timespec='seconds'),
+                         'config': sections}, None))
+
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        atexit.register(self.close)
+
+    def elapsed(self):
+        """Seconds since recording started"""
+        return time.perf_counter() - self.started
+
+    def record_frame(self, x, y, frame):
+        """Queue a copy of a grabbed screen rectangle"""
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        # Sources may reuse their buffers, so the pixels are copied now
+        self.queue.put(({'type': 'frame', 'time': self.elapsed(), 'x': int(x), 'y': int(y)},
+                        np.array(frame, dtype=np.uint8)))
+
+    def record_tick(self):
+        """Mark the start of a farming loop, with the bot clock and inventory at that moment"""
+        header = {'type': 'tick', 'time': self.elapsed(), 'clock': time.time()}
+        if self.inventory is not None:
+            # Copied now, the bot keeps changing it while the record waits
+            header['inventory'] = {name: dict(items) for name, items in self.inventory.items()}
+        self.queue.put((header, None))
+
+    def record_input(self, kind, *args):
+        """Queue an input sent to the game"""
+        self.queue.put(({'type': 'input', 'time': self.elapsed(), 'kind': kind, 'args': list(args)}, None))
+
+    def run(self):
+        """Encode and write queued records until closed"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            header, frame = item
+            payload = b''
+            if frame is not None:
+                payload = self.encode(header, frame)
+            data = json.dumps(header).encode('utf-8')
+            self.file.write(RECORD_PREFIX.pack(len(data), len(payload)))
+            self.file.write(data)
+            self.file.write(payload)
+
+    def encode(self, header, frame):
+        """Compress a frame against the previous grab of the same rectangle"""
+        key = (header['x'], header['y'], frame.shape)
+        previous, since_key = self.previous.get(key, (None, 0))
+        if previous is None or since_key + 1 >= self.keyframe_interval:
+            header['codec'] = 'key'
+            data, since_key = frame, 0
+        else:
+            header['codec'] = 'delta'
+            data, since_key = np.bitwise_xor(frame, previous), since_key + 1
+        self.previous[key] = (frame, since_key)
+        header['shape'] = list(frame.shape)
+        return zlib.compress(data.tobytes(), 1)
+
+    def close(self):
+        """Write out everything queued and close the file"""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        self.file.close()
+
+    def wrap_frames(self, source):
+        """Frame source that records everything grabbed from source"""
+        width, height = source.size()
+        self.queue.put(({'type': 'screen', 'width': int(width), 'height': int(height)}, None))
+        return SessionFrameRecorder(source, self)
+
+    def wrap_inputs(self, backend):
+        """Input backend that records everything sent to backend"""
+        return SessionInputRecorder(backend, self)
+
+
+class SessionFrameRecorder(FrameSource):
+    """Pass grabs through from another frame source, recording each one"""
+
+    def __init__(self, inner, recorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    def size(self):
+        return self.inner.size()
+
+    def grab(self, x, y, width, height):
+        frame = self.inner.grab(x, y, width, height)
+        if frame is not None:
+            self.recorder.record_frame(x, y, frame)
+        return frame
+
+    def next_frame(self):
+        self.recorder.record_tick()
+        self.inner.next_frame()
+
+    def close(self):
+        self.inner.close()
+
+
+class SessionInputRecorder(InputBackend):
+    """Pass inputs through to another backend, recording each one"""
+
+    def __init__(self, inner, recorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    def click(self, x, y, button):
+        self.recorder.record_input('click', x, y, button)
+        self.inner.click(x, y, button)
+
+    def key_down(self, key):
+        self.recorder.record_input('key_down', key)
+        self.inner.key_down(key)
+
+    def key_up(self, key):
+        self.recorder.record_input('key_up', key)
+        self.inner.key_up(key)
+
+    def set_pause(self, seconds):
+        self.inner.set_pause(seconds)
+
+    def close(self):
+        self.inner.close()
+
+
+def open_session_recorder(config):
+    """Start recording to the session_path of the [Recording] config section, None if unset"""
+    path = config.get('Recording', 'session_path', fallback='')
+    if not path:
+        return None
+    return SessionRecorder(path, config,
+                           config.getint('Recording', 'keyframe_interval', fallback=100),
+                           config.getint('Recording', 'max_pending', fallback=64))
+
+
+def read_session(path):
+    """Yield (header, frame) for every record of a session file
+
+    frame is None for records that are not frames. A file cut short by a
+    crash is read up to its last complete record.
+    """
+    previous = {}
+    with open(path, 'rb') as f:
+        while True:
+            prefix = f.read(RECORD_PREFIX.size)
+            if len(prefix) < RECORD_PREFIX.size:
+                return
+            header_size, payload_size = RECORD_PREFIX.unpack(prefix)
+            data = f.read(header_size)
+            payload = f.read(payload_size)
+            if len(data) < header_size or len(payload) < payload_size:
+                return
+            header = json.loads(data.decode('utf-8'))
+
+            frame = None
+            if header['type'] == 'frame':
+                shape = tuple(header['shape'])
+                frame = np.frombuffer(zlib.decompress(payload), dtype=np.uint8).reshape(shape)
+                key = (header['x'], header['y'], shape)
+                if header['codec'] == 'delta':
+                    frame = np.bitwise_xor(frame, previous[key])
+                previous[key] = frame
+            yield header, frame
+
+
+class SessionReplaySource(FrameSource):
+    """Serve the frames of a recorded session, one recorded farming loop per next_frame
+
+    Grabs are pasted onto a screen-sized canvas in the order they were
+    recorded, so code that grabs differently from the recording still sees
+    the same pixels in every loop. time() is the bot clock of the current
+    loop, for replaying cooldowns and growth predictions as recorded.
+    inventory is the bot's inventory at the start of that loop, None for
+    sessions that did not record it.
+    """
+
+    def __init__(self, path, width=1920, height=1080):
+        # width and height are only used by sessions that never recorded the screen size
+        self.records = read_session(path)
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        self.header = {}
+        self.inputs = []  # (time, kind, args) of every recorded input read so far
+        self.clock = 0.0
+        self.inventory = None
+        self.loops = 0
+        self.finished = False
+        self.pending = None
+        self.apply_until_tick()
+
+    def size(self):
+        height, width = self.canvas.shape[:2]
+        return width, height
+
+    def grab(self, x, y, width, height):
+        return self.canvas[y:y + height, x:x + width]
+
+    def time(self):
+        """Bot clock of the recorded loop being replayed"""
+        return self.clock
+
+    def next_frame(self):
+        if self.pending is None:
+            self.finished = True
+            return
+        self.clock = self.pending['clock']
+        self.inventory = self.pending.get('inventory')
+        self.loops += 1
+        self.apply_until_tick()
+
+    def apply_until_tick(self):
+        """Apply recorded grabs and collect inputs up to the next loop tick"""
+        for header, frame in self.records:
+            kind = header['type']
+            if kind == 'tick':
+                self.pending = header
+                return
+            if kind == 'session':
+                self.header = header
+            elif kind == 'screen':
+                self.canvas = np.zeros((header['height'], header['width'], 3), dtype=np.uint8)
+            elif kind == 'input':
+                self.inputs.append((header['time'], header['kind'], header['args']))
+            elif kind == 'frame':
+                x, y = header['x'], header['y']
+                height, width = frame.shape[:2]
+                self.canvas[y:y + height, x:x + width] = frame[:self.canvas.shape[0] - y,
+                                                               :self.canvas.shape[1] - x]
+        self.pending = None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bot Settings for the Minecraft Farm Bot
+Typed snapshot of config.ini, replaced whole whenever the file changes
+Made by DDS
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+
+
+def setting(section, default):
+    """A snapshot field read from a section of config.ini"""
+    return field(default=default, metadata={'section': section})
+
+
+@dataclass(frozen=True)
+class BotSettings:
+    """Typed values of the settings the farming loops read while running
+
+    A snapshot never changes after it is built. When config.ini changes a
+    new snapshot replaces the old one in a single assignment, so readers
+    see either all old or all new values and never parse strings.
+    """
+
+    farm_radius: int = setting('Settings', 5)
+    plant_delay: float = setting('Settings', 0.5)
+    harvest_delay: float = setting('Settings', 0.3)
+    water_delay: float = setting('Settings', 1.0)
+    farm_pattern: str = setting('Settings', 'off')
+    auto_water: bool = setting('Settings', True)
+    auto_plant: bool = setting('Settings', True)
+    auto_harvest: bool = setting('Settings', True)
+
+    seed_threshold: int = setting('Advanced', 10)
+    auto_restock: bool = setting('Advanced', True)
+    smart_pathfinding: bool = setting('Advanced', True)
+    fused_scan: bool = setting('Advanced', True)
+    growth_scheduling: bool = setting('Advanced', False)
+    max_schedule_sleep: float = setting('Advanced', 30.0)
+    optimize_tour: bool = setting('Advanced', True)
+    color_threshold: int = setting('Advanced', 50)
+    scan_interval: float = setting('Advanced', 0.5)
+    harvest_cooldown: float = setting('Advanced', 2.0)
+    plant_cooldown: float = setting('Advanced', 2.0)
+    water_cooldown: float = setting('Advanced', 10.0)
+    input_backlog: float = setting('Advanced', 2.0)
+    config_reload_interval: float = setting('Advanced', 1.0)
+
+    @classmethod
+    def from_config(cls, config):
+        """Parse every field from a ConfigParser, raising ValueError on bad values"""
+        getters = {
+            int: config.getint,
+            float: config.getfloat,
+            bool: config.getboolean,
+            str: config.get,
+        }
+        values = {}
+        for item in fields(cls):
+            getter = getters[item.type]
+            values[item.name] = getter(item.metadata['section'], item.name, fallback=item.default)
+        return cls(**values)
+
+
+class ConfigWatcher:
+    """Call on_change whenever the modification time of a file changes
+
+    Polls the file from a daemon thread, a stat call per interval.
+    """
+
+    def __init__(self, path, on_change, interval=1.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.mtime = self.modified()
+        self.running = False
+        self.thread = None
+
+    def modified(self):
+        """Modification time of the file, None if it cannot be read"""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        """Start polling the file"""
+        if self.running or self.interval <= 0:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop polling the file"""
+        self.running = False
+
+    def check(self):
+        """Call on_change if the file changed since the last check"""
+        mtime = self.modified()
+        if mtime is None or mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        self.on_change()
+        return True
+
+    def run(self):
+        """Poll until stopped"""
+        while self.running:
+            time.sleep(self.interval)
+            if self.running:
+                self.check()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from crop_classifier import CropClassifier
+from farm_planner import EMPTY, GROWING
+from farm_state import FarmGrid
+
+
+def test_blank_frames_do_not_mask_the_farm(tmp_path, monkeypatch):
+    from benchmark import create_headless_bot
+
+    # The bot writes its default config and logs to the working directory
+    monkeypatch.chdir(tmp_path)
+    bot = create_headless_bot(seed=0, action_delay=0.0)
+    xs, ys = bot.get_scan_positions()
+
+    # A failed grab or a menu over the game classifies nothing
+    for _ in range(bot.farm_grid.non_farmland_scans + 1):
+        entries = np.full((len(xs), len(ys)), -1, dtype=np.int16)
+        matches = np.zeros((len(xs), len(ys)), dtype=np.uint32)
+        bot.plan_farming_pass(xs, ys, entries, matches)
+    assert bot.farm_grid.counts()['non_farmland'] == 0
+
+    bot.frame_source.next_frame()
+    bot.refresh_snapshot('pass')
+    entries, matches = bot.classify_scan_grid(xs, ys)
+    visits = bot.plan_farming_pass(xs, ys, entries, matches)
+    assert any(action.kind == 'harvest' for visit in visits for action in visit.actions)
+
+
+def test_masked_block_is_unmasked_when_it_reads_as_farmland():
+    crop_types = {'wheat': {'growth_stages': [(0, 100, 0), (200, 200, 0)], 'mature_color': (200, 200, 0),
+                            'seeds': 'wheat_seeds'}}
+    grid = FarmGrid(1, crop_types, non_farmland_scans=2)
+    classifier = CropClassifier(crop_types)
+    entries = np.full((3, 3), -1, dtype=np.int16)
+
+    # The center block reads as water while the rest of the farm is dirt
+    states = np.full((3, 3), EMPTY, dtype=np.uint8)
+    states[1, 1] = 0
+    for _ in range(2):
+        grid.observe(entries, states, classifier, 0.0)
+    assert grid.non_farmland[1, 1]
+
+    states[1, 1] = GROWING
+    grid.observe(entries, states, classifier, 1.0)
+    assert not grid.non_farmland.any()
@@ -0,0 +1,47 @@
+from growth_scheduler import GrowthScheduler
+
+
+def make_scheduler():
+    return GrowthScheduler(['wheat'], [4], recheck_delay=5.0)
+
+
+def test_deferred_block_without_stage_comes_due_again():
+    scheduler = make_scheduler()
+    scheduler.schedule((0, 0), 0.0)
+    assert scheduler.pop_due(0.0) == {(0, 0)}
+
+    # An empty block has no last stage, deferring it must not drop it
+    scheduler.defer((0, 0), 0.0)
+    assert scheduler.next_due() == 5.0
+    assert scheduler.pop_due(4.0) == set()
+    assert scheduler.pop_due(5.0) == {(0, 0)}
+
+
+def test_requeued_block_is_due_right_away():
+    scheduler = make_scheduler()
+    scheduler.schedule((1, 2), 0.0)
+    assert scheduler.pop_due(0.0) == {(1, 2)}
+    assert scheduler.next_due() is None
+
+    # Popped but never visited, e.g. the pass was paused
+    scheduler.requeue((1, 2), 3.0)
+    assert scheduler.next_due() == 3.0
+    assert scheduler.pop_due(3.0) == {(1, 2)}
+
+
+def test_visit_skipped_for_lack_of_seeds_comes_due_again(tmp_path, monkeypatch):
+    from benchmark import create_headless_bot
+    from farm_planner import CellVisit, FarmAction
+
+    # The bot writes its default config and logs to the working directory
+    monkeypatch.chdir(tmp_path)
+    bot = create_headless_bot(seed=0, action_delay=0.0)
+    bot.inventory['seeds'] = {seed_type: 0 for seed_type in bot.inventory['seeds']}
+    bot.clock = lambda: 100.0
+
+    bot.scheduler.schedule((1, 1), 100.0)
+    assert bot.scheduler.pop_due(100.0) == {(1, 1)}
+    bot.visit_cell(CellVisit(0, 0, (1, 1), [FarmAction('plant', 'wheat_seeds')]))
+
+    assert bot.inputs.sent == 0
+    assert bot.scheduler.pop_due(100.0 + bot.scheduler.recheck_delay) == {(1, 1)}
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+import input_backends
+
+
+class FakePlatform:
+    """Records the calls pyautogui's platform layer would get"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _moveTo(self, x, y):
+        self.calls.append(('moveTo', x, y))
+
+    def _click(self, x, y, button):
+        self.calls.append(('click', x, y, button))
+
+
+def test_direct_click_moves_the_cursor_first(monkeypatch):
+    platform = FakePlatform()
+    monkeypatch.setattr(input_backends, 'pyautogui', SimpleNamespace(platformModule=platform))
+    backend = input_backends.DirectInputBackend()
+
+    backend.click(120, 340, 'left')
+
+    assert platform.calls == [('moveTo', 120, 340), ('click', 120, 340, 'left')]
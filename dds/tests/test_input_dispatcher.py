@@ -0,0 +1,68 @@
+import threading
+import time
+
+from input_backends import NullInputBackend, RecordingInputBackend
+from input_dispatcher import InputDispatcher
+from profiling import PhaseProfiler
+
+
+def test_click_phase_is_timed_until_the_click_is_sent():
+    dispatcher = InputDispatcher(RecordingInputBackend())
+    dispatcher.profiler = PhaseProfiler()
+    dispatcher.start()
+    try:
+        for _ in range(5):
+            dispatcher.click(10, 20, 'left', 0.02, phase=('harvest', 'wheat'))
+        assert dispatcher.wait_idle(timeout=5)
+    finally:
+        dispatcher.stop()
+
+    # The last click waits behind four click delays
+    summary = dispatcher.profiler.summary()['harvest/wheat']
+    assert summary['count'] == 5
+    assert summary['max_ms'] >= 75
+
+
+class SlowBackend(NullInputBackend):
+    """Takes a moment per key and counts calls that overlap another"""
+
+    def __init__(self):
+        self.busy = threading.Lock()
+        self.overlaps = 0
+
+    def key_down(self, key):
+        self.press()
+
+    def key_up(self, key):
+        self.press()
+
+    def press(self):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return
+        time.sleep(0.005)
+        self.busy.release()
+
+
+def test_clear_never_calls_the_backend_during_a_send():
+    slow = SlowBackend()
+    backend = RecordingInputBackend(slow)
+    dispatcher = InputDispatcher(backend)
+    dispatcher.start()
+    try:
+        for _ in range(20):
+            dispatcher.hold({'w': 0.002, 'a': 0.004})
+            time.sleep(0.003)
+            dispatcher.clear()
+    finally:
+        dispatcher.stop()
+
+    assert slow.overlaps == 0
+    # Every key pressed was released again
+    down = set()
+    for _, kind, args in backend.actions:
+        if kind == 'key_down':
+            down.add(args[0])
+        elif kind == 'key_up':
+            down.discard(args[0])
+    assert not down
@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+import pytest
+
+from inventory_reader import (DIGIT_COLUMNS, HOTBAR_COLOR, HOTBAR_HEIGHT, HOTBAR_SLOTS, HOTBAR_WIDTH,
+                              ICON_SIZE, ITEM_COLORS, LABEL_TOP, SHADOW_COLOR, SLOT_PITCH,
+                              HotbarReader, digit_masks, hotbar_rect, plain_icon)
+
+
+def draw_hotbar(frame, slots, scale):
+    """Paint a hotbar of (item, count) slots with the plain icons into a frame"""
+    height, width = frame.shape[:2]
+    gui = np.empty((HOTBAR_HEIGHT, HOTBAR_WIDTH, 3), dtype=np.uint8)
+    gui[:] = HOTBAR_COLOR
+    glyphs = digit_masks()
+    for index, (item, count) in enumerate(slots[:HOTBAR_SLOTS]):
+        if item is None:
+            continue
+        x, y = 3 + index * SLOT_PITCH, 3
+        icon, mask = plain_icon(ITEM_COLORS[item])
+        gui[y:y + ICON_SIZE, x:x + ICON_SIZE][mask] = icon[mask]
+        if count > 1:
+            label = str(count)[-2:].rjust(2)
+            for column, char in zip(DIGIT_COLUMNS, label):
+                if char == ' ':
+                    continue
+                glyph = glyphs[int(char)]
+                top, left = y + LABEL_TOP, x + column
+                gui[top + 1:top + 8, left + 1:left + 6][glyph] = SHADOW_COLOR
+                gui[top:top + 7, left:left + 5][glyph] = 255
+
+    left, top, bar_width, bar_height = hotbar_rect(width, height, scale)
+    frame[top:top + bar_height, left:left + bar_width] = cv2.resize(
+        gui, (bar_width, bar_height), interpolation=cv2.INTER_NEAREST)
+
+
+def grabber(frame):
+    return lambda x, y, width, height: frame[y:y + height, x:x + width]
+
+
+@pytest.mark.parametrize('scale', [1, 2, 3, 4])
+def test_reads_items_and_counts(scale):
+    slots = [('wheat_seeds', 64), ('carrot', 7), (None, 0), ('water_bucket', 1), ('hoe', 1),
+             ('potato', 12), (None, 0), ('beetroot_seeds', 30), ('shovel', 1)]
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    draw_hotbar(frame, slots, scale)
+    reader = HotbarReader(gui_scale=scale)
+
+    assert reader.read(grabber(frame), (1920, 1080)) == slots
+    assert reader.totals()['wheat_seeds'] == 64
+
+
+def test_empty_hotbar_reads_as_empty_slots():
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    draw_hotbar(frame, [], 2)
+    reader = HotbarReader(gui_scale=2)
+
+    assert reader.read(grabber(frame), (1920, 1080)) == [(None, 0)] * HOTBAR_SLOTS
+
+
+def test_input_reported_during_a_read_keeps_it_stale():
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    draw_hotbar(frame, [('wheat_seeds', 64)], 2)
+    reader = HotbarReader(gui_scale=2)
+
+    def grab(*rect):
+        reader.invalidate(0.0)
+        return grabber(frame)(*rect)
+
+    reader.read(grab, (1920, 1080))
+    assert reader.needs_read(1.0)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Tour Optimizer for the Minecraft Farm Bot
+Orders the targets of a pass into a short walk over the farm grid
+Made by DDS
+"""
+
+import time
+from collections import defaultdict, deque
+from functools import lru_cache
+
+import numpy as np
+
+
+def grid_distance(a, b):
+    """Walking distance in blocks between two grid positions"""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def tour_length(points, order, start):
+    """Total blocks walked visiting points in order from start"""
+    total = 0
+    current = start
+    for index in order:
+        total += grid_distance(current, points[index])
+        current = points[index]
+    return total
+
+
+@lru_cache(maxsize=None)
+def ring(radius):
+    """Offsets of the grid positions exactly radius blocks away"""
+    if radius == 0:
+        return ((0, 0),)
+    offsets = []
+    for dx in range(-radius, radius + 1):
+        dy = radius - abs(dx)
+        offsets.append((dx, dy))
+        if dy:
+            offsets.append((dx, -dy))
+    return tuple(offsets)
+
+
+class TourOptimizer:
+    """Nearest neighbor tour from the player, refined with 2-opt
+
+    Targets sit on the farm grid, so nearest neighbor lookups search rings
+    of growing distance around the current position in a dict of occupied
+    blocks rather than measuring against every target. Passes with more
+    than nearest_limit targets start from a serpentine walk over strips a
+    few blocks high instead, which is one sort. 2-opt then only tries to
+    connect each target to its few nearest neighbors, and order() stops
+    improving the tour once time_budget seconds have passed. The tour is
+    an open path, the start is the player's block and it stays first.
+    """
+
+    def __init__(self, neighbors=6, max_passes=3, nearest_limit=200, time_budget=0.005):
+        self.neighbors = neighbors
+        self.max_passes = max_passes
+        self.nearest_limit = nearest_limit
+        self.time_budget = time_budget
+
+    def order(self, points, start):
+        """Indices of points in visiting order"""
+        if len(points) < 2:
+            return list(range(len(points)))
+        deadline = time.perf_counter() + self.time_budget
+        if len(points) > self.nearest_limit:
+            points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+            order = self.strip_tour(points, start)
+        else:
+            order = self.nearest_neighbor(points, start)
+        return self.two_opt(points, order, start, deadline)
+
+    def strip_tour(self, points, start):
+        """Serpentine walk along strips of rows, from the end closer to start"""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        low = points.min(axis=0)
+        shape = points.max(axis=0) - low + 1
+        # Sparse targets make taller strips worth walking up and down
+        density = len(points) / float(shape[0] * shape[1])
+        height = max(1, int(round(np.sqrt(2.0 / density))))
+        strip = (points[:, 1] - low[1]) // height
+        forward = np.where(strip % 2 == 0, points[:, 0], -points[:, 0])
+        # Up and down the strip on alternate columns
+        across = np.where((points[:, 0] - low[0]) % 2 == 0, points[:, 1], -points[:, 1])
+        order = np.lexsort((across, forward, strip)).tolist()
+        if grid_distance(start, points[order[-1]]) < grid_distance(start, points[order[0]]):
+            order.reverse()
+        return order
+
+    def nearest_neighbor(self, points, start):
+        """Greedy tour that always walks to the closest unvisited target"""
+        buckets = defaultdict(list)
+        for index in range(len(points) - 1, -1, -1):
+            buckets[tuple(points[index])].append(index)
+
+        order = []
+        current = tuple(start)
+        while buckets:
+            block = self.closest_block(buckets, current)
+            indices = buckets[block]
+            order.append(indices.pop())
+            if not indices:
+                del buckets[block]
+            current = block
+        return order
+
+    def closest_block(self, buckets, center):
+        """Closest occupied block to center"""
+        cx, cy = center
+        searched = 0
+        radius = 0
+        while True:
+            for dx, dy in ring(radius):
+                if (cx + dx, cy + dy) in buckets:
+                    return cx + dx, cy + dy
+            searched += 4 * radius or 1
+            radius += 1
+            # A few scattered targets are cheaper to scan directly
+            if searched > len(buckets):
+                return min(buckets, key=lambda block: (grid_distance(center, block), block))
+
+    def neighbor_lists(self, points):
+        """The closest few other targets of every target, nearest first"""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        low = points.min(axis=0)
+        shape = points.max(axis=0) - low + 1
+
+        # Search far enough that an average target has enough neighbors
+        density = len(points) / float(shape[0] * shape[1])
+        radius = min(int(np.sqrt(self.neighbors / (2.0 * density))) + 2, int(shape.max()))
+        offsets = np.array([offset for distance in range(1, radius + 1)
+                            for offset in ring(distance)])
+
+        # The grid is padded by the search radius, so every offset of every
+        # target is one lookup in the flat array without bounds checks
+        width = int(shape[1]) + 2 * radius
+        grid = np.full((int(shape[0]) + 2 * radius) * width, -1, dtype=np.int32)
+        cells = (points[:, 0] - low[0] + radius) * width + (points[:, 1] - low[1] + radius)
+        grid[cells] = np.arange(len(points))
+
+        # One row per target, one column per offset, nearest offsets first
+        found = grid[cells[:, None] + (offsets[:, 0] * width + offsets[:, 1])]
+
+        # Keep the first hits of every row, they are the nearest
+        hits = found >= 0
+        rank = np.cumsum(hits, axis=1, dtype=np.int32)
+        rows, columns = np.nonzero(hits & (rank <= self.neighbors))
+        nearest = np.full((len(points), self.neighbors), -1, dtype=np.int32)
+        nearest[rows, rank[rows, columns] - 1] = found[rows, columns]
+        return nearest.tolist()
+
+    def two_opt(self, points, order, start, deadline=None):
+        """Reverse tour segments while that shortens the walk, until the perf_counter deadline"""
+        count = len(points)
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        xs = points[:, 0].tolist() + [int(start[0])]
+        ys = points[:, 1].tolist() + [int(start[1])]
+        # The player is node count and stays at tour position 0
+        tour = [count] + list(order)
+        position = [0] * (count + 1)
+        for p, node in enumerate(tour):
+            position[node] = p
+        neighbors = self.neighbor_lists(points)
+        last = count
+
+        def try_move(low, high):
+            """Replace the steps leaving low and high by low->high and low+1->high+1"""
+            a, b, c = tour[low], tour[low + 1], tour[high]
+            removed = abs(xs[a] - xs[b]) + abs(ys[a] - ys[b])
+            added = abs(xs[a] - xs[c]) + abs(ys[a] - ys[c])
+            d = None
+            if high < last:
+                d = tour[high + 1]
+                removed += abs(xs[c] - xs[d]) + abs(ys[c] - ys[d])
+                added += abs(xs[b] - xs[d]) + abs(ys[b] - ys[d])
+            if added >= removed:
+                return False
+            tour[low + 1:high + 1] = tour[high:low:-1]
+            for p in range(low + 1, high + 1):
+                position[tour[p]] = p
+            # The ends of the changed steps are worth another look
+            for node in (a, b, c, d):
+                if node is not None and node < count and not queued[node]:
+                    queued[node] = True
+                    queue.append(node)
+            return True
+
+        # Nodes whose steps have not changed since they were last checked
+        # are skipped, so later rounds only touch the rewired parts
+        queue = deque(range(count))
+        queued = [True] * count
+        budget = count * self.max_passes
+        if deadline is None:
+            deadline = time.perf_counter() + self.time_budget
+        while queue and budget:
+            budget -= 1
+            if not budget % 64 and time.perf_counter() > deadline:
+                break
+            node = queue.popleft()
+            queued[node] = False
+            x, y = xs[node], ys[node]
+            i = position[node]
+            before = tour[i - 1]
+            to_before = abs(x - xs[before]) + abs(y - ys[before])
+            to_after = -1
+            if i < last:
+                after = tour[i + 1]
+                to_after = abs(x - xs[after]) + abs(y - ys[after])
+
+            for other in neighbors[node]:
+                if other < 0:
+                    break
+                # A better tour needs a new step shorter than the one it
+                # replaces, and the neighbors only get farther from here on
+                gap = abs(x - xs[other]) + abs(y - ys[other])
+                if gap >= to_after and gap >= to_before:
+                    break
+                j = position[other]
+                if gap < to_after and try_move(min(i, j), max(i, j)):
+                    break
+                if gap < to_before and try_move(min(i, j) - 1, max(i, j) - 1):
+                    break
+        return tour[1:]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Span Tracer for the Minecraft Farm Bot
+Ring buffer of timed spans, written out as Chrome trace-event JSON
+Made by DDS
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class TraceRecorder:
+    """Keep the newest capacity spans of every thread in memory
+
+    Spans are begin and end times from time.perf_counter(). A span is one
+    append to a bounded deque, formatting only happens when the trace is
+    written. Open the file in chrome://tracing or ui.perfetto.dev.
+    """
+
+    def __init__(self, capacity=100000):
+        self.events = deque(maxlen=capacity)  # (phase, name, category, start, end, tid, id, args)
+        self.threads = {}  # Thread ident -> name, for the viewer's track labels
+        self.ids = itertools.count(1)
+        self.origin = time.perf_counter()
+
+    def thread(self):
+        """Ident of the calling thread, remembering its name"""
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        return tid
+
+    def span(self, name, start, end, category='phase', args=None):
+        """Record a span of the calling thread, nested in its enclosing spans"""
+        self.events.append(('X', name, category, start, end, self.thread(), 0, args))
+
+    def async_span(self, name, start, end, category='target', args=None):
+        """Record a span on a track of its own, for spans that overlap others"""
+        self.events.append(('b', name, category, start, end, self.thread(), next(self.ids), args))
+
+    def trace_events(self):
+        """The recorded spans as Chrome trace events, times in microseconds"""
+        pid = os.getpid()
+        # Copied in one step so spans recorded meanwhile don't disturb the dump
+        events = self.events.copy()
+        trace = [{'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in list(self.threads.items())]
+        for phase, name, category, start, end, tid, span_id, args in events:
+            ts = (start - self.origin) * 1e6
+            event = {'ph': phase, 'name': name, 'cat': category, 'ts': ts, 'pid': pid, 'tid': tid}
+            if args:
+                event['args'] = args
+            if phase == 'X':
+                event['dur'] = (end - start) * 1e6
+                trace.append(event)
+            else:
+                event['id'] = span_id
+                trace.append(event)
+                trace.append({'ph': 'e', 'name': name, 'cat': category, 'ts': (end - self.origin) * 1e6,
+                              'pid': pid, 'tid': tid, 'id': span_id})
+        return trace
+
+    def dump(self, path):
+        """Write the trace to a JSON file"""
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
+        return path
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Farm Traversal Patterns for the Minecraft Farm Bot
+Lazy generators of (col, row) block offsets from the farm center
+Made by DDS
+"""
+
+
+def grid_cells(radius):
+    """Screen rows top to bottom, each from left to right"""
+    for row in range(-radius, radius + 1):
+        for col in range(-radius, radius + 1):
+            yield col, row
+
+
+def row_cells(radius):
+    """Crop rows left to right, each walked from its top end"""
+    for col in range(-radius, radius + 1):
+        for row in range(-radius, radius + 1):
+            yield col, row
+
+
+def serpentine_cells(radius):
+    """Crop rows left to right, walking every other row back the other way"""
+    for index, col in enumerate(range(-radius, radius + 1)):
+        rows = range(-radius, radius + 1)
+        if index % 2:
+            rows = reversed(rows)
+        for row in rows:
+            yield col, row
+
+
+def spiral_cells(radius):
+    """Outward square spiral starting at the farm center"""
+    total = (radius * 2 + 1) ** 2
+    col = row = 0
+    yield col, row
+    yielded = 1
+
+    # Legs grow by one every two turns: right 1, down 1, left 2, up 2, ...
+    dcol, drow = 1, 0
+    leg = 1
+    while yielded < total:
+        for _ in range(2):
+            for _ in range(leg):
+                col += dcol
+                row += drow
+                if abs(col) <= radius and abs(row) <= radius:
+                    yield col, row
+                    yielded += 1
+            dcol, drow = -drow, dcol
+        leg += 1
+
+
+PATTERNS = {
+    'grid': grid_cells,
+    'spiral': spiral_cells,
+    'rows': row_cells,
+    'serpentine': serpentine_cells,
+}
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Vision helpers for the Minecraft Farm Bot
+Frame snapshots that let a whole scan pass read from a single screen grab,
+with a summed-area table for constant time region means
+Made by DDS
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameSnapshot:
+    """A single capture of the scan area that answers per-cell color queries"""
+
+    def __init__(self, image, left, top, captured=None):
+        # Same channel handling as detect_crop_color so colors stay comparable
+        self.image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self.left = left
+        self.top = top
+        # perf_counter time the pixels were grabbed
+        self.captured = time.perf_counter() if captured is None else captured
+        self.height, self.width = self.image.shape[:2]
+        self._grid = None
+        self._integral = None
+
+    def covers(self, x, y, width, height):
+        """Check if a screen rectangle lies inside the snapshot"""
+        return (x >= self.left and y >= self.top and
+                x + width <= self.left + self.width and
+                y + height <= self.top + self.height)
+
+    def region(self, x, y, width, height):
+        """Return a view of a screen rectangle without copying"""
+        ox, oy = x - self.left, y - self.top
+        return self.image[oy:oy + height, ox:ox + width]
+
+    def cell_blocks(self, xs, ys, width, height):
+        """Strided view of every scan cell, indexed as [x_index, y_index, row, column, channel]
+
+        Returns None unless the grid has a uniform pitch that fits in the snapshot.
+        """
+        step_x, step_y = xs.step, ys.step
+        nx, ny = len(xs), len(ys)
+        ox, oy = xs.start - self.left, ys.start - self.top
+
+        if not (width <= step_x and height <= step_y and ox >= 0 and oy >= 0 and
+                ox + nx * step_x <= self.width and oy + ny * step_y <= self.height):
+            return None
+
+        # Fold the frame into (row, y, col, x) blocks and keep the top-left
+        # corner of every block
+        block = self.image[oy:oy + ny * step_y, ox:ox + nx * step_x]
+        block = block.reshape(ny, step_y, nx, step_x, -1)[:, :height, :, :width]
+        return block.transpose(2, 0, 1, 3, 4)
+
+    def integral(self):
+        """Summed-area table of the snapshot, built on first use"""
+        if self._integral is None:
+            self._integral = cv2.integral(self.image, sdepth=cv2.CV_64F)
+            if self._integral.ndim == 2:
+                self._integral = self._integral[..., None]
+        return self._integral
+
+    def rect_means(self, ox, oy, width, height):
+        """Mean color of rectangles at snapshot offsets ox, oy in constant time each"""
+        table = self.integral()
+        ox, oy = np.asarray(ox), np.asarray(oy)
+        total = (table[oy + height, ox + width] - table[oy, ox + width] -
+                 table[oy + height, ox] + table[oy, ox])
+        return total / (width * height)
+
+    def cell_means(self, xs, ys, width, height, samples=1, mask=None):
+        """Mean color of every scan cell, indexed as [x_index, y_index, channel]
+
+        With samples > 1 every cell is split into samples x samples sub-regions
+        and the median of their means is used, which ignores small occluders
+        such as the cursor. A boolean mask selects a subset of cells, the result
+        is then a flat array of colors.
+        """
+        ox, oy = np.meshgrid(np.asarray(xs) - self.left, np.asarray(ys) - self.top, indexing='ij')
+        if mask is not None:
+            ox, oy = ox[mask], oy[mask]
+
+        if samples <= 1:
+            return self.rect_means(ox, oy, width, height)
+
+        sub_width, sub_height = max(width // samples, 1), max(height // samples, 1)
+        offsets = np.arange(samples)
+        sub_x = ox[..., None, None] + offsets[:, None] * sub_width
+        sub_y = oy[..., None, None] + offsets[None, :] * sub_height
+        sub_x, sub_y = np.broadcast_arrays(sub_x, sub_y)
+        means = self.rect_means(sub_x, sub_y, sub_width, sub_height)
+        return np.median(means.reshape(ox.shape + (samples * samples, -1)), axis=-2)
+
+    def set_grid(self, xs, ys, width, height, samples=1):
+        """Declare the scan grid, its cell colors are computed on first use"""
+        self._grid = (xs, ys, width, height, samples)
+        self._grid_means = None
+
+    def grid_colors(self, xs, ys, width=10, height=10, samples=1):
+        """Integer mean color of every scan cell, or None if the grid is not covered"""
+        if self._grid == (xs, ys, width, height, samples):
+            if self._grid_means is None:
+                self._grid_means = self.cell_means(xs, ys, width, height, samples).astype(int)
+            return self._grid_means
+        if not self.covers(xs[0], ys[0], xs[-1] - xs[0] + width, ys[-1] - ys[0] + height):
+            return None
+        return self.cell_means(xs, ys, width, height, samples).astype(int)
+
+    def mean_color(self, x, y, width=10, height=10):
+        """Mean color of a screen rectangle, using the grid colors when aligned"""
+        if self._grid is not None:
+            xs, ys, grid_width, grid_height, samples = self._grid
+            if width == grid_width and height == grid_height and x in xs and y in ys:
+                means = self.grid_colors(xs, ys, width, height, samples)
+                return tuple(means[xs.index(x), ys.index(y)].tolist())
+
+        avg_color = self.rect_means(x - self.left, y - self.top, width, height)
+        return tuple(map(int, avg_color))
+
+
+class IncrementalGrid:
+    """Reclassify only the scan cells whose pixels changed since they were last classified"""
+
+    def __init__(self, classifier, tolerance=12, sample_step=3):
+        self.classifier = classifier
+        self.tolerance = tolerance
+        self.sample_step = sample_step
+        self.reset()
+
+    def reset(self):
+        """Forget every cached cell"""
+        self.grid = None
+        self.reference = None
+        self.entries = None
+        self.matches = None
+        self.cells_checked = 0
+        self.cells_reclassified = 0
+
+    def classify(self, snapshot, xs, ys, width=10, height=10, samples=1):
+        """Classify the scan grid of a snapshot, or None if it cannot be done incrementally"""
+        blocks = snapshot.cell_blocks(xs, ys, width, height)
+        if blocks is None:
+            return None
+
+        # A sparse pixel sample per cell is enough to notice a crop changing
+        step = self.sample_step
+        sample = blocks[:, :, ::step, ::step].astype(np.int16)
+
+        if self.grid != (xs, ys, width, height, samples):
+            self.grid = (xs, ys, width, height, samples)
+            self.reference = sample
+            self.entries = np.full(blocks.shape[:2], -1, dtype=np.int16)
+            self.matches = np.zeros(blocks.shape[:2], dtype=np.uint32)
+            dirty = np.ones(blocks.shape[:2], dtype=bool)
+        else:
+            change = np.abs(sample - self.reference).max(axis=(2, 3, 4))
+            dirty = change > self.tolerance
+
+        self.cells_checked += dirty.size
+        if dirty.any():
+            colors = snapshot.cell_means(xs, ys, width, height, samples, mask=dirty).astype(int)
+            self.entries[dirty], self.matches[dirty] = self.classifier.classify(colors)
+            # Only refresh the reference of reclassified cells so slow drift
+            # still adds up to a change
+            self.reference[dirty] = sample[dirty]
+            self.cells_reclassified += int(dirty.sum())
+
+        # The caller may still be planning from these while the next frame
+        # is classified
+        return self.entries.copy(), self.matches.copy()